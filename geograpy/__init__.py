@@ -2,13 +2,17 @@
 main geograpy 3 module
 """
 __version__ = "0.3.0"
-from geograpy.extraction import Extractor
+from geograpy.extraction import Extractor, NLTKEngine
 from geograpy.labels import Labels
 from geograpy.locator import Locator
+from geograpy.misspellings import MisspellingDictionary
+from geograpy.parallel import chunks
 from geograpy.places import PlaceContext
 
 
-def get_geoPlace_context(url=None, text=None, debug=False):
+def get_geoPlace_context(
+    url=None, text=None, debug=False, locator=None, engine=None, cache=None
+):
     """
     Get a place context for a given text with information
     about country, region, city and other
@@ -18,16 +22,35 @@ def get_geoPlace_context(url=None, text=None, debug=False):
         url(String): the url to read text from (if any)
         text(String): the text to analyze
         debug(boolean): if True show debug information
+        locator(Locator): the Locator to use - if None the shared Locator is used
+        engine(str|object): the extraction engine "nltk" or "gazetteer" see Extractor.getEngine
+        cache(EntityCache): the cache of the entities found - if None nothing is cached
 
     Returns:
         places:
             PlaceContext: the place context
     """
-    places = get_place_context(url, text, labels=Labels.geo, debug=debug)
+    places = get_place_context(
+        url,
+        text,
+        labels=Labels.geo,
+        debug=debug,
+        locator=locator,
+        engine=engine,
+        cache=cache,
+    )
     return places
 
 
-def get_place_context(url=None, text=None, labels=Labels.default, debug=False):
+def get_place_context(
+    url=None,
+    text=None,
+    labels=Labels.default,
+    debug=False,
+    locator=None,
+    engine=None,
+    cache=None,
+):
     """
     Get a place context for a given text with information
     about country, region, city and other
@@ -38,22 +61,122 @@ def get_place_context(url=None, text=None, labels=Labels.default, debug=False):
         url(String): the url to read text from (if any)
         text(String): the text to analyze
         debug(boolean): if True show debug information
+        locator(Locator): the Locator to use - if None the shared Locator is used
+        engine(str|object): the extraction engine "nltk" or "gazetteer" see Extractor.getEngine
+        cache(EntityCache): the cache of the entities found - if None nothing is cached
 
     Returns:
         pc:
             PlaceContext: the place context
     """
     e = Extractor(url=url, text=text, debug=debug)
-    e.find_entities(labels=labels)
+    e.find_entities(labels=labels, engine=engine, cache=cache)
     places = e.places
-    pc = PlaceContext(places)
+    pc = PlaceContext(places, setAll=False, locator=locator)
     pc.setAll()
     return pc
 
 
+def stream_place_contexts(
+    items,
+    labels=Labels.default,
+    batchSize=16,
+    locator=None,
+    engine=None,
+    cache=None,
+    concurrency=8,
+    per_host_limit=2,
+    timeout=30.0,
+    debug=False,
+):
+    """
+    Get the place context information for each of the given texts or urls
+    as a stream of records. The documents are read and tagged in batches
+    of batchSize documents so that the memory use stays bounded for corpora of any size.
+    The urls of a batch are fetched concurrently see Extractor.fetch_many
+
+    Args:
+        items(Iterable): the texts or urls of the documents - see Extractor.isUrl
+        labels(list): the NLTK labels to extract places for
+        batchSize(int): the number of documents to tag in one batch
+        locator(Locator): the Locator to use - if None the shared Locator is used
+        engine(str|object): the extraction engine "nltk" or "gazetteer" see Extractor.getEngine
+        cache(EntityCache): the cache of the entities found - if None nothing is cached
+        concurrency(int): the maximum number of concurrent url fetches
+        per_host_limit(int): the maximum number of concurrent url fetches per host
+        timeout(float): the deadline in seconds for fetching a url
+        debug(boolean): if True show debug information
+
+    Returns:
+        Generator: a record for each document with its index and url, the countries, regions,
+        cities, other places and mention counts see PlaceContext.toRecord - or an error message
+    """
+    engine = Extractor.getEngine(engine, cache=cache)
+    for chunk in chunks(items, batchSize):
+        records = []
+        texts = []
+        urls = []
+        for index, item in chunk:
+            record = {"index": index}
+            if Extractor.isUrl(item):
+                record["url"] = item.strip()
+                urls.append((len(records), record["url"]))
+            records.append(record)
+            texts.append(item)
+        fetched = Extractor.fetch_many(
+            [url for _position, url in urls],
+            concurrency=concurrency,
+            per_host_limit=per_host_limit,
+            timeout=timeout,
+        )
+        for urlIndex, url, text, error in fetched:
+            position = urls[urlIndex][0]
+            texts[position] = text
+            if error is not None:
+                records[position]["error"] = error
+                if debug:
+                    print(f"{url}: {error}")
+        placeLists = iter(
+            engine.find_entities_many([text for text in texts if text], labels)
+        )
+        for record, text in zip(records, texts):
+            if "error" not in record:
+                places = next(placeLists) if text else []
+                try:
+                    pc = PlaceContext(places, setAll=False, locator=locator)
+                    pc.setAll()
+                    record.update(pc.toRecord())
+                except Exception as ex:
+                    record["error"] = str(ex)
+            yield record
+
+
+def warmup(withNLTK=True, correctMisspelling=False, debug=False):
+    """
+    prepare the current process for fast lookups by loading the NLTK tagger and chunker once
+    and opening the shared Locator with a populated database
+
+    Args:
+        withNLTK(boolean): if False only prepare the Locator e.g. on nodes without NLTK data
+        correctMisspelling(boolean): if True correct typical misspellings
+        debug(boolean): if True show debug information
+
+    Returns:
+        Locator: the shared Locator
+    """
+    if withNLTK:
+        NLTKEngine.getInstance()
+    MisspellingDictionary.getInstance()
+    loc = Locator.getInstance(
+        correctMisspelling=correctMisspelling, threadSafe=True, debug=debug
+    )
+    loc.populate_db()
+    return loc
+
+
 def locateCity(location, correctMisspelling=False, debug=False):
     """
-    locate the given location string
+    locate the given location string - NLTK is not needed for this
     Args:
         location(string): the description of the location
     Returns:
@@ -64,3 +187,17 @@ def locateCity(location, correctMisspelling=False, debug=False):
     loc = Locator.getInstance(correctMisspelling=correctMisspelling, debug=debug)
     city = loc.locateCity(e.places)
     return city
+
+
+def locateCities_many(locations: list, correctMisspelling=False, debug=False) -> list:
+    """
+    locate the given location strings in one batch
+
+    Args:
+        locations(list): the descriptions of the locations
+    Returns:
+        list: the located City (or None) for each location
+    """
+    loc = Locator.getInstance(correctMisspelling=correctMisspelling, debug=debug)
+    cities = loc.locateCityBatch(locations)
+    return cities
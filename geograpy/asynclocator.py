@@ -0,0 +1,251 @@
+"""
+Created on 2026-10-17
+
+asyncio front end for the Locator and PlaceContext
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import geograpy
+from geograpy.extraction import Extractor
+from geograpy.labels import Labels
+from geograpy.locator import LocationContext, Locator
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - aiohttp is an optional dependency
+    aiohttp = None
+
+
+class AsyncLocator:
+    """
+    asyncio front end for the Locator, LocationContext and PlaceContext
+
+    the SQLite and NLTK work is run on a bounded thread pool so that the event loop
+    is not blocked - urls are fetched with aiohttp if it is installed (pip install geograpy3[async])
+    """
+
+    def __init__(
+        self,
+        locator: Locator = None,
+        maxWorkers: int = 4,
+        maxConcurrency: int = None,
+        fetchTimeout: float = 30.0,
+        correctMisspelling: bool = False,
+        debug: bool = False,
+    ):
+        """
+        constructor
+
+        Args:
+            locator(Locator): the thread safe Locator to use - if None a new one is created
+            maxWorkers(int): the maximum number of worker threads
+            maxConcurrency(int): the maximum number of concurrent calls - default: maxWorkers
+            fetchTimeout(float): the timeout in seconds for fetching urls
+            correctMisspelling(bool): if True correct typical misspellings
+            debug(bool): if True show debug information
+        """
+        if locator is None:
+            locator = Locator(
+                correctMisspelling=correctMisspelling, threadSafe=True, debug=debug
+            )
+        elif not locator.threadSafe:
+            raise Exception("AsyncLocator needs a Locator with threadSafe=True")
+        self.locator = locator
+        self.debug = debug
+        self.maxWorkers = maxWorkers
+        self.maxConcurrency = maxConcurrency if maxConcurrency is not None else maxWorkers
+        self.fetchTimeout = fetchTimeout
+        self.executor = ThreadPoolExecutor(
+            max_workers=maxWorkers, thread_name_prefix="geograpy"
+        )
+        self.semaphore = None
+        self.semaphoreLoop = None
+        self.session = None
+        self.sessionLoop = None
+        self.locationContext = None
+        self.locationContextLock = threading.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
+
+    def close(self):
+        """
+        shut down my worker threads - pending calls are cancelled
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def aclose(self):
+        """
+        close my http session and shut down my worker threads
+        """
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+            self.sessionLoop = None
+        self.close()
+
+    def getSemaphore(self) -> asyncio.Semaphore:
+        """
+        get the semaphore limiting the concurrent calls for the running event loop
+
+        Returns:
+            asyncio.Semaphore: the semaphore
+        """
+        loop = asyncio.get_running_loop()
+        if self.semaphoreLoop is not loop:
+            self.semaphore = asyncio.Semaphore(self.maxConcurrency)
+            self.semaphoreLoop = loop
+        return self.semaphore
+
+    def getSession(self):
+        """
+        get the aiohttp session for the running event loop so that the connections
+        to a host are pooled and kept alive - created on first use
+
+        Returns:
+            aiohttp.ClientSession: the session
+        """
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.sessionLoop is not loop:
+            # a session can not be used from another event loop
+            timeout = aiohttp.ClientTimeout(total=self.fetchTimeout)
+            self.session = aiohttp.ClientSession(timeout=timeout)
+            self.sessionLoop = loop
+        return self.session
+
+    async def run(self, func, *args, **kwargs):
+        """
+        run the given blocking function on my worker threads
+
+        Args:
+            func(Callable): the function to run
+            *args: the positional arguments for the function
+            **kwargs: the keyword arguments for the function
+
+        Returns:
+            the result of the function
+        """
+        async with self.getSemaphore():
+            loop = asyncio.get_running_loop()
+            call = functools.partial(func, *args, **kwargs)
+            return await loop.run_in_executor(self.executor, call)
+
+    def locateCity(self, location: str):
+        """
+        locate the given location string the same way as geograpy.locateCity does
+
+        Args:
+            location(str): the description of the location
+
+        Returns:
+            City: the city found or None
+        """
+        e = Extractor(text=location, debug=self.debug)
+        e.split()
+        city = self.locator.locateCity(e.places)
+        return city
+
+    async def locate_city(self, location: str):
+        """
+        locate the given location string see geograpy.locateCity
+
+        Args:
+            location(str): the description of the location e.g. "Vienna, Austria"
+
+        Returns:
+            City: the city found or None
+        """
+        return await self.run(self.locateCity, location)
+
+    def getLocationContext(self) -> LocationContext:
+        """
+        get the LocationContext for my Locator's storage configuration - created on first use
+
+        Returns:
+            LocationContext: the location context
+        """
+        with self.locationContextLock:
+            if self.locationContext is None:
+                self.locationContext = LocationContext.fromCache(
+                    self.locator.storageConfig
+                )
+        return self.locationContext
+
+    async def locate_location(self, *locations, verbose: bool = False) -> list:
+        """
+        get the possible locations for the given location names see LocationContext.locateLocation
+
+        Args:
+            *locations(str): the location names
+            verbose(bool): if True combinations of location names are used to improve the search results
+
+        Returns:
+            list: the cities, regions and countries found
+        """
+        locationContext = self.locationContext
+        if locationContext is None:
+            locationContext = await self.run(self.getLocationContext)
+        return await self.run(
+            locationContext.locateLocation, *locations, verbose=verbose
+        )
+
+    async def fetch_text(self, url: str) -> str:
+        """
+        fetch the article text of the given url
+
+        the html is fetched with my aiohttp session if aiohttp is available and parsed
+        on a worker thread otherwise the article is downloaded and parsed on a worker thread.
+        The fetches count towards the maximum number of concurrent calls
+
+        Args:
+            url(str): the url to fetch
+
+        Returns:
+            str: the article text
+        """
+        html = None
+        if aiohttp is not None:
+            async with self.getSemaphore():
+                async with self.getSession().get(url) as response:
+                    response.raise_for_status()
+                    html = await response.text()
+
+        def parse():
+            from newspaper import Article
+
+            article = Article(url)
+            article.download(input_html=html)
+            article.parse()
+            return article.text
+
+        return await self.run(parse)
+
+    async def place_context(
+        self, text: str = None, url: str = None, labels=Labels.default
+    ):
+        """
+        get the place context for the given text or url see geograpy.get_place_context
+
+        Args:
+            text(str): the text to analyze
+            url(str): the url to read the text from if no text is given
+            labels(list): the NLTK labels to extract places for
+
+        Returns:
+            PlaceContext: the place context
+        """
+        if not text and url:
+            text = await self.fetch_text(url)
+        return await self.run(
+            geograpy.get_place_context,
+            text=text,
+            labels=labels,
+            debug=self.debug,
+            locator=self.locator,
+        )
@@ -0,0 +1,341 @@
+"""
+Created on 2026-10-17
+
+offline micro benchmarks of the Locator, PlaceContext and Extractor hot paths
+"""
+import math
+import os
+import platform
+import random
+import sys
+import time
+
+import geograpy
+from geograpy.extraction import Extractor
+from geograpy.labels import Labels
+from geograpy.locator import Location, LocationContext, Locator, RegionManager
+from geograpy.places import PlaceContext
+from geograpy.utils import (
+    encode_strings,
+    fuzzy_match,
+    fuzzy_match_many,
+    remove_non_ascii,
+)
+
+
+class BenchmarkSuite:
+    """
+    times the hot paths of geograpy over fixed synthetic workloads and reports the
+    throughput and the p50/p95/p99 latencies as a JSON compatible record
+
+    only the local locations database is used - nothing is downloaded while benchmarking.
+    Each workload is run once untimed before the measured rounds so that one time costs
+    like building a BallTree, region indexes or loading the NLTK models are not measured
+    """
+
+    # location strings for locateCity and locateLocation
+    locations = [
+        "Paris, Texas",
+        "Paris, France",
+        "Berlin, Germany",
+        "Vienna, Austria",
+        "San Francisco, CA",
+        "Los Angeles",
+        "Austin, Texas",
+        "Munich, Bavaria",
+        "Toronto, Ontario",
+        "Sydney, Australia",
+        "Tokyo, Japan",
+        "Cairo, Egypt",
+        "Mumbai, India",
+        "Rio de Janeiro, Brazil",
+        "Cape Town, South Africa",
+        "Nowhere, Atlantis",
+    ]
+    # sentence templates for the synthetic texts
+    templates = [
+        "{0} is a city in {1} and not far from {2}.",
+        "The conference moved from {0} to {2} after the venue in {1} was closed.",
+        "Flights between {0} and {2} are delayed because of a storm over {1}.",
+        "She was born in {0}, studied in {2} and now lives in {1}.",
+    ]
+
+    def __init__(
+        self,
+        locator: Locator = None,
+        rounds: int = 3,
+        seed: int = 42,
+        debug: bool = False,
+    ):
+        """
+        constructor
+
+        Args:
+            locator(Locator): the Locator to benchmark - if None the shared Locator is used
+            rounds(int): the number of times each workload is run
+            seed(int): the seed of the synthetic workloads
+            debug(bool): if True print the progress
+        """
+        if locator is None:
+            locator = Locator.getInstance(threadSafe=True)
+        if not os.path.isfile(locator.db_file):
+            msg = f"the locations database {locator.db_file} is missing - use -db to create it"
+            raise Exception(msg)
+        self.locator = locator
+        self.rounds = rounds
+        self.debug = debug
+        rng = random.Random(seed)
+        names = [location.split(",")[0] for location in self.locations]
+        regions = [location.split(",")[-1].strip() for location in self.locations]
+        self.texts = []
+        self.placeLists = []
+        for _i in range(32):
+            template = rng.choice(self.templates)
+            args = [rng.choice(names), rng.choice(regions), rng.choice(names)]
+            self.texts.append(template.format(*args))
+            self.placeLists.append(args)
+        # coordinates spread over the inhabited latitudes
+        self.coordinates = [
+            (round(rng.uniform(-45, 65), 4), round(rng.uniform(-180, 180), 4))
+            for _i in range(32)
+        ]
+        # batches of all location strings in varying order for locateCityBatch
+        self.locationBatches = [
+            rng.sample(self.locations, len(self.locations)) for _i in range(16)
+        ]
+        # misspelled region names to fuzzy match against all region names
+        self.regionNameQueries = [
+            "Baveria",
+            "Texxas",
+            "Californa",
+            "Nordrhein Westfalen",
+            "Ontarion",
+            "Uttar Pradesh",
+            "Queensland",
+            "Tasmanai",
+            "Île-de-France",
+            "Lombardia",
+            "Catalunya",
+            "Hokaido",
+            "Kwazulu Natal",
+            "Sao Paulo",
+            "Bretagne",
+            "Atlantis",
+        ]
+        self.locationContext = None
+        self.regionManager = None
+        self.regionNames = None
+        # uncached Locators of the database file by open mode see getModeLocator
+        self.modeLocators = {}
+
+    def getBenchmarks(self) -> dict:
+        """
+        get the benchmarks
+
+        Returns:
+            dict: the operation and the workload by benchmark name
+        """
+        benchmarks = {
+            "locateCity": (self.locateCity, self.locations),
+            "locateCityBatch": (self.locateCityBatch, self.locationBatches),
+            "locateLocation": (self.locateLocation, self.locations),
+            "PlaceContext.setAll": (self.placeContext, self.placeLists),
+            "Extractor.find_entities[nltk]": (self.findEntitiesNLTK, self.texts),
+            "Extractor.find_entities[gazetteer]": (
+                self.findEntitiesGazetteer,
+                self.texts,
+            ),
+            "getNClosestLocations": (self.closestLocations, self.coordinates),
+            "getLocationsWithinRadius": (self.locationsWithinRadius, self.coordinates),
+            "lookups[read-write]": (self.lookupsReadWrite, self.locations),
+            "lookups[read-only]": (self.lookupsReadOnly, self.locations),
+            "fuzzy_match[per pair]": (self.fuzzyMatchPairs, self.regionNameQueries),
+            "fuzzy_match_many[batched]": (
+                self.fuzzyMatchMany,
+                self.regionNameQueries,
+            ),
+        }
+        return benchmarks
+
+    def locateCity(self, location: str):
+        # the same steps as geograpy.locateCity with my Locator
+        e = Extractor(text=location)
+        e.split()
+        return self.locator.locateCity(e.places)
+
+    def locateCityBatch(self, locations: list):
+        # one operation locates a batch of all location strings
+        return self.locator.locateCityBatch(locations)
+
+    def locateLocation(self, location: str):
+        if self.locationContext is None:
+            self.locationContext = LocationContext.fromCache(
+                self.locator.storageConfig, readOnly=True
+            )
+        return self.locationContext.locateLocation(location)
+
+    def placeContext(self, places: list):
+        placeContext = PlaceContext(places, setAll=False, locator=self.locator)
+        placeContext.setAll()
+        return placeContext
+
+    def findEntitiesNLTK(self, text: str):
+        return Extractor(text=text).find_entities(Labels.geo, engine="nltk")
+
+    def findEntitiesGazetteer(self, text: str):
+        return Extractor(text=text).find_entities(Labels.geo, engine="gazetteer")
+
+    def getModeLocator(self, readOnly: bool) -> Locator:
+        """
+        get a Locator without lookup cache for my database file opened read-write
+        or read-only and memory mapped - opened on first use
+        """
+        locator = self.modeLocators.get(readOnly)
+        if locator is None:
+            locator = Locator(db_file=self.locator.db_file, readOnly=readOnly)
+            self.modeLocators[readOnly] = locator
+        return locator
+
+    def lookups(self, locator: Locator, location: str):
+        # the city, region and country lookups of each part of the location
+        for name in location.split(","):
+            name = name.strip()
+            locator.cities_for_name(name)
+            locator.regions_for_name(name)
+            locator.getCountry(name)
+
+    def lookupsReadWrite(self, location: str):
+        return self.lookups(self.getModeLocator(readOnly=False), location)
+
+    def lookupsReadOnly(self, location: str):
+        return self.lookups(self.getModeLocator(readOnly=True), location)
+
+    def getRegionManager(self) -> RegionManager:
+        """
+        get the regions to look up the closest locations in - loaded on first use
+        """
+        if self.regionManager is None:
+            regionManager = RegionManager(config=self.locator.storageConfig)
+            regionManager.fromCache()
+            self.regionManager = regionManager
+        return self.regionManager
+
+    def getRegionNames(self) -> tuple:
+        """
+        get the ASCII folded names of all regions and their encoding - loaded on first use
+        """
+        if self.regionNames is None:
+            records = self.locator.sqlDB.query("SELECT name FROM regions")
+            names = [
+                remove_non_ascii(record["name"])
+                for record in records
+                if record["name"]
+            ]
+            self.regionNames = (names, encode_strings(names))
+        return self.regionNames
+
+    def fuzzyMatchPairs(self, query: str):
+        names, _encoded = self.getRegionNames()
+        query = remove_non_ascii(query)
+        return [fuzzy_match(query, name) for name in names]
+
+    def fuzzyMatchMany(self, query: str):
+        _names, encoded = self.getRegionNames()
+        return fuzzy_match_many(remove_non_ascii(query), encoded)
+
+    def closestLocations(self, coordinates: tuple):
+        location = Location(lat=coordinates[0], lon=coordinates[1])
+        return location.getNClosestLocations(self.getRegionManager(), 5)
+
+    def locationsWithinRadius(self, coordinates: tuple):
+        location = Location(lat=coordinates[0], lon=coordinates[1])
+        return location.getLocationsWithinRadius(self.getRegionManager(), 250.0)
+
+    @staticmethod
+    def percentile(latencies: list, p: float) -> float:
+        """
+        get the nearest rank percentile of the given sorted latencies
+
+        Args:
+            latencies(list): the sorted latencies
+            p(float): the percentile e.g. 95
+
+        Returns:
+            float: the latency of the percentile
+        """
+        rank = max(math.ceil(p / 100 * len(latencies)), 1)
+        return latencies[rank - 1]
+
+    def measure(self, name: str, func, workload: list) -> dict:
+        """
+        run the given operation rounds times on each item of the given workload
+
+        Args:
+            name(str): the name of the benchmark
+            func(Callable): the operation to time
+            workload(list): the items to call the operation with
+
+        Returns:
+            dict: the number of operations, the total time, the throughput and the latencies in ms
+        """
+        record = {"name": name}
+        try:
+            for item in workload:
+                func(item)
+            latencies = []
+            for _round in range(self.rounds):
+                for item in workload:
+                    start = time.perf_counter()
+                    func(item)
+                    latencies.append(time.perf_counter() - start)
+        except Exception as ex:
+            # e.g. the NLTK models are not installed
+            record["error"] = str(ex)
+            return record
+        latencies.sort()
+        total = sum(latencies)
+        record["operations"] = len(latencies)
+        record["total_s"] = round(total, 6)
+        record["throughput_ops"] = round(len(latencies) / total, 2) if total else None
+        for p in 50, 95, 99:
+            record[f"p{p}_ms"] = round(self.percentile(latencies, p) * 1000, 4)
+        record["max_ms"] = round(latencies[-1] * 1000, 4)
+        return record
+
+    def run(self, names: list = None) -> dict:
+        """
+        run the given benchmarks
+
+        Args:
+            names(list): the names of the benchmarks to run - if None or empty all are run
+
+        Returns:
+            dict: the environment and the result record of each benchmark see measure
+        """
+        benchmarks = self.getBenchmarks()
+        if not names:
+            names = list(benchmarks.keys())
+        unknown = [name for name in names if name not in benchmarks]
+        if unknown:
+            raise Exception(
+                f"unknown benchmarks {unknown} - available are {list(benchmarks.keys())}"
+            )
+        self.locator.populate_db()
+        results = []
+        for name in names:
+            func, workload = benchmarks[name]
+            record = self.measure(name, func, workload)
+            if self.debug:
+                print(record, file=sys.stderr)
+            results.append(record)
+        stat = os.stat(self.locator.db_file)
+        report = {
+            "geograpy": geograpy.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "db_file": self.locator.db_file,
+            "db_size": stat.st_size,
+            "rounds": self.rounds,
+            "benchmarks": results,
+        }
+        return report
@@ -0,0 +1,375 @@
+"""
+Created on 2026-10-17
+
+persistent cache of the entities found in texts
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+import weakref
+
+
+class EntityCache:
+    """
+    SQLite based cache of the entities that an extraction engine found in a text
+
+    The entries are keyed by a hash of the normalized text, the labels and the
+    signature of the engine e.g. the NLTK version and model files so that the results
+    of another engine or model are never returned. If there are more than maxEntries
+    entries the least recently used ones are evicted.
+
+    The cache may be shared by multiple threads and - via the file - by multiple processes
+    """
+
+    def __init__(
+        self, cacheFile: str = None, maxEntries: int = 100000, debug: bool = False
+    ):
+        """
+        constructor
+
+        Args:
+            cacheFile(str): the path of the SQLite database file - default: entities.db in the .geograpy3 directory of the home directory
+            maxEntries(int): the maximum number of entries to keep
+            debug(bool): if True show debug information
+        """
+        if maxEntries < 1:
+            raise Exception("maxEntries needs to be at least 1")
+        if cacheFile is None:
+            homeDir = os.path.expanduser("~")
+            cacheFile = os.path.join(homeDir, ".geograpy3", "entities.db")
+        self.cacheFile = cacheFile
+        self.maxEntries = maxEntries
+        self.debug = debug
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.connection = None
+        self.pid = None
+        self.count = 0
+        self.clock = 0
+        # the signature of each engine using me see getEngineSignature
+        self.engineSignatures = weakref.WeakKeyDictionary()
+
+    def getEngineSignature(self, engine) -> str:
+        """
+        get the signature of the given engine for the cache keys - it is computed
+        on first use and kept as long as the engine exists
+
+        Args:
+            engine(object): the engine e.g. an NLTKEngine or GazetteerEngine
+
+        Returns:
+            str: the signature the engine provides or its class name
+        """
+        try:
+            signature = self.engineSignatures.get(engine)
+        except TypeError:
+            # the engine is not hashable or can not be referenced weakly
+            signature = None
+            cacheable = False
+        else:
+            cacheable = True
+        if signature is None:
+            if hasattr(engine, "getSignature"):
+                signature = engine.getSignature()
+            else:
+                engineClass = type(engine)
+                signature = f"{engineClass.__module__}.{engineClass.__qualname__}"
+            if cacheable:
+                with self.lock:
+                    self.engineSignatures[engine] = signature
+        return signature
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        normalize the given text so that copies which only differ in the unicode
+        normal form or the whitespace get the same key
+
+        Args:
+            text(str): the text to normalize
+
+        Returns:
+            str: the NFC normalized text with runs of whitespace replaced by a single blank
+        """
+        return " ".join(unicodedata.normalize("NFC", text).split())
+
+    @staticmethod
+    def getKey(text: str, labels, engineSignature: str) -> str:
+        """
+        get the cache key for the given normalized text
+
+        Args:
+            text(str): the normalized text
+            labels(list): the labels the entities are extracted for
+            engineSignature(str): the signature of the engine see CachingEngine.getSignature
+
+        Returns:
+            str: the hex digest of the key
+        """
+        labelsKey = ",".join(sorted(set(labels)))
+        keyText = f"{engineSignature}\x00{labelsKey}\x00{text}"
+        return hashlib.sha256(keyText.encode("utf-8")).hexdigest()
+
+    def getConnection(self) -> sqlite3.Connection:
+        """
+        get my database connection - it is opened on first use and reopened
+        in a forked process since a connection must not be shared by processes
+
+        Returns:
+            sqlite3.Connection: the connection
+        """
+        if self.connection is None or self.pid != os.getpid():
+            cacheDir = os.path.dirname(os.path.abspath(self.cacheFile))
+            os.makedirs(cacheDir, exist_ok=True)
+            connection = sqlite3.connect(
+                self.cacheFile, timeout=30.0, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.execute(
+                    """CREATE TABLE IF NOT EXISTS entities (
+                    key TEXT PRIMARY KEY,
+                    entities TEXT NOT NULL,
+                    lastUsed INTEGER NOT NULL
+                )"""
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS entities_lastUsed ON entities(lastUsed)"
+                )
+            countQuery = "SELECT COUNT(*) FROM entities"
+            self.count = connection.execute(countQuery).fetchone()[0]
+            self.connection = connection
+            self.pid = os.getpid()
+        return self.connection
+
+    def tick(self) -> int:
+        """
+        get the time of a use of entries - the times of this instance are strictly
+        increasing even if the clock resolution is coarse
+
+        Returns:
+            int: the time in nanoseconds
+        """
+        self.clock = max(time.time_ns(), self.clock + 1)
+        return self.clock
+
+    def get_many(self, keys: list) -> dict:
+        """
+        get the cached entities for the given keys and mark them as recently used
+
+        Args:
+            keys(list): the cache keys
+
+        Returns:
+            dict: the list of entities by key for the keys found
+        """
+        found = {}
+        with self.lock:
+            connection = self.getConnection()
+            uniqueKeys = list(set(keys))
+            # stay below the SQLite limit for the number of parameters
+            for offset in range(0, len(uniqueKeys), 500):
+                batch = uniqueKeys[offset : offset + 500]
+                params = ",".join("?" * len(batch))
+                query = f"SELECT key, entities FROM entities WHERE key IN ({params})"
+                for key, entities in connection.execute(query, batch):
+                    found[key] = json.loads(entities)
+            if found:
+                now = self.tick()
+                with connection:
+                    connection.executemany(
+                        "UPDATE entities SET lastUsed=? WHERE key=?",
+                        [(now, key) for key in found],
+                    )
+            hits = sum(1 for key in keys if key in found)
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return found
+
+    def get(self, key: str) -> list:
+        """
+        get the cached entities for the given key
+
+        Args:
+            key(str): the cache key
+
+        Returns:
+            list: the entities or None if the key is not cached
+        """
+        return self.get_many([key]).get(key)
+
+    def put_many(self, entries: dict):
+        """
+        store the given entities and evict the least recently used entries
+        if there are more than maxEntries
+
+        Args:
+            entries(dict): the list of entities by key
+        """
+        if not entries:
+            return
+        with self.lock:
+            connection = self.getConnection()
+            now = self.tick()
+            with connection:
+                connection.executemany(
+                    """INSERT OR REPLACE INTO entities (key, entities, lastUsed)
+                    VALUES (?,?,?)""",
+                    [
+                        (key, json.dumps(entities, ensure_ascii=False), now)
+                        for key, entities in entries.items()
+                    ],
+                )
+            # the count is an upper bound since replaced keys
+            # and the entries of other processes are not tracked
+            self.count += len(entries)
+            if self.count > self.maxEntries:
+                self.evict(connection)
+
+    def put(self, key: str, entities: list):
+        """
+        store the given entities
+
+        Args:
+            key(str): the cache key
+            entities(list): the entities found
+        """
+        self.put_many({key: entities})
+
+    def evict(self, connection: sqlite3.Connection):
+        """
+        delete the least recently used entries above maxEntries
+
+        Args:
+            connection(sqlite3.Connection): the connection to use
+        """
+        count = connection.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+        if count > self.maxEntries:
+            with connection:
+                connection.execute(
+                    """DELETE FROM entities WHERE key IN (
+                    SELECT key FROM entities ORDER BY lastUsed LIMIT ?
+                )""",
+                    (count - self.maxEntries,),
+                )
+            if self.debug:
+                evicted = count - self.maxEntries
+                print(f"evicted {evicted} entries from {self.cacheFile}")
+            count = self.maxEntries
+        self.count = count
+
+    def size(self) -> int:
+        """
+        get the number of cached entries
+
+        Returns:
+            int: the number of entries
+        """
+        with self.lock:
+            connection = self.getConnection()
+            return connection.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+
+    def clear(self):
+        """
+        delete all entries
+        """
+        with self.lock:
+            connection = self.getConnection()
+            with connection:
+                connection.execute("DELETE FROM entities")
+            self.count = 0
+
+    def close(self):
+        """
+        close my database connection
+        """
+        with self.lock:
+            if self.connection is not None and self.pid == os.getpid():
+                self.connection.close()
+            self.connection = None
+
+
+class CachingEngine:
+    """
+    extraction engine that looks up the entities of a text in an EntityCache and
+    only hands the texts that are not cached yet to the wrapped engine
+
+    the wrapped engine analyzes the normalized text so that a cached result is
+    exactly what the engine returns for the text
+    """
+
+    def __init__(self, engine, cache: EntityCache):
+        """
+        constructor
+
+        Args:
+            engine(object): the engine to wrap e.g. an NLTKEngine or GazetteerEngine
+            cache(EntityCache): the cache to use
+        """
+        self.engine = engine
+        self.cache = cache
+        self.signature = None
+
+    def getSignature(self) -> str:
+        """
+        get the signature of the wrapped engine for the cache keys
+
+        Returns:
+            str: the signature the engine provides or its class name
+        """
+        if self.signature is None:
+            self.signature = self.cache.getEngineSignature(self.engine)
+        return self.signature
+
+    def find_entities(self, text: str, labels, debug: bool = False) -> list:
+        """
+        find the entities with the given labels in the given text
+
+        Args:
+            text(str): the text to analyze
+            labels(list): the labels to filter
+            debug(bool): if True print the entities found by the wrapped engine
+
+        Returns:
+            list: the entity names
+        """
+        text = EntityCache.normalize(text)
+        key = EntityCache.getKey(text, labels, self.getSignature())
+        entities = self.cache.get(key)
+        if entities is None:
+            entities = self.engine.find_entities(text, labels, debug=debug)
+            self.cache.put(key, entities)
+        return entities
+
+    def find_entities_many(self, texts: list, labels) -> list:
+        """
+        find the entities with the given labels in the given texts - the texts
+        that are not cached are analyzed by the wrapped engine in one batch
+
+        Args:
+            texts(list): the texts to analyze
+            labels(list): the labels to filter
+
+        Returns:
+            list: the list of entity names for each text
+        """
+        signature = self.getSignature()
+        texts = [EntityCache.normalize(text) for text in texts]
+        keys = [EntityCache.getKey(text, labels, signature) for text in texts]
+        found = self.cache.get_many(keys)
+        missing = {}
+        for text, key in zip(texts, keys):
+            if key not in found and key not in missing:
+                missing[key] = text
+        if missing:
+            entityLists = self.engine.find_entities_many(list(missing.values()), labels)
+            computed = dict(zip(missing.keys(), entityLists))
+            self.cache.put_many(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
@@ -1,16 +1,28 @@
 #!/usr/bin/env python3
 # geograpy-nltk converted to python script 2024-03-29
 # using Extractor as the single point of truth since 2025-07-31
+import hashlib
+import os
 import re
-import nltk
-from newspaper import Article
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
 from geograpy.labels import Labels
 
 
 class Extractor(object):
     """
     Extract geo context for text or from url
+
+    nltk and newspaper are only imported when they are needed so that
+    splitting location strings does not touch NLTK at all
     """
+    # True if the NLTK packages have been checked in this process
+    nltkReady = False
+    nltkLock = threading.Lock()
+
     def __init__(self, text=None, url=None, debug=False):
         """
         Constructor
@@ -25,13 +37,31 @@ class Extractor(object):
         self.text = text
         self.url = url
         self.places = []
-        Extractor.provide_nltk_packages()
 
     @staticmethod
-    def provide_nltk_packages(quiet:bool=True):
+    def isUrl(text:str)->bool:
+        """
+        check whether the given text is a url rather than a text to analyze
+        Args:
+            text(str): the text to check
+        Returns:
+            bool: True if the text is a single word starting with http:// or https://
+        """
+        return re.match(r"https?://\S+$", text.strip()) is not None
+
+    @staticmethod
+    def provide_nltk_packages(quiet:bool=True, force:bool=False):
         """
         Download required NLTK packages if not available
+
+        the packages are only checked once per process
+        Args:
+            quiet(bool): if True do not show the download progress
+            force(bool): if True check the packages again
         """
+        if Extractor.nltkReady and not force:
+            return
+        import nltk
         nltk_packages = [
             "maxent_ne_chunker",
             "maxent_ne_chunker_tab", # Updated 2025-07
@@ -41,23 +71,145 @@ class Extractor(object):
             "punkt_tab", # Updated 2025-07
             "averaged_perceptron_tagger_eng",  # Updated: language-specific
         ]
-
-        for nltk_package in nltk_packages:
-            try:
-                nltk.data.find(nltk_package)
-            except LookupError:
-                nltk.download(nltk_package, quiet=quiet)
+        with Extractor.nltkLock:
+            if Extractor.nltkReady and not force:
+                return
+            ready = True
+            for nltk_package in nltk_packages:
+                try:
+                    nltk.data.find(nltk_package)
+                except LookupError:
+                    if not nltk.download(nltk_package, quiet=quiet):
+                        ready = False
+            # failed downloads are retried on the next call
+            Extractor.nltkReady = ready
 
     def set_text(self):
         """
         Setter for text
         """
         if not self.text and self.url:
+            from newspaper import Article
             a = Article(self.url)
             a.download()
             a.parse()
             self.text = a.text
 
+    @staticmethod
+    def fetch_text(url:str, session=None, timeout:float=30.0)->str:
+        """
+        fetch the given url and extract the article text
+        Args:
+            url(str): the url to fetch
+            session(requests.Session): the session to use e.g. for keep-alive connections - if None a new one is used
+            timeout(float): the deadline in seconds for the whole download - it is checked between the chunks received
+        Returns:
+            str: the article text
+        """
+        import requests
+        from newspaper import Article
+        deadline = time.monotonic() + timeout
+        ownSession = session is None
+        if ownSession:
+            session = requests.Session()
+        try:
+            with session.get(url, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                chunks = []
+                for chunk in response.iter_content(chunk_size=16384):
+                    if time.monotonic() > deadline:
+                        raise Exception(f"fetching {url} took longer than {timeout} s")
+                    chunks.append(chunk)
+                encoding = "utf-8"
+                if "charset" in response.headers.get("content-type", "") and response.encoding:
+                    encoding = response.encoding
+        finally:
+            if ownSession:
+                session.close()
+        html = b"".join(chunks).decode(encoding, errors="replace")
+        a = Article(url)
+        a.download(input_html=html)
+        a.parse()
+        return a.text
+
+    @staticmethod
+    def fetch_many(urls, concurrency:int=8, per_host_limit:int=2, timeout:float=30.0):
+        """
+        fetch the article texts of the given urls concurrently
+
+        the pages are yielded as they arrive. Each worker thread keeps its own session
+        with pooled keep-alive connections and at most per_host_limit requests
+        are sent to the same host at a time. Only a bounded window of the urls is read ahead
+        so that urls may be a generator of any length
+        Args:
+            urls(Iterable): the urls to fetch
+            concurrency(int): the maximum number of concurrent requests
+            per_host_limit(int): the maximum number of concurrent requests per host
+            timeout(float): the deadline in seconds for each request
+        Returns:
+            Generator: (index, url, text, error) tuples - text is None and error the message if the fetch failed
+        """
+        if concurrency < 1 or per_host_limit < 1:
+            raise Exception("concurrency and per_host_limit need to be at least 1")
+        import requests
+        from requests.adapters import HTTPAdapter
+        threadLocal = threading.local()
+        sessions = []
+        sessionsLock = threading.Lock()
+
+        def fetch(url):
+            session = getattr(threadLocal, "session", None)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=per_host_limit)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                threadLocal.session = session
+                with sessionsLock:
+                    sessions.append(session)
+            return Extractor.fetch_text(url, session=session, timeout=timeout)
+
+        urlIterator = enumerate(urls)
+        window = max(concurrency * 4, 64)
+        pending = deque()
+        active = Counter()
+        futures = {}
+        exhausted = False
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="geograpy-fetch")
+        try:
+            while True:
+                while not exhausted and len(pending) < window:
+                    try:
+                        pending.append(next(urlIterator))
+                    except StopIteration:
+                        exhausted = True
+                # start the fetches for the hosts that are below their limit keeping the order otherwise
+                for _i in range(len(pending)):
+                    if len(futures) >= concurrency:
+                        break
+                    index, url = pending.popleft()
+                    host = urlparse(url).netloc
+                    if active[host] < per_host_limit:
+                        active[host] += 1
+                        futures[executor.submit(fetch, url)] = (index, url, host)
+                    else:
+                        pending.append((index, url))
+                if not futures:
+                    break
+                done, _notDone = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, url, host = futures.pop(future)
+                    active[host] -= 1
+                    try:
+                        text, error = future.result(), None
+                    except Exception as ex:
+                        text, error = None, str(ex)
+                    yield index, url, text, error
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            for session in sessions:
+                session.close()
+
     def split(self, delimiter=r","):
         """
         simpler regular expression splitter with not entity check
@@ -76,28 +228,201 @@ class Extractor(object):
         self.find_entities(Labels.geo)
         return self.places
 
-    def find_entities(self, labels=Labels.default):
+    def find_entities(self, labels=Labels.default, engine=None, cache=None):
         """
         Find entities with the given labels set self.places and returns it
+        - the places of previous calls are replaced
         Args:
             labels:
                 Labels: The labels to filter
+            engine:
+                NLTKEngine: the engine to use - if None the shared NLTKEngine is used
+            cache:
+                EntityCache: the cache to look up and store the entities of the text - if None nothing is cached
         Returns:
             list:
                 List of places
         """
+        engine = Extractor.getEngine(engine, cache=cache)
         self.set_text()
-        text = nltk.word_tokenize(self.text)
-        nes = nltk.ne_chunk(nltk.pos_tag(text))
+        self.places = engine.find_entities(self.text, labels, debug=self.debug)
+        return self.places
+
+    @staticmethod
+    def getEngine(engine=None, cache=None):
+        """
+        get the extraction engine for the given name
+        Args:
+            engine(str|object): "nltk" or "gazetteer" for the shared NLTKEngine or GazetteerEngine
+                or an engine instance - if None the shared NLTKEngine is used
+            cache(EntityCache): if not None the engine is wrapped by a CachingEngine using this cache
+        Returns:
+            the engine
+        """
+        if engine is None or engine == "nltk":
+            engine = NLTKEngine.getInstance()
+        elif engine == "gazetteer":
+            from geograpy.gazetteer import GazetteerEngine
+            engine = GazetteerEngine.getInstance()
+        elif isinstance(engine, str):
+            raise Exception(f"unknown engine {engine} - use nltk or gazetteer")
+        if cache is not None:
+            from geograpy.entitycache import CachingEngine
+            engine = CachingEngine(engine, cache)
+        return engine
+
+class NLTKEngine(object):
+    """
+    named entity extraction with the NLTK part of speech tagger and named entity chunker
+    which are loaded once and reused for all texts
+
+    the models are only read after loading so that an engine can be used by
+    multiple threads and is inherited by forked worker processes
+    """
+    # shared instance see getInstance
+    instance = None
+    lock = threading.Lock()
+
+    def __init__(self, language:str="english"):
+        """
+        Constructor
+        Args:
+            language(str): the language of the punkt sentence tokenizer
+        """
+        self.language = language
+        self.tagger = None
+        self.chunker = None
+        self.signature = None
+
+    @classmethod
+    def getInstance(cls):
+        """
+        get the shared engine loading it on first use
+        Returns:
+            NLTKEngine: the shared engine
+        """
+        if cls.instance is None:
+            with cls.lock:
+                if cls.instance is None:
+                    cls.instance = cls().load()
+        return cls.instance
+
+    def load(self):
+        """
+        load the tagger and the chunker that nltk.pos_tag and nltk.ne_chunk use
+        """
+        Extractor.provide_nltk_packages()
+        from nltk.chunk.named_entity import Maxent_NE_Chunker
+        from nltk.tag import PerceptronTagger
+        self.tagger = PerceptronTagger()
+        self.chunker = Maxent_NE_Chunker()
+        return self
+
+    def getSignature(self)->str:
+        """
+        get the signature of the NLTK version and the model files of the tokenizer,
+        tagger and chunker to detect that cached results are stale - the model
+        directories are only scanned once since the loaded models do not change
+        Returns:
+            str: the signature
+        """
+        if self.signature is not None:
+            return self.signature
+        import nltk
+        resources = [
+            f"tokenizers/punkt_tab/{self.language}/",
+            "taggers/averaged_perceptron_tagger_eng/",
+            "chunkers/maxent_ne_chunker_tab/english_ace_multiclass/",
+        ]
+        digest = hashlib.sha256()
+        for resource in resources:
+            path = nltk.data.find(resource).path
+            for root, _dirs, files in sorted(os.walk(path)):
+                for file in sorted(files):
+                    stat = os.stat(os.path.join(root, file))
+                    digest.update(f"{resource}{file}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+        self.signature = f"nltk {nltk.__version__} {digest.hexdigest()[:16]}"
+        return self.signature
+
+    def tokenize(self, text:str)->list:
+        """
+        tokenize the given text the way nltk.word_tokenize does
+        Args:
+            text(str): the text to tokenize
+        Returns:
+            list: the tokens
+        """
+        import nltk
+        return nltk.word_tokenize(text, language=self.language)
+
+    def chunk(self, text:str):
+        """
+        tag and chunk the given text
+        Args:
+            text(str): the text to analyze
+        Returns:
+            nltk.tree.Tree: the named entity chunk tree
+        """
+        return self.chunk_many([text])[0]
+
+    def chunk_many(self, texts:list)->list:
+        """
+        tag and chunk the given texts in one batch - each text is tagged as one
+        token sequence so the results are the same as for single texts
+        Args:
+            texts(list): the texts to analyze
+        Returns:
+            list: the named entity chunk tree of each text
+        """
+        tokenLists = [self.tokenize(text) for text in texts]
+        taggedLists = self.tagger.tag_sents(tokenLists)
+        return [self.chunker.parse(tagged) for tagged in taggedLists]
+
+    @staticmethod
+    def entities(nes, labels=Labels.default, debug:bool=False)->list:
+        """
+        get the entities with the given labels from the given chunk tree
+        Args:
+            nes(nltk.tree.Tree): the named entity chunk tree
+            labels(list): the labels to filter
+            debug(bool): if True print the leaves of the entities found
+        Returns:
+            list: the entity names
+        """
+        from nltk.tree import Tree
+        entities = []
         for ne in nes:
-            if type(ne) is nltk.tree.Tree:
+            if type(ne) is Tree:
                 nelabel = ne.label()
                 if nelabel in labels:
                     leaves = ne.leaves()
-                    if self.debug:
+                    if debug:
                         print(leaves)
-                    self.places.append(" ".join([i[0] for i in leaves]))
-        return self.places
+                    entities.append(" ".join([i[0] for i in leaves]))
+        return entities
+
+    def find_entities(self, text:str, labels=Labels.default, debug:bool=False)->list:
+        """
+        find the entities with the given labels in the given text
+        Args:
+            text(str): the text to analyze
+            labels(list): the labels to filter
+            debug(bool): if True print the leaves of the entities found
+        Returns:
+            list: the entity names
+        """
+        return self.entities(self.chunk(text), labels, debug=debug)
+
+    def find_entities_many(self, texts:list, labels=Labels.default)->list:
+        """
+        find the entities with the given labels in the given texts in one batch
+        Args:
+            texts(list): the texts to analyze
+            labels(list): the labels to filter
+        Returns:
+            list: the list of entity names for each text
+        """
+        return [self.entities(nes, labels) for nes in self.chunk_many(texts)]
 
 def main():
     """Download essential NLTK datasets"""
@@ -0,0 +1,334 @@
+"""
+Created on 2026-10-17
+
+gazetteer based place extraction with an Aho-Corasick automaton
+"""
+import os
+import pickle
+import re
+import threading
+from array import array
+
+from geograpy.labels import Labels
+from geograpy.locator import Locator
+from geograpy.utils import Profiler
+
+# words and single punctuation characters - place names and texts are tokenized the same way
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+class GazetteerEngine:
+    """
+    place extraction engine that finds the known country, region and city names and labels
+    of the locations database in a text
+
+    The names are split into tokens and compiled into an Aho-Corasick automaton over
+    token ids so that a text is scanned in linear time. Overlapping matches are resolved
+    leftmost longest e.g. "New York City" wins over "York". Matching is case sensitive
+    and only names starting with an uppercase letter and having at least two characters are used.
+
+    The automaton is pickled next to the database file and rebuilt when the database changes.
+    It is only read after loading so that an engine can be used by multiple threads
+    """
+
+    # version of the pickled automaton format
+    version = 1
+    # shared instances by database file see getInstance
+    instances = {}
+    lock = threading.Lock()
+
+    def __init__(
+        self, locator: Locator = None, cacheFile: str = None, debug: bool = False
+    ):
+        """
+        constructor
+
+        Args:
+            locator(Locator): the Locator for the database to read the names from - if None the shared Locator is used
+            cacheFile(str): the path of the pickled automaton - default: gazetteer.pickle next to the database file
+            debug(bool): if True show debug information
+        """
+        if locator is None:
+            locator = Locator.getInstance(threadSafe=True)
+        self.locator = locator
+        if cacheFile is None:
+            dbDir = os.path.dirname(locator.db_file)
+            cacheFile = os.path.join(dbDir, "gazetteer.pickle")
+        self.cacheFile = cacheFile
+        self.debug = debug
+        self.signature = None
+        self.vocabulary = {}
+        self.goto = {}
+        self.fail = array("i")
+        self.dictLink = array("i")
+        self.terminal = array("h")
+
+    @classmethod
+    def getInstance(cls, locator: Locator = None):
+        """
+        get the shared engine for the database of the given Locator loading it on first use
+        and again when the database file has changed
+
+        Args:
+            locator(Locator): the Locator - if None the shared Locator is used
+
+        Returns:
+            GazetteerEngine: the shared engine
+        """
+        if locator is None:
+            locator = Locator.getInstance(threadSafe=True)
+        signature = locator.db_fileSignature()
+        engine = cls.instances.get(locator.db_file)
+        if engine is None or engine.signature != signature:
+            with cls.lock:
+                engine = cls.instances.get(locator.db_file)
+                if engine is None or engine.signature != signature:
+                    engine = cls(locator).load()
+                    cls.instances[locator.db_file] = engine
+        return engine
+
+    @staticmethod
+    def tokenize(text: str) -> list:
+        """
+        split the given text into tokens
+
+        Args:
+            text(str): the text to tokenize
+
+        Returns:
+            list: the re.Match of each token
+        """
+        return list(TOKEN_PATTERN.finditer(text))
+
+    @staticmethod
+    def isCandidate(name: str) -> bool:
+        """
+        check whether the given place name is used for matching
+
+        Args:
+            name(str): the name or label
+
+        Returns:
+            bool: True if the name has at least two characters and starts with an uppercase letter
+        """
+        return name is not None and len(name) >= 2 and name[0].isupper()
+
+    def getNames(self) -> set:
+        """
+        get the country, region and city names and labels of my database
+
+        Returns:
+            set: the names
+        """
+        queries = [
+            "SELECT name FROM countries",
+            "SELECT label AS name FROM country_labels",
+            "SELECT name FROM regions",
+            "SELECT label AS name FROM region_labels",
+            "SELECT label AS name FROM city_labels",
+        ]
+        names = set()
+        for query in queries:
+            for record in self.locator.sqlDB.query(query):
+                name = record["name"]
+                if GazetteerEngine.isCandidate(name):
+                    names.add(name)
+        return names
+
+    def build(self, names):
+        """
+        build the Aho-Corasick automaton for the given names
+
+        Args:
+            names(Iterable): the place names to find
+        """
+        patterns = []
+        vocabulary = {}
+        for name in names:
+            tokens = [match.group() for match in GazetteerEngine.tokenize(name)]
+            if tokens:
+                patterns.append(
+                    [vocabulary.setdefault(token, len(vocabulary)) for token in tokens]
+                )
+        width = max(len(vocabulary), 1)
+        # the transitions are keyed by node * width + token id
+        goto = {}
+        children = [[]]
+        terminal = [0]
+        for pattern in patterns:
+            node = 0
+            for tokenId in pattern:
+                key = node * width + tokenId
+                child = goto.get(key)
+                if child is None:
+                    child = len(terminal)
+                    goto[key] = child
+                    children[node].append((tokenId, child))
+                    children.append([])
+                    terminal.append(0)
+                node = child
+            terminal[node] = len(pattern)
+        # breadth first computation of the failure and dictionary suffix links
+        fail = [0] * len(terminal)
+        dictLink = [0] * len(terminal)
+        queue = [child for _tokenId, child in children[0]]
+        for node in queue:
+            for tokenId, child in children[node]:
+                state = fail[node]
+                while state and state * width + tokenId not in goto:
+                    state = fail[state]
+                failState = goto.get(state * width + tokenId, 0)
+                fail[child] = failState
+                if terminal[failState]:
+                    dictLink[child] = failState
+                else:
+                    dictLink[child] = dictLink[failState]
+                queue.append(child)
+        self.vocabulary = vocabulary
+        self.goto = goto
+        self.fail = array("i", fail)
+        self.dictLink = array("i", dictLink)
+        self.terminal = array("h", terminal)
+
+    def load(self):
+        """
+        load the pickled automaton or build it from the database and pickle it if
+        there is none for the current database file
+
+        a truncated or corrupt cache file e.g. of a killed process is rebuilt
+        """
+        # the signature of the populated database - a missing one is created first
+        self.locator.populate_db()
+        signature = self.locator.db_fileSignature()
+        if os.path.isfile(self.cacheFile):
+            try:
+                with open(self.cacheFile, "rb") as cache:
+                    state = pickle.load(cache)
+                if (
+                    state.get("version") == self.version
+                    and state.get("signature") == signature
+                ):
+                    self.__dict__.update(state["automaton"])
+                    self.signature = signature
+                    return self
+            except Exception as ex:
+                if self.debug:
+                    print(f"could not load gazetteer {self.cacheFile}: {ex}")
+        profiler = Profiler("building gazetteer", profile=self.debug)
+        self.build(self.getNames())
+        self.signature = signature
+        profiler.time(f" ({len(self.terminal)} states)")
+        self.store()
+        return self
+
+    def getSignature(self) -> str:
+        """
+        get the signature of my automaton format and database to detect that cached results are stale
+
+        Returns:
+            str: the signature
+        """
+        return f"gazetteer {self.version} {self.signature}"
+
+    def store(self):
+        """
+        pickle my automaton to my cache file - a database directory that is
+        not writable only disables the caching
+        """
+        state = {
+            "version": self.version,
+            "signature": self.signature,
+            "automaton": {
+                "vocabulary": self.vocabulary,
+                "goto": self.goto,
+                "fail": self.fail,
+                "dictLink": self.dictLink,
+                "terminal": self.terminal,
+            },
+        }
+        tmpFile = f"{self.cacheFile}.{os.getpid()}.tmp"
+        try:
+            with open(tmpFile, "wb") as cache:
+                pickle.dump(state, cache, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmpFile, self.cacheFile)
+        except OSError as ex:
+            if self.debug:
+                print(f"could not store gazetteer {self.cacheFile}: {ex}")
+
+    def matches(self, tokens: list) -> list:
+        """
+        get the leftmost longest non overlapping matches of the place names in the given tokens
+
+        Args:
+            tokens(list): the tokens of the text
+
+        Returns:
+            list: (start, end) token index pairs of the matches - end is inclusive
+        """
+        width = max(len(self.vocabulary), 1)
+        goto = self.goto
+        fail = self.fail
+        dictLink = self.dictLink
+        terminal = self.terminal
+        candidates = []
+        node = 0
+        for position, token in enumerate(tokens):
+            tokenId = self.vocabulary.get(token.group())
+            if tokenId is None:
+                # no name contains this token
+                node = 0
+                continue
+            while node and node * width + tokenId not in goto:
+                node = fail[node]
+            node = goto.get(node * width + tokenId, 0)
+            output = node if terminal[node] else dictLink[node]
+            while output:
+                candidates.append((position - terminal[output] + 1, position))
+                output = dictLink[output]
+        candidates.sort(key=lambda match: (match[0], -match[1]))
+        selected = []
+        lastEnd = -1
+        for start, end in candidates:
+            if start > lastEnd:
+                selected.append((start, end))
+                lastEnd = end
+        return selected
+
+    def find_entities(
+        self, text: str, labels=Labels.default, debug: bool = False
+    ) -> list:
+        """
+        find the place names in the given text
+
+        Args:
+            text(str): the text to analyze
+            labels(list): the NLTK labels to extract places for - the names are
+                only found if one of the geographic labels is included
+            debug(bool): if True print the names found
+
+        Returns:
+            list: the place names in the order of their occurrence
+        """
+        if not any(label in Labels.geo for label in labels):
+            return []
+        tokens = GazetteerEngine.tokenize(text)
+        entities = []
+        for start, end in self.matches(tokens):
+            entity = text[tokens[start].start() : tokens[end].end()]
+            if debug:
+                print(entity)
+            entities.append(entity)
+        return entities
+
+    def find_entities_many(self, texts: list, labels=Labels.default) -> list:
+        """
+        find the place names in the given texts
+
+        Args:
+            texts(list): the texts to analyze
+            labels(list): the NLTK labels to extract places for
+
+        Returns:
+            list: the list of place names for each text
+        """
+        return [self.find_entities(text, labels) for text in texts]
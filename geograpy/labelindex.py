@@ -0,0 +1,474 @@
+"""
+Created on 2026-10-17
+
+memory resident index of the lookup data of the locations database
+"""
+import string
+import sys
+
+from lodstorage.sql import SQLDB
+
+from geograpy.utils import Profiler, remove_non_ascii
+
+# ASCII only case folding as done by the SQLite LIKE operator
+ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def foldCase(name: str) -> str:
+    """
+    fold the case of the given name the way the SQLite LIKE operator does
+    which only folds ASCII characters
+
+    Args:
+        name(str): the name to fold
+
+    Returns:
+        str: the folded name
+    """
+    return name.translate(ASCII_LOWER)
+
+
+def isLikePattern(name: str) -> bool:
+    """
+    check whether the given name contains LIKE wildcards
+
+    Args:
+        name(str): the name to check
+
+    Returns:
+        bool: True if the name contains a % or _ wildcard
+    """
+    return "%" in name or "_" in name
+
+
+class RecordIndex:
+    """
+    a compact index of records as tuples with shared column names
+    and interned values
+    """
+
+    def __init__(self, columns: list):
+        """
+        constructor
+
+        Args:
+            columns(list): the column names of the records
+        """
+        self.columns = columns
+        self.byKey = {}
+        self.interned = {}
+
+    def intern(self, row: tuple) -> tuple:
+        """
+        intern the string values of the given row so that repeated values
+        e.g. the region and country details of cities are only held once
+
+        Args:
+            row(tuple): the row to intern
+
+        Returns:
+            tuple: the row with interned values
+        """
+        values = self.interned
+        row = tuple(
+            [values.setdefault(value, value) if type(value) is str else value for value in row]
+        )
+        return row
+
+    def add(self, key, row: tuple):
+        """
+        add the given row for the given key
+
+        Args:
+            key(object): the key to index the row with
+            row(tuple): the row to add
+        """
+        self.byKey.setdefault(key, []).append(row)
+
+    def get(self, key) -> list:
+        """
+        get the records for the given key
+
+        Args:
+            key(object): the key to lookup
+
+        Returns:
+            list: a list of dicts for the records
+        """
+        rows = self.byKey.get(key, [])
+        records = [dict(zip(self.columns, row)) for row in rows]
+        return records
+
+    def footprint(self) -> int:
+        """
+        estimate the memory footprint of this index
+
+        Returns:
+            int: the approximate number of bytes used
+        """
+        size = sys.getsizeof(self.byKey)
+        seen = set()
+        for key, rows in self.byKey.items():
+            size += sys.getsizeof(key) + sys.getsizeof(rows)
+            for row in rows:
+                if id(row) not in seen:
+                    seen.add(id(row))
+                    size += sys.getsizeof(row)
+                    for value in row:
+                        if id(value) not in seen:
+                            seen.add(id(value))
+                            size += sys.getsizeof(value)
+        return size
+
+
+def loadRecords(sqlDB: SQLDB, query: str) -> tuple:
+    """
+    get the columns and rows for the given query
+
+    Args:
+        sqlDB(SQLDB): the database to query
+        query(str): the SQL query to run
+
+    Returns:
+        tuple: the list of column names and the list of row tuples
+    """
+    cursor = sqlDB.c.cursor()
+    cursor.execute(query)
+    columns = [d[0] for d in cursor.description]
+    rows = cursor.fetchall()
+    cursor.close()
+    return columns, rows
+
+
+class CountryIndex:
+    """
+    memory resident index of the countries by iso code and by case folded
+    name and label to replace the LIKE based lookups which can not use
+    an SQLite index
+    """
+
+    def __init__(self, sqlDB: SQLDB):
+        """
+        constructor
+
+        Args:
+            sqlDB(SQLDB): the database to load the index from
+        """
+        self.sqlDB = sqlDB
+        self.isoIndex = None
+        self.nameIndex = None
+
+    def load(self):
+        """
+        load the countries by iso code and by case folded name and label
+        """
+        columns, rows = loadRecords(self.sqlDB, "SELECT * FROM countries")
+        self.isoIndex = RecordIndex(columns)
+        self.nameIndex = RecordIndex(columns)
+        isoIndex = columns.index("iso")
+        nameIndex = columns.index("name")
+        widIndex = columns.index("wikidataid")
+        rowsByWikidataId = {}
+        for row in rows:
+            self.isoIndex.add(row[isoIndex], row)
+            rowsByWikidataId.setdefault(row[widIndex], []).append(row)
+        rowsByName = {}
+        for row in rows:
+            if row[nameIndex] is not None:
+                rowsByName.setdefault(foldCase(row[nameIndex]), []).append(row)
+        labelRecords = self.sqlDB.query("SELECT wikidataid,label FROM country_labels")
+        for labelRecord in labelRecords:
+            label = labelRecord["label"]
+            if label is not None:
+                labelRows = rowsByWikidataId.get(labelRecord["wikidataid"], [])
+                rowsByName.setdefault(foldCase(label), []).extend(labelRows)
+        # a country matches by name or label - keep each row only once in table order
+        rowOrder = {id(row): i for i, row in enumerate(rows)}
+        for key, nameRows in rowsByName.items():
+            uniqueRows = {id(row): row for row in nameRows}
+            for rowId in sorted(uniqueRows, key=lambda rowId: rowOrder[rowId]):
+                self.nameIndex.add(key, uniqueRows[rowId])
+        return self
+
+    def countries_for_name(self, name: str, isIso: bool) -> list:
+        """
+        get the country records for the given name with the semantics of
+        the LIKE based name and label lookup of Locator.getCountry
+
+        Args:
+            name(str): the name, label or iso code of the country
+            isIso(bool): True if the name is an iso code
+
+        Returns:
+            list: the list of country records or None if the name is a LIKE pattern
+            that can not be resolved by the index
+        """
+        if isIso:
+            countryRecords = self.isoIndex.get(name)
+        elif isLikePattern(name):
+            countryRecords = None
+        else:
+            countryRecords = self.nameIndex.get(foldCase(name))
+        return countryRecords
+
+    def wikidataids_for_name(self, name: str) -> list:
+        """
+        get the wikidataids of the countries matching the given name or label
+
+        Args:
+            name(str): the name or label of the country
+
+        Returns:
+            list: the list of wikidataids or None if the name is a LIKE pattern
+        """
+        countryRecords = self.countries_for_name(name, isIso=False)
+        wikidataids = None
+        if countryRecords is not None:
+            wikidataids = list(
+                dict.fromkeys(record["wikidataid"] for record in countryRecords)
+            )
+        return wikidataids
+
+    def footprint(self) -> int:
+        """
+        estimate the memory footprint of this index
+
+        Returns:
+            int: the approximate number of bytes used
+        """
+        return self.isoIndex.footprint() + self.nameIndex.footprint()
+
+
+class CountryRegions:
+    """
+    memory resident mapping of the countries to their regions with the region names
+    and their ASCII folded forms so that the region lookups by country
+    do not need to touch SQLite
+    """
+
+    def __init__(self, sqlDB: SQLDB, signature: tuple = None):
+        """
+        constructor
+
+        Args:
+            sqlDB(SQLDB): the database to load the regions from
+            signature(tuple): the signature of the database file the regions are loaded from
+        """
+        self.sqlDB = sqlDB
+        self.signature = signature
+        self.regionIndex = None
+        self.countryIdsByName = {}
+        self.namesByCountryId = {}
+        self.foldedNamesByCountryId = {}
+
+    def load(self):
+        """
+        load the regions by the wikidataid of their country
+        """
+        for countryRecord in self.sqlDB.query("SELECT wikidataid,name FROM countries"):
+            self.countryIdsByName.setdefault(countryRecord["name"], []).append(
+                countryRecord["wikidataid"]
+            )
+        columns, rows = loadRecords(self.sqlDB, "SELECT * FROM regions")
+        self.regionIndex = RecordIndex(columns)
+        countryIdIndex = columns.index("countryId")
+        nameIndex = columns.index("name")
+        for row in rows:
+            self.regionIndex.add(row[countryIdIndex], row)
+        for countryId, regionRows in self.regionIndex.byKey.items():
+            names = [row[nameIndex] for row in regionRows]
+            self.namesByCountryId[countryId] = names
+            self.foldedNamesByCountryId[countryId] = [
+                remove_non_ascii(name) if name is not None else None for name in names
+            ]
+        # the mapping is shared - the connection is only needed while loading
+        self.sqlDB = None
+        return self
+
+    def regions_for_country_name(self, countryName: str) -> list:
+        """
+        get the region records of the countries with exactly the given name
+
+        Args:
+            countryName(str): the name of the country
+
+        Returns:
+            list: the list of region records
+        """
+        countryIds = self.countryIdsByName.get(countryName, [])
+        return self.regions_for_country_ids(countryIds)
+
+    def regions_for_country_ids(self, countryIds: list) -> list:
+        """
+        get the region records of the given countries
+
+        Args:
+            countryIds(list): the wikidataids of the countries
+
+        Returns:
+            list: the list of region records
+        """
+        regionRecords = []
+        for countryId in countryIds:
+            regionRecords.extend(self.regionIndex.get(countryId))
+        return regionRecords
+
+    def region_names(self, countryIds: list, folded: bool = False) -> list:
+        """
+        get the region names of the given countries in the order of
+        an SQL query by the regionByCountry index
+
+        Args:
+            countryIds(list): the wikidataids of the countries
+            folded(bool): if True get the ASCII folded names
+
+        Returns:
+            list: the list of region names
+        """
+        namesByCountryId = (
+            self.foldedNamesByCountryId if folded else self.namesByCountryId
+        )
+        names = []
+        for countryId in sorted(set(countryIds)):
+            names.extend(namesByCountryId.get(countryId, []))
+        return names
+
+
+class LabelIndex:
+    """
+    memory resident index of the city, region and country lookup data
+    of the locations database so that the Locator lookups by name
+    do not need to touch SQLite
+
+    The cities are held as one interned tuple per CityLookup record so that the
+    region and country details which are repeated for each city are only held once.
+    The footprint is in the order of a few hundred bytes per city label
+    and can be checked with footprint()
+    """
+
+    def __init__(self, sqlDB: SQLDB, view: str = "CityLookup", profile: bool = False):
+        """
+        constructor
+
+        Args:
+            sqlDB(SQLDB): the database to load the index from
+            view(str): the view to load the cities from
+            profile(bool): if True show timing information while loading
+        """
+        self.sqlDB = sqlDB
+        self.view = view
+        self.profile = profile
+        self.cityIndex = None
+        self.regionIndexes = {}
+        self.countryIndex = None
+
+    def load(self):
+        """
+        load the index from the database
+        """
+        profiler = Profiler("loading label index", profile=self.profile)
+        self.loadCities()
+        self.loadRegions()
+        self.loadCountries()
+        profiler.time(f" ({len(self.cityIndex.byKey)} city names)")
+        return self
+
+    def loadCities(self):
+        """
+        load the cities by name sorted by population as places_by_name does
+        """
+        query = f"SELECT * FROM {self.view} ORDER BY pop DESC"
+        columns, rows = loadRecords(self.sqlDB, query)
+        popIndex = columns.index("pop")
+        rows.sort(
+            key=lambda row: float(row[popIndex]) if row[popIndex] is not None else 0.0,
+            reverse=True,
+        )
+        self.cityIndex = RecordIndex(columns)
+        nameIndex = columns.index("name")
+        for row in rows:
+            row = self.cityIndex.intern(row)
+            self.cityIndex.add(row[nameIndex], row)
+        # the interned values are only needed while loading
+        self.cityIndex.interned = {}
+
+    def loadRegions(self):
+        """
+        load the regions by name and by iso code
+        """
+        columns, rows = loadRecords(self.sqlDB, "SELECT * FROM regions")
+        self.regionIndexes = {}
+        for columnName in ["name", "iso"]:
+            recordIndex = RecordIndex(columns)
+            columnIndex = columns.index(columnName)
+            for row in rows:
+                recordIndex.add(row[columnIndex], row)
+            self.regionIndexes[columnName] = recordIndex
+
+    def loadCountries(self):
+        """
+        load the countries by iso code and by case folded name and label
+        """
+        self.countryIndex = CountryIndex(self.sqlDB).load()
+
+    def hasColumn(self, columnName: str) -> bool:
+        """
+        check whether places can be looked up by the given column
+
+        Args:
+            columnName(str): the column to check
+
+        Returns:
+            bool: True if the column is indexed
+        """
+        return columnName == "name"
+
+    def places_by_name(self, placeName: str, columnName: str = "name") -> list:
+        """
+        get the city lookup records for the given name
+
+        Args:
+            placeName(str): the name of the place
+            columnName(str): the column to look at - only "name" is indexed
+
+        Returns:
+            list: the list of city lookup records sorted by population
+        """
+        if not self.hasColumn(columnName):
+            raise Exception(f"column {columnName} is not indexed")
+        return self.cityIndex.get(placeName)
+
+    def regions_for_name(self, regionName: str, columnName: str) -> list:
+        """
+        get the region records for the given name or iso code
+
+        Args:
+            regionName(str): the name or iso code of the region
+            columnName(str): name or iso
+
+        Returns:
+            list: the list of region records
+        """
+        return self.regionIndexes[columnName].get(regionName)
+
+    def countries_for_name(self, name: str, isIso: bool) -> list:
+        """
+        get the country records for the given name see CountryIndex.countries_for_name
+        """
+        return self.countryIndex.countries_for_name(name, isIso)
+
+    def footprint(self) -> dict:
+        """
+        estimate the memory footprint of this index
+
+        Returns:
+            dict: the approximate number of bytes used by each part of the index
+        """
+        footprint = {
+            "cities": self.cityIndex.footprint(),
+            "regions": sum(
+                regionIndex.footprint() for regionIndex in self.regionIndexes.values()
+            ),
+            "countries": self.countryIndex.footprint(),
+        }
+        return footprint
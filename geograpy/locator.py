@@ -36,17 +36,20 @@ from math import asin, cos, radians, sin, sqrt
 import os
 from pathlib import Path
 import re
+import sqlite3
 import sys
+import threading
 import traceback
 from typing import Dict, Any
 import urllib
 
-from geograpy.utils import Download, Profiler, remove_non_ascii
+from geograpy.labelindex import CountryIndex, LabelIndex
+from geograpy.misspellings import MisspellingDictionary
+from geograpy.utils import Download, LRUCache, Profiler
 from geograpy.version import Version
 from geograpy.wikidata import Wikidata
 from lodstorage.sql import SQLDB
 from lodstorage.storageconfig import StorageConfig, StoreMode
-from sklearn.neighbors import BallTree
 from lodentity.entity import EntityManager
 from lodentity.jsonable import JSONAbleList
 
@@ -67,6 +70,7 @@ class LocationManager(EntityManager, JSONAbleList):
         config: StorageConfig = None,
         handleInvalidListTypes=True,
         filterInvalidListTypes=False,
+        readOnly: bool = False,
         debug=False,
     ):
         """
@@ -81,8 +85,10 @@ class LocationManager(EntityManager, JSONAbleList):
             config(StorageConfig): the configuration to be used if None a default configuration will be used
             handleInvalidListTypes(bool): True if invalidListTypes should be converted or filtered
             filterInvalidListTypes(bool): True if invalidListTypes should be deleted
+            readOnly(bool): if True open the database read-only see getReadOnlySQLDB
             debug(boolean): override debug setting when default of config is used via config=None
         """
+        self.readOnly = readOnly
         if config is None:
             config = LocationContext.getDefaultConfig()
         # Set default listName before initializing parents
@@ -116,9 +122,133 @@ class LocationManager(EntityManager, JSONAbleList):
         )
         self.balltree = None
         self.locationByWikidataID = {}
+        self.threadLocal = threading.local()
         if config is not None and config.mode == StoreMode.SQL:
             self.sqldb = self.getSQLDB(config.cacheFile)
 
+    # pragmas for serving the static database read-only - the database file is memory mapped
+    # so that all processes share the OS page cache instead of copying pages to their own cache
+    readOnlyPragmas = {
+        "mmap_size": 1 << 30,
+        "cache_size": -16384,
+        "query_only": 1,
+        "temp_store": "MEMORY",
+    }
+
+    @classmethod
+    def getReadOnlySQLDB(
+        cls, cacheFile: str, debug: bool = False, errorDebug: bool = False
+    ) -> SQLDB:
+        """
+        open the given database file read-only and immutable with the readOnlyPragmas
+
+        SQLite does no locking and change detection for immutable databases so the
+        file must not be modified while it is open. The connection may be closed by
+        another thread e.g. when a server replaces its state on a reload
+
+        Args:
+            cacheFile(str): the path of the database file
+            debug(bool): if True switch on debug
+            errorDebug(bool): if True show debug info on errors
+
+        Returns:
+            SQLDB: the read-only database
+        """
+        dbPath = urllib.request.pathname2url(os.path.abspath(cacheFile))
+        connection = sqlite3.connect(
+            f"file:{dbPath}?mode=ro&immutable=1",
+            uri=True,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+        )
+        for pragma, value in cls.readOnlyPragmas.items():
+            connection.execute(f"PRAGMA {pragma}={value}")
+        sqlDB = SQLDB(cacheFile, connection=connection, debug=debug, errorDebug=errorDebug)
+        return sqlDB
+
+    def getSQLDB(self, cacheFile):
+        """
+        get the SQL database for the given cacheFile
+
+        Args:
+            cacheFile(string): the file to get the SQL db from
+        """
+        if not self.readOnly:
+            return super().getSQLDB(cacheFile)
+        config = self.config
+        sqldb = self.sqldb = LocationManager.getReadOnlySQLDB(
+            cacheFile, debug=config.debug, errorDebug=config.errorDebug
+        )
+        return sqldb
+
+    @staticmethod
+    def fileSignature(filePath: str):
+        """
+        get the signature of the given file to detect that it has been modified or replaced
+
+        Args:
+            filePath(str): the path of the file
+
+        Returns:
+            tuple: the modification time, inode and size of the file or None if there is no such file
+        """
+        try:
+            stat = os.stat(filePath)
+            signature = (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+        except OSError:
+            signature = None
+        return signature
+
+    def getThreadSQLDB(self) -> SQLDB:
+        """
+        get the SQL database of my cacheFile for lookups - the connection is opened
+        once per thread and reused by further lookups of the same thread as long as
+        the file is not modified or replaced
+
+        Returns:
+            SQLDB: the database connection of the current thread
+        """
+        cacheFile = self.config.cacheFile
+        signature = LocationManager.fileSignature(cacheFile)
+        threadLocal = self.threadLocal
+        if (
+            getattr(threadLocal, "cacheFile", None) != cacheFile
+            or getattr(threadLocal, "signature", None) != signature
+        ):
+            # an immutable connection must not read a modified file
+            if getattr(threadLocal, "sqlDB", None) is not None:
+                threadLocal.sqlDB.close()
+            if self.readOnly:
+                threadLocal.sqlDB = LocationManager.getReadOnlySQLDB(
+                    cacheFile,
+                    debug=self.config.debug,
+                    errorDebug=self.config.errorDebug,
+                )
+            else:
+                threadLocal.sqlDB = SQLDB(
+                    cacheFile,
+                    debug=self.config.debug,
+                    errorDebug=self.config.errorDebug,
+                )
+            threadLocal.cacheFile = cacheFile
+            threadLocal.signature = signature
+        return threadLocal.sqlDB
+
+    def close(self):
+        """
+        close my database connection and the one of the current thread - the connections
+        of other threads are closed when their threads end
+        """
+        if getattr(self, "sqldb", None) is not None:
+            self.sqldb.close()
+            self.sqldb = None
+        threadLocal = self.threadLocal
+        if getattr(threadLocal, "sqlDB", None) is not None:
+            threadLocal.sqlDB.close()
+            threadLocal.sqlDB = None
+            threadLocal.cacheFile = None
+            threadLocal.signature = None
+
     def getBallTuple(self, cache: bool = True):
         """
         get the BallTuple=BallTree,validList of this location list
@@ -131,6 +261,9 @@ class LocationManager(EntityManager, JSONAbleList):
             BallTree,list: a sklearn.neighbors.BallTree for the given list of locations, list: the valid list of locations
             list: valid list of locations
         """
+        # sklearn takes seconds to import and is only needed for the distance queries
+        from sklearn.neighbors import BallTree
+
         validList = []
         if self.balltree is None or not cache:
             coordinatesrad = []
@@ -216,7 +349,7 @@ class LocationManager(EntityManager, JSONAbleList):
             Returns locations that match the given name
         """
         query = f"SELECT * FROM {self.clazz.__name__}Lookup WHERE label IN ({','.join('?'*len(names))})"
-        sqldb = self.getSQLDB(self.config.cacheFile)
+        sqldb = self.getThreadSQLDB()
         locationRecords = sqldb.query(query, params=tuple(names))
         locations = self._locationsFromLookup(*locationRecords)
         return locations
@@ -234,7 +367,7 @@ class LocationManager(EntityManager, JSONAbleList):
         if wikidataIds is None or not wikidataIds:
             return
         query = f"SELECT * FROM {self.clazz.__name__}Lookup WHERE wikidataid IN ({','.join('?'*len(wikidataIds))})"
-        sqldb = self.getSQLDB(self.config.cacheFile)
+        sqldb = self.getThreadSQLDB()
         locationRecords = sqldb.query(query, params=tuple(list(wikidataIds)))
         if locationRecords:
             locations = self._locationsFromLookup(*locationRecords)
@@ -284,7 +417,7 @@ class LocationManager(EntityManager, JSONAbleList):
             else:
                 query = f"SELECT wikidataid FROM {self.tableName} WHERE iso LIKE (?)"
                 params = (isoCode,)
-            sqldb = self.getSQLDB(self.config.cacheFile)
+            sqldb = self.getThreadSQLDB()
             qres = sqldb.query(query, params)
             locationIds = [
                 record["wikidataid"] for record in qres if "wikidataid" in record
@@ -300,7 +433,11 @@ class CountryManager(LocationManager):
     """
 
     def __init__(
-        self, name: str = "CountryManager", config: StorageConfig = None, debug=False
+        self,
+        name: str = "CountryManager",
+        config: StorageConfig = None,
+        readOnly: bool = False,
+        debug=False,
     ):
         super().__init__(
             name=name,
@@ -310,6 +447,7 @@ class CountryManager(LocationManager):
             primaryKey="wikidataid",
             tableName="countries",
             config=config,
+            readOnly=readOnly,
             debug=debug,
         )
         self.wd = Wikidata()
@@ -341,7 +479,11 @@ class RegionManager(LocationManager):
     """
 
     def __init__(
-        self, name: str = "RegionManager", config: StorageConfig = None, debug=False
+        self,
+        name: str = "RegionManager",
+        config: StorageConfig = None,
+        readOnly: bool = False,
+        debug=False,
     ):
         super().__init__(
             name=name,
@@ -351,6 +493,7 @@ class RegionManager(LocationManager):
             primaryKey="regionId",
             tableName="regions",
             config=config,
+            readOnly=readOnly,
             debug=debug,
         )
         self.wd = Wikidata()
@@ -367,7 +510,11 @@ class CityManager(LocationManager):
     """
 
     def __init__(
-        self, name: str = "CityManager", config: StorageConfig = None, debug=False
+        self,
+        name: str = "CityManager",
+        config: StorageConfig = None,
+        readOnly: bool = False,
+        debug=False,
     ):
         super().__init__(
             name=name,
@@ -377,6 +524,7 @@ class CityManager(LocationManager):
             primaryKey=None,
             tableName="cities",
             config=config,
+            readOnly=readOnly,
             debug=debug,
         )
         self.wd = Wikidata()
@@ -673,6 +821,26 @@ class City(Location):
         city.region.country = city.country
         return city
 
+    def toRecord(self) -> dict:
+        """
+        get me as a JSON compatible record with the names and ISO codes of my region and country
+
+        Returns:
+            dict: the name, wikidataid, coordinates and population of the city, its region and country
+        """
+        record = {
+            "name": getattr(self, "name", None),
+            "wikidataid": getattr(self, "wikidataid", None),
+            "lat": getattr(self, "lat", None),
+            "lon": getattr(self, "lon", None),
+            "pop": getattr(self, "pop", None),
+            "region": getattr(self.region, "name", None),
+            "regionIso": getattr(self.region, "iso", None),
+            "country": getattr(self.country, "name", None),
+            "countryIso": getattr(self.country, "iso", None),
+        }
+        return record
+
     def setValue(self, name, record):
         """
         set a field value with the given name  to
@@ -855,6 +1023,7 @@ class LocationContext(object):
         regionManager: RegionManager,
         cityManager: CityManager,
         config: StorageConfig,
+        readOnly: bool = False,
     ):
         """
         construct me
@@ -863,11 +1032,21 @@ class LocationContext(object):
             countryManager(CountryManager): the country manager to be used
             regionManager(RegionManager): the region manager to be used
             cityManager(CityManager): the city manager to be used
+            config(StorageConfig): the storage configuration to be used
+            readOnly(bool): if True open the database read-only
         """
         self.countryManager = countryManager
         self.regionManager = regionManager
         self.cityManager = cityManager
-        self.locator = Locator(storageConfig=config)
+        self.locator = Locator(storageConfig=config, readOnly=readOnly)
+
+    def close(self):
+        """
+        close the database connections of my managers and my Locator
+        """
+        for manager in self.countryManager, self.regionManager, self.cityManager:
+            manager.close()
+        self.locator.close()
 
     def interlinkLocations(self, warnOnDuplicates: bool = True, profile=True):
         """
@@ -915,13 +1094,19 @@ class LocationContext(object):
         self.interlinkLocations(warnOnDuplicates=warnOnDuplicates)
 
     @classmethod
-    def fromCache(cls, config: StorageConfig = None, forceUpdate: bool = False):
+    def fromCache(
+        cls,
+        config: StorageConfig = None,
+        forceUpdate: bool = False,
+        readOnly: bool = False,
+    ):
         """
         Inits a LocationContext form Cache if existent otherwise init cache
 
         Args:
             config(StorageConfig): configuration of the cache if None the default config is used
             forceUpdate(bool): If True an existent cache will be over written
+            readOnly(bool): If True open the database read-only e.g. for serving many worker processes
         """
         if config is None:
             config = cls.getDefaultConfig()
@@ -931,11 +1116,11 @@ class LocationContext(object):
                 targetDirectory=config.getCachePath(),
                 force=forceUpdate,
             )
-        cityManager = CityManager("cities", config=config)
-        regionManager = RegionManager("regions", config=config)
-        countryManager = CountryManager("countries", config=config)
+        cityManager = CityManager("cities", config=config, readOnly=readOnly)
+        regionManager = RegionManager("regions", config=config, readOnly=readOnly)
+        countryManager = CountryManager("countries", config=config, readOnly=readOnly)
         locationContext = LocationContext(
-            countryManager, regionManager, cityManager, config
+            countryManager, regionManager, cityManager, config, readOnly=readOnly
         )
         return locationContext
 
@@ -1042,12 +1227,18 @@ class Locator(object):
 
     # singleton instance
     locator = None
+    instanceLock = threading.Lock()
 
     def __init__(
         self,
         db_file=None,
         correctMisspelling=False,
         storageConfig: StorageConfig = None,
+        useLabelIndex: bool = False,
+        cacheSize: int = 0,
+        readOnly: bool = False,
+        threadSafe: bool = False,
+        inMemory: bool = False,
         debug=False,
     ):
         """
@@ -1057,10 +1248,27 @@ class Locator(object):
             db_file(str): the path to the database file
             correctMispelling(bool): if True correct typical misspellings
             storageConfig(StorageConfig): the storage Configuration to use
+            useLabelIndex(bool): if True lookup cities, regions and countries by name from a memory resident LabelIndex
+            cacheSize(int): the maximum number of lookup results to keep in a least recently used cache - 0 for no caching
+            readOnly(bool): if True open the database read-only and memory mapped see LocationManager.getReadOnlySQLDB - it needs to be populated already
+            threadSafe(bool): if True use a separate database connection for each thread
+            inMemory(bool): if True copy the database into memory and serve all queries from there see loadMemoryDB
             debug(bool): if True show debug information
         """
         self.debug = debug
+        self.readOnly = readOnly
+        self.threadSafe = threadSafe
+        self.inMemory = inMemory
+        self.memoryConnection = None
+        self.threadLocal = threading.local()
+        self.indexLock = threading.RLock()
+        self.dbGeneration = 0
+        self.sharedDB = None
         self.correctMisspelling = correctMisspelling
+        self.useLabelIndex = useLabelIndex
+        self.labelIndex = None
+        self.countryIndex = None
+        self.lookupCache = LRUCache(cacheSize) if cacheSize > 0 else None
         if storageConfig is None:
             storageConfig = LocationContext.getDefaultConfig()
         self.storageConfig = storageConfig
@@ -1074,24 +1282,58 @@ class Locator(object):
         self.getAliases()
         self.dbVersion = "2021-08-18 16:15:00"
 
+    def __getstate__(self):
+        """
+        get the state for pickling e.g. to send a Locator to a worker process
+        the database connection, indexes and cached lookups are not pickled
+        """
+        state = self.__dict__.copy()
+        state["sharedDB"] = None
+        state["memoryConnection"] = None
+        state["threadLocal"] = None
+        state["indexLock"] = None
+        state["labelIndex"] = None
+        state["countryIndex"] = None
+        if self.lookupCache is not None:
+            state["lookupCache"] = LRUCache(self.lookupCache.maxsize)
+        return state
+
+    def __setstate__(self, state):
+        """
+        restore the pickled state and reconnect to the database
+        """
+        self.__dict__.update(state)
+        self.threadLocal = threading.local()
+        self.indexLock = threading.RLock()
+        self.loadDB()
+
     @staticmethod
     def resetInstance():
         Locator.locator = None
 
     @staticmethod
-    def getInstance(correctMisspelling=False, debug=False):
+    def getInstance(correctMisspelling=False, threadSafe=False, debug=False):
         """
         get the singleton instance of the Locator. If parameters are changed on further calls
         the initial parameters will still be in effect since the original instance will be returned!
 
+        the singleton is created only once even if multiple threads ask for it concurrently.
+        It is always thread safe since any thread may use it e.g. via a PlaceContext
+        no matter which caller created it
+
         Args:
             correctMispelling(bool): if True correct typical misspellings
+            threadSafe(bool): ignored - the singleton always uses a separate database connection for each thread
             debug(bool): if True show debug information
         """
         if Locator.locator is None:
-            Locator.locator = Locator(
-                correctMisspelling=correctMisspelling, debug=debug
-            )
+            with Locator.instanceLock:
+                if Locator.locator is None:
+                    Locator.locator = Locator(
+                        correctMisspelling=correctMisspelling,
+                        threadSafe=True,
+                        debug=debug,
+                    )
         return Locator.locator
 
     def normalizePlaces(self, places: list):
@@ -1112,13 +1354,14 @@ class Locator(object):
             nplaces.append(place)
         return nplaces
 
-    def locateCity(self, places: list):
+    def locateCity(self, places: list, correctMisspelling: bool = None):
         """
         locate a city, region country combination based on the given wordtoken information
 
         Args:
             places(list): a list of places derived by splitting a locality e.g.  "San Francisco, CA"
             leads to "San Francisco", "CA"
+            correctMisspelling(bool): if True correct typical misspellings - default: my correctMisspelling setting
 
         Returns:
             City: a city with country and region details
@@ -1131,7 +1374,7 @@ class Locator(object):
         # loop over all word elements
         places = self.normalizePlaces(places)
         for place in places:
-            foundCountry = self.getCountry(place)
+            foundCountry = self.getCountry(place, correctMisspelling)
             if foundCountry is not None:
                 country = foundCountry
             foundCities = self.cities_for_name(place)
@@ -1141,6 +1384,143 @@ class Locator(object):
         foundCity = self.disambiguate(country, regions, cities)
         return foundCity
 
+    def locateCityBatch(
+        self, locations: list, correctMisspelling: bool = None
+    ) -> list:
+        """
+        locate the cities for a list of location strings
+
+        all distinct tokens of all locations are resolved with a few set based
+        queries instead of the per token lookups of locateCity - each location
+        is then disambiguated exactly as locateCity would do it
+
+        Args:
+            locations(list): a list of location strings e.g. "San Francisco, CA" - a location
+            might also be given as an already split list of places
+            correctMisspelling(bool): if True correct typical misspellings - default: my correctMisspelling setting
+
+        Returns:
+            list: the found City (or None) for each location in the order given - City,
+            Region and Country objects are shared between locations with the same tokens
+        """
+        self.populate_db()
+        placesList = []
+        for location in locations:
+            if location is None:
+                places = []
+            elif isinstance(location, str):
+                places = re.split(r",", location)
+            else:
+                places = location
+            placesList.append(self.normalizePlaces(places))
+        names = list(dict.fromkeys(place for places in placesList for place in places))
+        countriesByName = self.countries_for_names(names, correctMisspelling)
+        citiesByName = self.cities_for_names(names)
+        regionsByName = self.regions_for_names(names)
+        foundCities = []
+        for places in placesList:
+            country = None
+            cities = []
+            regions = []
+            for place in places:
+                foundCountry = countriesByName.get(place)
+                if foundCountry is not None:
+                    country = foundCountry
+                cities.extend(citiesByName.get(place, []))
+                regions.extend(regionsByName.get(place, []))
+            foundCity = self.disambiguate(country, regions, cities)
+            foundCities.append(foundCity)
+        return foundCities
+
+    def queryChunks(
+        self, query: str, values: list, placeholder: str = "?", chunkSize: int = 500
+    ):
+        """
+        run the given query with a parameter list for the given values in chunks
+        to stay within the limits of the SQLite number of parameters
+
+        Args:
+            query(str): the query with a {params} placeholder for the parameter list
+            values(list): the values to use as parameters
+            placeholder(str): the placeholder to use for each value e.g. ? for IN lists or (?) for VALUES lists
+            chunkSize(int): the maximum number of parameters per query
+
+        Returns:
+            list: the list of records of all chunks
+        """
+        records = []
+        for i in range(0, len(values), chunkSize):
+            chunk = values[i : i + chunkSize]
+            params = ",".join([placeholder] * len(chunk))
+            records.extend(self.sqlDB.query(query.format(params=params), tuple(chunk)))
+        return records
+
+    def countries_for_names(
+        self, names: list, correctMisspelling: bool = None
+    ) -> dict:
+        """
+        get the countries for the given names with the semantics of getCountry
+
+        Args:
+            names(list): the names (or ISO codes) of the countries to lookup
+            correctMisspelling(bool): if True correct typical misspellings - default: my correctMisspelling setting
+
+        Returns:
+            dict: a map of name to Country for all names that identify exactly one country
+        """
+        countriesByName = {}
+        for name in names:
+            country = self.lookupCountry(name, correctMisspelling)
+            if country is not None:
+                countriesByName[name] = country
+        return countriesByName
+
+    def cities_for_names(self, cityNames: list) -> dict:
+        """
+        find the cities for the given cityNames with a set based query
+
+        Args:
+            cityNames(list): the potential names of cities
+
+        Returns:
+            dict: a map of cityName to the list of cities sorted by population (highest first)
+        """
+        citiesByName = {}
+        query = self.getCityLookupQuery("name IN ({params})")
+        cityLookupRecords = self.queryChunks(query, list(cityNames))
+        cityLookupRecords.sort(
+            key=lambda cityRecord: float(cityRecord.get("pop"))
+            if cityRecord.get("pop") is not None
+            else 0.0,
+            reverse=True,
+        )
+        for cityLookupRecord in cityLookupRecords:
+            city = City.fromCityLookup(cityLookupRecord)
+            citiesByName.setdefault(cityLookupRecord["name"], []).append(city)
+        return citiesByName
+
+    def regions_for_names(self, regionNames: list) -> dict:
+        """
+        get the regions for the given region names (which might be ISO codes)
+
+        Args:
+            regionNames(list): the region names
+
+        Returns:
+            dict: a map of region name to the list of matching regions
+        """
+        regionsByName = {}
+        isoNames = [name for name in regionNames if self.isISO(name)]
+        names = [name for name in regionNames if not self.isISO(name)]
+        for columnName, values in [("iso", isoNames), ("name", names)]:
+            if values:
+                query = f"SELECT * from regions WHERE {columnName} IN ({{params}})"
+                for regionRecord in self.queryChunks(query, values):
+                    region = Region.fromRecord(regionRecord)
+                    key = regionRecord[columnName]
+                    regionsByName.setdefault(key, []).append(region)
+        return regionsByName
+
     def dedupCities(self, cities: list) -> list:
         """
         remove duplicate cities by wikidataid
@@ -1253,10 +1633,15 @@ class Locator(object):
         Returns:
             a list of city records
         """
-        cities = []
-        cityRecords = self.places_by_name(cityName, "name")
-        for cityRecord in cityRecords:
-            cities.append(City.fromCityLookup(cityRecord))
+
+        def lookup():
+            cities = []
+            cityRecords = self.places_by_name(cityName, "name")
+            for cityRecord in cityRecords:
+                cities.append(City.fromCityLookup(cityRecord))
+            return cities
+
+        cities = list(self.cachedLookup(("cities_for_name", cityName), lookup))
         return cities
 
     def regions_for_name(self, region_name):
@@ -1269,16 +1654,25 @@ class Locator(object):
         Returns:
             list: the list of cities for this region
         """
-        regions = []
-        if self.isISO(region_name):
-            columnName = "iso"
-        else:
-            columnName = "name"
-        query = f"SELECT * from regions WHERE {columnName} = (?)"
-        params = (region_name,)
-        regionRecords = self.sqlDB.query(query, params)
-        for regionRecord in regionRecords:
-            regions.append(Region.fromRecord(regionRecord))
+
+        def lookup():
+            regions = []
+            if self.isISO(region_name):
+                columnName = "iso"
+            else:
+                columnName = "name"
+            labelIndex = self.getLabelIndex()
+            if labelIndex is not None:
+                regionRecords = labelIndex.regions_for_name(region_name, columnName)
+            else:
+                query = f"SELECT * from regions WHERE {columnName} = (?)"
+                params = (region_name,)
+                regionRecords = self.sqlDB.query(query, params)
+            for regionRecord in regionRecords:
+                regions.append(Region.fromRecord(regionRecord))
+            return regions
+
+        regions = list(self.cachedLookup(("regions_for_name", region_name), lookup))
         return regions
 
     def correct_country_misspelling(self, name):
@@ -1288,41 +1682,60 @@ class Locator(object):
             name(string): the name of the country potentially misspelled
         Return:
             string: correct name of unchanged
+
+        see MisspellingDictionary for adding user supplied misspellings
         """
-        cur_dir = os.path.dirname(os.path.realpath(__file__))
-        with open(cur_dir + "/data/ISO3166ErrorDictionary.csv") as info:
-            reader = csv.reader(info)
-            for row in reader:
-                if name == remove_non_ascii(row[0]):
-                    return row[2]
-        return name
+        return MisspellingDictionary.getInstance().correct(name)
 
-    def is_a_country(self, name):
+    def is_a_country(self, name, correctMisspelling: bool = None):
         """
         check if the given string name is a country
 
         Args:
             name(string): the string to check
+            correctMisspelling(bool): if True correct typical misspellings - default: my correctMisspelling setting
         Returns:
             True: if pycountry thinks the string is a country
         """
-        country = self.getCountry(name)
+        country = self.getCountry(name, correctMisspelling)
         result = country is not None
         return result
 
-    def getCountry(self, name):
+    def getCountry(self, name, correctMisspelling: bool = None):
         """
         get the country for the given name
         Args:
             name(string): the name of the country to lookup
+            correctMisspelling(bool): if True correct typical misspellings - default: my correctMisspelling setting
+        Returns:
+            country: the country if one was found or None if not
+        """
+        if correctMisspelling is None:
+            correctMisspelling = self.correctMisspelling
+        key = ("getCountry", name, correctMisspelling)
+        country = self.cachedLookup(
+            key, lambda: self.lookupCountry(name, correctMisspelling)
+        )
+        return country
+
+    def lookupCountry(self, name, correctMisspelling: bool = None):
+        """
+        lookup the country for the given name without caching
+
+        Args:
+            name(string): the name of the country to lookup
+            correctMisspelling(bool): if True correct typical misspellings - default: my correctMisspelling setting
         Returns:
             country: the country if one was found or None if not
         """
-        if self.isISO(name):
+        if correctMisspelling is None:
+            correctMisspelling = self.correctMisspelling
+        isIso = self.isISO(name)
+        if isIso:
             query = "SELECT * FROM countries WHERE iso = (?)" ""
             params = (name,)
         else:
-            if self.correctMisspelling:
+            if correctMisspelling:
                 name = self.correct_country_misspelling(name)
             query = """SELECT * FROM countries
 WHERE name LIKE (?)
@@ -1332,8 +1745,10 @@ OR wikidataid in (SELECT wikidataid FROM country_labels WHERE label LIKE (?))"""
                 name,
             )
         country = None
-        self.populate_db()
-        countryRecords = self.sqlDB.query(query, params)
+        countryRecords = self.getCountryIndex().countries_for_name(name, isIso)
+        if countryRecords is None:
+            self.populate_db()
+            countryRecords = self.sqlDB.query(query, params)
         if len(countryRecords) == 1:
             country = Country.fromRecord(countryRecords[0])
             pass
@@ -1349,6 +1764,94 @@ OR wikidataid in (SELECT wikidataid FROM country_labels WHERE label LIKE (?))"""
         view = self.view
         return view
 
+    def getPopColumn(self) -> str:
+        """
+        get the population column to sort the lookups of my view by
+
+        Returns:
+            str: popNum if the CityLookup view is materialized otherwise pop
+        """
+        if self.popColumn is None:
+            self.popColumn = "popNum" if self.hasMaterializedCityLookup() else "pop"
+        return self.popColumn
+
+    def getCityLookupQuery(self, condition: str) -> str:
+        """
+        get the query for the records of my view with the given condition sorted by
+        population (highest first)
+
+        for the materialized CityLookup view the city_lookup table is queried directly
+        so that the sort uses its popNum indexes while only the columns of the view
+        are selected
+
+        Args:
+            condition(str): the SQL condition e.g. name = (?)
+
+        Returns:
+            str: the query
+        """
+        view = self.getView()
+        if view == "CityLookup" and self.getPopColumn() == "popNum":
+            if self.cityLookupColumns is None:
+                columnRecords = self.sqlDB.query(f"PRAGMA table_info('{view}')")
+                self.cityLookupColumns = ",".join(
+                    f'"{record["name"]}"' for record in columnRecords
+                )
+            columns = self.cityLookupColumns
+            query = f"SELECT {columns} FROM city_lookup WHERE {condition} ORDER BY popNum DESC"
+        else:
+            query = f"SELECT * FROM {view} WHERE {condition} ORDER BY pop DESC"
+        return query
+
+    def getCountryIndex(self):
+        """
+        get the memory resident index of the countries by iso code and
+        case folded name and label - loading it on first use
+
+        Returns:
+            CountryIndex: the country index
+        """
+        labelIndex = self.getLabelIndex()
+        if labelIndex is not None:
+            return labelIndex.countryIndex
+        countryIndex = self.countryIndex
+        if countryIndex is None:
+            with self.indexLock:
+                countryIndex = self.countryIndex
+                if countryIndex is None:
+                    self.populate_db()
+                    countryIndex = CountryIndex(self.sqlDB).load()
+                    self.countryIndex = countryIndex
+        return countryIndex
+
+    def invalidateLookups(self):
+        """
+        invalidate the indexes and cached lookup results e.g. after the database changed
+        """
+        self.labelIndex = None
+        self.countryIndex = None
+        self.cache_clear()
+
+    def getLabelIndex(self):
+        """
+        get the memory resident label index - loading it on first use
+
+        Returns:
+            LabelIndex: the label index or None if no label index is to be used
+        """
+        labelIndex = self.labelIndex
+        if self.useLabelIndex and labelIndex is None:
+            with self.indexLock:
+                labelIndex = self.labelIndex
+                if labelIndex is None:
+                    if not self.db_has_data():
+                        self.populate_db()
+                    labelIndex = LabelIndex(
+                        self.sqlDB, view=self.getView(), profile=self.debug
+                    ).load()
+                    self.labelIndex = labelIndex
+        return labelIndex
+
     def places_by_name(self, placeName, columnName):
         """
         get places by name and column
@@ -1356,10 +1859,26 @@ OR wikidataid in (SELECT wikidataid FROM country_labels WHERE label LIKE (?))"""
             placeName(string): the name of the place
             columnName(string): the column to look at
         """
+        key = ("places_by_name", placeName, columnName)
+        cityLookupRecords = list(
+            self.cachedLookup(key, lambda: self.lookupPlaces(placeName, columnName))
+        )
+        return cityLookupRecords
+
+    def lookupPlaces(self, placeName, columnName):
+        """
+        lookup places by name and column without caching
+
+        Args:
+            placeName(string): the name of the place
+            columnName(string): the column to look at
+        """
+        labelIndex = self.getLabelIndex()
+        if labelIndex is not None and labelIndex.hasColumn(columnName):
+            return labelIndex.places_by_name(placeName, columnName)
         if not self.db_has_data():
             self.populate_db()
-        view = self.getView()
-        query = f"SELECT * FROM {view} WHERE {columnName} = (?) ORDER BY pop DESC"
+        query = self.getCityLookupQuery(f"{columnName} = (?)")
         params = (placeName,)
         cityLookupRecords = self.sqlDB.query(query, params)
         cityLookupRecords.sort(
@@ -1370,6 +1889,40 @@ OR wikidataid in (SELECT wikidataid FROM country_labels WHERE label LIKE (?))"""
         )
         return cityLookupRecords
 
+    def cachedLookup(self, key, lookup):
+        """
+        get the result of the given lookup from my lookup cache if caching is active
+
+        Args:
+            key(tuple): the key of the lookup
+            lookup(Callable): the function to call on a cache miss
+
+        Returns:
+            the (cached) result of the lookup
+        """
+        if self.lookupCache is None:
+            return lookup()
+        return self.lookupCache.lookup(key, lookup)
+
+    def cache_clear(self):
+        """
+        clear my lookup cache
+        """
+        if self.lookupCache is not None:
+            self.lookupCache.cache_clear()
+
+    def cache_info(self):
+        """
+        get the statistics of my lookup cache
+
+        Returns:
+            CacheInfo: hits, misses, evictions, maxsize and currsize or None if caching is not active
+        """
+        cacheInfo = None
+        if self.lookupCache is not None:
+            cacheInfo = self.lookupCache.cache_info()
+        return cacheInfo
+
     def recreateDatabase(self):
         """
         recreate my lookup database
@@ -1382,15 +1935,27 @@ OR wikidataid in (SELECT wikidataid FROM country_labels WHERE label LIKE (?))"""
         populate the cities SQL database which caches the information from the GeoLite2-City-Locations.csv file
 
         Args:
-            force(bool): if True force a recreation of the database
+            force(bool): if True force a recreation of the database - in memory mode the
+            database file is recreated and loaded into memory again
         """
         hasData = self.db_has_data()
         if force:
-            self.populate_Countries(self.sqlDB)
-            self.populate_Regions(self.sqlDB)
-            self.populate_Cities(self.sqlDB)
-            self.createViews(self.sqlDB)
-            self.populate_Version(self.sqlDB)
+            self.invalidateDBCheck()
+            if self.inMemory:
+                sqlDB = SQLDB(self.db_file, errorDebug=True)
+            else:
+                sqlDB = self.sqlDB
+            self.populate_Countries(sqlDB)
+            self.populate_Regions(sqlDB)
+            self.populate_Cities(sqlDB)
+            self.createViews(sqlDB)
+            self.materializeCityLookup(sqlDB)
+            self.populate_Version(sqlDB)
+            if self.inMemory:
+                sqlDB.close()
+                self.loadDB()
+            self.invalidateDBCheck()
+            self.invalidateLookups()
 
         elif not hasData:
             self.downloadDB()
@@ -1410,6 +1975,11 @@ OR wikidataid in (SELECT wikidataid FROM country_labels WHERE label LIKE (?))"""
                 targetDirectory=self.storageConfig.getCachePath(),
                 force=forceUpdate,
             )
+            if not self.readOnly:
+                fileDB = SQLDB(self.db_file, errorDebug=True)
+                if not self.hasMaterializedCityLookup(fileDB):
+                    self.materializeCityLookup(fileDB)
+                fileDB.close()
             self.loadDB()
 
     def populate_Version(self, sqlDB):
@@ -1559,6 +2129,77 @@ JOIN countries c on cl.wikidataid=c.wikidataid
         for viewDDL in viewDDLs:
             sqlDB.execute(viewDDL)
 
+    def hasMaterializedCityLookup(self, sqlDB=None) -> bool:
+        """
+        check whether the CityLookup view is materialized
+
+        Args:
+            sqlDB(SQLDB): the SQL database to check - if None use my database
+
+        Returns:
+            bool: True if the city_lookup table has the popNum column and the CityLookup view does not show it
+        """
+        if sqlDB is None:
+            sqlDB = self.sqlDB
+        tableColumns = sqlDB.query("PRAGMA table_info('city_lookup')")
+        viewColumns = sqlDB.query("PRAGMA table_info('CityLookup')")
+        materialized = any(
+            column["name"] == "popNum" for column in tableColumns
+        ) and not any(column["name"] == "popNum" for column in viewColumns)
+        return materialized
+
+    def materializeCityLookup(self, sqlDB=None):
+        """
+        materialize the CityLookup view as the denormalized table city_lookup
+        with indexes on label, name and (label,countryId) so that lookups do not need
+        to join the four underlying tables. The pop column keeps the type of the cities
+        table - the additional numeric popNum column is only used for sorting via the indexes.
+        The CityLookup view is redefined as a view on the city_lookup table without
+        the popNum column so that the records have the same columns as before
+
+        Args:
+            sqlDB(SQLDB): target SQL database - if None use my database
+        """
+        if sqlDB is None:
+            sqlDB = self.sqlDB
+        cityColumns = [
+            column["name"] for column in sqlDB.query("PRAGMA table_info('cities')")
+        ]
+        selectColumns = ",".join(f'ci."{column}"' for column in cityColumns)
+        lookupColumns = ["label"] + cityColumns
+        lookupColumns += ["regionName", "regionIso", "regionPop", "regionLat", "regionLon"]
+        lookupColumns += ["countryName", "countryIso", "CountryLat", "CountryLon"]
+        viewColumns = ",".join(f'"{column}"' for column in lookupColumns)
+        materializeDDLs = [
+            "DROP VIEW IF EXISTS CityLookup",
+            "DROP TABLE IF EXISTS city_lookup",
+            f"""
+CREATE TABLE city_lookup AS
+SELECT
+   cl.label,
+   {selectColumns},
+   CAST(ci.pop AS REAL) AS popNum,
+   r.name as regionName ,r.iso as regionIso ,r.pop as regionPop,r.lat as regionLat, r.lon as regionLon,
+   c.name as countryName,c.iso as countryIso,c.lat as CountryLat, c.lon as CountryLon
+FROM
+city_labels cl
+JOIN cities ci on ci.wikidataid=cl.wikidataid
+JOIN regions r on ci.regionId=r.wikidataid
+JOIN countries c on ci.countryId=c.wikidataid
+""",
+            "CREATE INDEX cityLookupByLabel ON city_lookup (label, popNum DESC)",
+            "CREATE INDEX cityLookupByName ON city_lookup (name, popNum DESC)",
+            "CREATE INDEX cityLookupByLabelCountry ON city_lookup (label, countryId)",
+            f"CREATE VIEW CityLookup AS SELECT {viewColumns} FROM city_lookup",
+        ]
+        profiler = Profiler("materializing CityLookup", profile=self.debug)
+        for materializeDDL in materializeDDLs:
+            sqlDB.execute(materializeDDL)
+        sqlDB.c.commit()
+        self.popColumn = None
+        self.cityLookupColumns = None
+        profiler.time()
+
     def db_recordCount(self, tableList, tableName):
         """
         count the number of records for the given tableName
@@ -1582,32 +2223,175 @@ JOIN countries c on cl.wikidataid=c.wikidataid
             count = countResult[0]["count"]
         return count
 
+    def db_fileSignature(self):
+        """
+        get the signature of my database file to detect changes of the file
+
+        Returns:
+            tuple: the modification time, inode and size of the file or None if there is no such file
+        """
+        return LocationManager.fileSignature(self.db_file)
+
     def db_has_data(self):
         """
         check whether the database has data / is populated
 
+        the check is only done once per connection - it is repeated if the database
+        file has been modified or replaced in the meantime or populate_db has been called.
+        The result is available as the dbValidated attribute and the version found
+        as the dbFoundVersion attribute
+
         Returns:
             boolean: True if the cities table exists and has more than one record
         """
+        signature = self.db_fileSignature()
+        if self.dbValidated is not None and signature == self.dbValidatedSignature:
+            return self.dbValidated
+        if self.dbValidatedSignature is not None:
+            # the database file has been changed e.g. by another process
+            if (
+                signature is None
+                or signature[1] != self.dbValidatedSignature[1]
+                or self.readOnly
+                or self.inMemory
+            ):
+                # the file has been replaced or the read-only connection or in-memory copy is stale - reconnect
+                self.loadDB()
+            else:
+                self.invalidateLookups()
         tableList = self.sqlDB.getTableList()
         hasCities = self.db_recordCount(tableList, "cities") > 200000
         hasCountries = self.db_recordCount(tableList, "countries") > 200
         hasRegions = self.db_recordCount(tableList, "regions") > 3000
         hasVersion = self.db_recordCount(tableList, "Version") == 1
         versionOk = False
+        self.dbFoundVersion = None
         if hasVersion:
             query = "SELECT version from Version"
             dbVersionList = self.sqlDB.query(query)
-            versionOk = dbVersionList[0]["version"] == self.dbVersion
+            self.dbFoundVersion = dbVersionList[0]["version"]
+            versionOk = self.dbFoundVersion == self.dbVersion
         # hasWikidataCities=self.db_recordCount(tableList,'City_wikidata')>100000
         ok = hasVersion and versionOk and hasCities and hasRegions and hasCountries
+        self.dbValidated = ok
+        self.dbValidatedSignature = signature
         return ok
 
+    def invalidateDBCheck(self):
+        """
+        make sure the next db_has_data call checks the database again
+        """
+        self.dbValidated = None
+        self.dbValidatedSignature = None
+        self.dbFoundVersion = None
+        self.popColumn = None
+        self.cityLookupColumns = None
+
+    def connectDB(self) -> SQLDB:
+        """
+        open a connection to my database
+
+        Returns:
+            SQLDB: the database
+        """
+        if self.inMemory:
+            if self.threadSafe:
+                connection = sqlite3.connect(
+                    self.memoryUri, uri=True, detect_types=sqlite3.PARSE_DECLTYPES
+                )
+            else:
+                connection = self.memoryConnection
+            sqlDB = SQLDB(self.db_file, connection=connection, errorDebug=True)
+        elif self.readOnly:
+            sqlDB = LocationManager.getReadOnlySQLDB(self.db_file, errorDebug=True)
+        else:
+            sqlDB = SQLDB(self.db_file, errorDebug=True)
+        return sqlDB
+
+    def loadMemoryDB(self):
+        """
+        copy my database file into an in-memory database with the SQLite backup API
+
+        the in-memory database uses a shared cache so that the connections of all
+        threads in thread safe mode see the same copy. Changes are not written back
+        to the database file. The load time and size are available as the
+        memoryLoadTime and memorySize attributes and shown in debug mode.
+        """
+        profiler = Profiler(f"loading {self.db_file} into memory", profile=self.debug)
+        self.memoryUri = (
+            f"file:geograpy3_{id(self)}_{self.dbGeneration}?mode=memory&cache=shared"
+        )
+        memoryConnection = sqlite3.connect(
+            self.memoryUri,
+            uri=True,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False,
+        )
+        if os.path.isfile(self.db_file):
+            dbPath = urllib.request.pathname2url(os.path.abspath(self.db_file))
+            fileConnection = sqlite3.connect(f"file:{dbPath}?mode=ro", uri=True)
+            fileConnection.backup(memoryConnection)
+            fileConnection.close()
+        pageCount = memoryConnection.execute("PRAGMA page_count").fetchone()[0]
+        pageSize = memoryConnection.execute("PRAGMA page_size").fetchone()[0]
+        if self.memoryConnection is not None:
+            self.memoryConnection.close()
+        # the in-memory database lives as long as this connection is open
+        self.memoryConnection = memoryConnection
+        self.memorySize = pageCount * pageSize
+        self.memoryLoadTime = profiler.time(
+            f" ({self.memorySize / 1024 / 1024:.1f} MB)"
+        )
+
+    @property
+    def sqlDB(self) -> SQLDB:
+        """
+        get the database - in thread safe mode each thread gets its own connection
+        which is opened on first use
+
+        Returns:
+            SQLDB: the database
+        """
+        if not self.threadSafe:
+            return self.sharedDB
+        threadLocal = self.threadLocal
+        if getattr(threadLocal, "dbGeneration", None) != self.dbGeneration:
+            threadLocal.sqlDB = self.connectDB()
+            threadLocal.dbGeneration = self.dbGeneration
+        return threadLocal.sqlDB
+
     def loadDB(self):
         """
         loads the database from cache and sets it as sqlDB property
+
+        in thread safe mode the connections of all threads are reopened on their next use
+        """
+        self.dbGeneration += 1
+        if self.inMemory:
+            self.loadMemoryDB()
+        if self.threadSafe:
+            self.sharedDB = None
+        else:
+            self.sharedDB = self.connectDB()
+        self.invalidateDBCheck()
+        self.invalidateLookups()
+
+    def close(self):
+        """
+        close my database connection - in thread safe mode the one of the current thread
+        the connections of other threads are closed when their threads end
         """
-        self.sqlDB = SQLDB(self.db_file, errorDebug=True)
+        if self.sharedDB is not None:
+            self.sharedDB.close()
+            self.sharedDB = None
+        threadLocal = self.threadLocal
+        if getattr(threadLocal, "sqlDB", None) is not None:
+            threadLocal.sqlDB.close()
+            threadLocal.sqlDB = None
+            threadLocal.dbGeneration = None
+        if self.memoryConnection is not None:
+            self.memoryConnection.close()
+            self.memoryConnection = None
 
 
 class LocatorCmd:
@@ -1671,6 +2455,91 @@ class LocatorCmd:
             dest="location",
             help="locate the given location string (e.g. 'Paris, Texas')",
         )
+        parser.add_argument(
+            "-e",
+            "--engine",
+            dest="engine",
+            choices=["nltk", "gazetteer"],
+            default="nltk",
+            help="the engine to extract places with: NLTK named entities or known place names of the gazetteer",
+        )
+        parser.add_argument(
+            "--entityCache",
+            dest="entityCache",
+            help="the SQLite file to cache the entities found in the texts in e.g. ~/.geograpy3/entities.db",
+        )
+        parser.add_argument(
+            "-i",
+            "--input",
+            dest="input",
+            help="extract places from each document of the given file (- for stdin) - plain text, JSON objects or CSV rows with a text or url field - and write one JSON record per document",
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            dest="output",
+            help="the file to write the JSON records of the --input documents or the --bench report to (default: stdout)",
+        )
+        parser.add_argument(
+            "-f",
+            "--format",
+            dest="format",
+            choices=["auto", "jsonl", "csv", "lines"],
+            default="auto",
+            help="the format of the --input file - auto uses csv for .csv files otherwise each line is a plain text or a JSON object if it starts with { - jsonl expects a JSON object on each line",
+        )
+        parser.add_argument(
+            "--column",
+            dest="column",
+            help="the CSV column or JSON field of the --input documents to use (default: text or url - location with --locate)",
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            dest="jobs",
+            type=int,
+            default=1,
+            help="the number of worker processes for the --input documents or the --serve requests (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--locate",
+            dest="locate",
+            action="store_true",
+            help="locate the city of each --input document as a location string e.g. 'Paris, Texas' instead of extracting places",
+        )
+        parser.add_argument(
+            "--serve",
+            dest="serve",
+            action="store_true",
+            help="serve /locate, /locations and /place-context requests as HTTP/JSON - SIGHUP reloads gracefully",
+        )
+        parser.add_argument(
+            "--host",
+            dest="host",
+            default="127.0.0.1",
+            help="the host address to --serve on (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--port",
+            dest="port",
+            type=int,
+            default=8080,
+            help="the port to --serve on - 0 for a free port (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--bench",
+            dest="bench",
+            nargs="*",
+            metavar="BENCHMARK",
+            help="run the given or all offline benchmarks and write the throughput and latencies as JSON to --output or stdout",
+        )
+        parser.add_argument(
+            "--rounds",
+            dest="rounds",
+            type=int,
+            default=3,
+            help="the number of rounds of each --bench workload (default: %(default)s)",
+        )
         parser.add_argument("-V", "--version", action="version", version=version_msg)
         return parser
 
@@ -1707,12 +2576,31 @@ class LocatorCmd:
                 correctMisspelling=self.args.correctMisspelling, debug=self.args.debug
             )
             loc.recreateDatabase()
+        elif self.args.bench is not None:
+            self.runBenchmarks()
+        elif self.args.serve:
+            from geograpy.server import GeograpyServer
+
+            server = GeograpyServer(
+                host=self.args.host,
+                port=self.args.port,
+                workers=self.args.jobs,
+                engine=self.args.engine,
+                cacheFile=self.args.entityCache,
+                correctMisspelling=self.args.correctMisspelling,
+                debug=self.args.debug,
+            )
+            server.serve()
+        elif self.args.input:
+            self.processInput()
         elif self.args.url or self.args.text:
             import geograpy
             places = geograpy.get_geoPlace_context(
                 url=self.args.url,
                 text=self.args.text,
-                debug=self.args.debug
+                debug=self.args.debug,
+                engine=self.args.engine,
+                cache=self.getEntityCache(),
             )
             print(f"Countries: {places.countries}")
             print(f"Regions: {places.regions}")
@@ -1730,7 +2618,268 @@ class LocatorCmd:
             else:
                 print(f"Could not locate: {self.args.location}")
         else:
-            print("Please specify -u/--url, -t/--text, -l/--location, or -db to recreate database")
+            print("Please specify -u/--url, -t/--text, -i/--input, -l/--location, --serve, --bench or -db to recreate database")
+
+    def getEntityCache(self):
+        """
+        get the entity cache for the --entityCache argument
+
+        Returns:
+            EntityCache: the cache or None if no cache file has been specified
+        """
+        cache = None
+        if self.args.entityCache:
+            from geograpy.entitycache import EntityCache
+
+            cache = EntityCache(self.args.entityCache, debug=self.args.debug)
+        return cache
+
+    def runBenchmarks(self):
+        """
+        run the --bench benchmarks and write the JSON report
+        """
+        from geograpy.benchmark import BenchmarkSuite
+
+        suite = BenchmarkSuite(rounds=self.args.rounds, debug=self.args.debug)
+        report = suite.run(self.args.bench)
+        text = json.dumps(report, indent=2)
+        if self.args.output and self.args.output != "-":
+            with open(self.args.output, "w", encoding="utf-8") as outputFile:
+                print(text, file=outputFile)
+        else:
+            print(text)
+
+    def getInputFormat(self) -> str:
+        """
+        get the format of the input file
+
+        Returns:
+            str: the --format argument - auto is resolved by the file extension
+        """
+        inputFormat = self.args.format
+        if inputFormat == "auto":
+            extension = os.path.splitext(self.args.input)[1].lower()
+            # the lines of .jsonl files may be plain texts as well
+            inputFormat = {".csv": "csv"}.get(extension, "auto")
+        return inputFormat
+
+    def readDocuments(
+        self,
+        inputFile,
+        ids: dict,
+        fields: list = None,
+        inputFormat: str = "auto",
+        errors: dict = None,
+    ):
+        """
+        read the documents from the given input file - empty lines are skipped
+
+        Args:
+            inputFile(TextIO): the file with one document per line or CSV row
+            ids(dict): the id field of the JSON objects or CSV rows by document index
+            fields(list): the fields to get the document from - the first non empty one is used - default: text and url
+            inputFormat(str): csv, jsonl, lines for plain texts or auto for plain texts and JSON objects starting with {
+            errors(dict): the error messages of the lines that could not be read by document index
+
+        Returns:
+            Generator: the text, url or location of each document
+        """
+        if fields is None:
+            fields = ["text", "url"]
+        if inputFormat == "csv":
+            reader = csv.DictReader(inputFile)
+            columns = reader.fieldnames or []
+            if columns and not any(field in columns for field in fields):
+                if len(columns) != 1:
+                    raise Exception(
+                        f"none of the columns {fields} is in {columns} - use --column"
+                    )
+                fields = columns
+            rows = reader
+        else:
+            rows = LocatorCmd.readLines(inputFile, inputFormat, errors)
+        for index, row in enumerate(rows):
+            document = row
+            if isinstance(row, dict):
+                document = ""
+                for field in fields:
+                    if row.get(field):
+                        document = str(row[field])
+                        break
+                if "id" in row:
+                    ids[index] = row["id"]
+            yield document
+
+    @staticmethod
+    def readLines(inputFile, inputFormat: str = "auto", errors: dict = None):
+        """
+        read the non empty lines of the given file
+
+        a line that is not valid JSON gives an empty document so that the stream goes on
+
+        Args:
+            inputFile(TextIO): the file to read
+            inputFormat(str): jsonl for JSON objects, lines for plain texts or auto for both
+            errors(dict): the error messages of the invalid JSON lines by line index
+
+        Returns:
+            Generator: the line or the JSON object of each line
+        """
+        index = 0
+        for line in inputFile:
+            line = line.strip()
+            if not line:
+                continue
+            if inputFormat == "jsonl" or (
+                inputFormat == "auto" and line.startswith("{")
+            ):
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as ex:
+                    if errors is not None:
+                        errors[index] = f"invalid JSON: {ex}"
+                    yield ""
+            else:
+                yield line
+            index += 1
+
+    def processInput(self):
+        """
+        write a JSON record for each document of the input - the place context of the
+        text or url or with --locate the city located for the location string
+
+        one Locator is used for the whole input or one per worker process with --jobs
+        """
+        ids = {}
+        errors = {}
+        if self.args.column:
+            fields = [self.args.column]
+        elif self.args.locate:
+            fields = ["location"]
+        else:
+            fields = None
+        if self.args.input == "-":
+            inputFile = sys.stdin
+        else:
+            inputFile = open(self.args.input, encoding="utf-8", newline="")
+        if self.args.output and self.args.output != "-":
+            outputFile = open(self.args.output, "w", encoding="utf-8")
+        else:
+            outputFile = sys.stdout
+        try:
+            documents = self.readDocuments(
+                inputFile,
+                ids,
+                fields=fields,
+                inputFormat=self.getInputFormat(),
+                errors=errors,
+            )
+            if self.args.locate:
+                records = self.locateRecords(documents)
+            else:
+                records = self.placeContextRecords(documents)
+            for record in records:
+                if record["index"] in errors:
+                    index = record["index"]
+                    record = {"index": index, "error": errors.pop(index)}
+                if record["index"] in ids:
+                    record["id"] = ids.pop(record["index"])
+                outputFile.write(json.dumps(record, ensure_ascii=False) + "\n")
+        finally:
+            if inputFile is not sys.stdin:
+                inputFile.close()
+            if outputFile is not sys.stdout:
+                outputFile.close()
+
+    def placeContextRecords(self, documents):
+        """
+        get the place context records for the given documents
+
+        Args:
+            documents(Iterable): the texts or urls
+
+        Returns:
+            Generator: the record of each document in the order of the documents
+        """
+        import functools
+
+        import geograpy
+        from geograpy.extraction import Extractor
+        from geograpy.labels import Labels
+        from geograpy.parallel import placeContextRecordsChunk, runChunks
+
+        if self.args.jobs > 1:
+            # load the engine before the workers are forked so that they inherit it
+            Extractor.getEngine(self.args.engine)
+            chunkFunc = functools.partial(
+                placeContextRecordsChunk,
+                labels=Labels.geo,
+                engine=self.args.engine,
+                cacheFile=self.args.entityCache,
+            )
+            results = runChunks(
+                chunkFunc,
+                documents,
+                workers=self.args.jobs,
+                chunksize=16,
+                correctMisspelling=self.args.correctMisspelling,
+            )
+            records = (record for _index, record in results)
+        else:
+            records = geograpy.stream_place_contexts(
+                documents,
+                labels=Labels.geo,
+                engine=self.args.engine,
+                cache=self.getEntityCache(),
+                debug=self.args.debug,
+            )
+        return records
+
+    def locateRecords(self, locations):
+        """
+        get the records of the cities located for the given location strings
+
+        Args:
+            locations(Iterable): the location strings e.g. "Paris, Texas"
+
+        Returns:
+            Generator: the record of each location with the location string and the
+            city see City.toRecord - the city is None if none was found
+        """
+        from geograpy.parallel import chunks, locateChunk, runChunks
+
+        locationsByIndex = {}
+
+        def remember(locations):
+            for index, location in enumerate(locations):
+                locationsByIndex[index] = location
+                yield location
+
+        if self.args.jobs > 1:
+            # runChunks reads the locations lazily so that only the locations
+            # of the chunks in flight are remembered
+            results = runChunks(
+                locateChunk,
+                remember(locations),
+                workers=self.args.jobs,
+                correctMisspelling=self.args.correctMisspelling,
+            )
+        else:
+            loc = Locator.getInstance(
+                correctMisspelling=self.args.correctMisspelling, debug=self.args.debug
+            )
+            results = (
+                result
+                for chunk in chunks(remember(locations), 100)
+                for result in locateChunk(chunk, loc)
+            )
+        for index, city in results:
+            record = {
+                "index": index,
+                "location": locationsByIndex.pop(index),
+                "city": city.toRecord() if city is not None else None,
+            }
+            yield record
 
     def cmd_main(self, argv: None) -> int:
         """
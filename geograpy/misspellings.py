@@ -0,0 +1,102 @@
+"""
+Created on 2026-10-17
+
+dictionary of typical country name misspellings
+"""
+import csv
+import os
+import threading
+
+from geograpy.utils import remove_non_ascii
+
+
+class MisspellingDictionary:
+    """
+    dictionary of typical misspellings of country names based on
+    data/ISO3166ErrorDictionary.csv
+
+    The dictionary is loaded once per process and shared by all
+    Locator and PlaceContext instances - see getInstance
+    """
+
+    instance = None
+    lock = threading.Lock()
+
+    def __init__(self):
+        """
+        constructor
+        """
+        self.corrections = {}
+        self.files = []
+
+    @classmethod
+    def getInstance(cls):
+        """
+        get the shared misspelling dictionary loading it on first use
+
+        Returns:
+            MisspellingDictionary: the shared instance
+        """
+        if cls.instance is None:
+            with cls.lock:
+                if cls.instance is None:
+                    cur_dir = os.path.dirname(os.path.realpath(__file__))
+                    misspellings = cls()
+                    misspellings.addFile(
+                        f"{cur_dir}/data/ISO3166ErrorDictionary.csv", override=False
+                    )
+                    cls.instance = misspellings
+        return cls.instance
+
+    @classmethod
+    def reset(cls):
+        """
+        drop the shared instance e.g. to get rid of user supplied extension files
+        """
+        with cls.lock:
+            cls.instance = None
+
+    def addFile(self, filePath: str, override: bool = True):
+        """
+        add the misspellings from the given CSV file which has the
+        misspelled name in the first and the correct name in the third column
+        as the bundled ISO3166ErrorDictionary.csv has
+
+        Args:
+            filePath(str): the path of the CSV file
+            override(bool): if True the entries of the file replace existing entries
+                otherwise the first entry for a misspelling wins
+        """
+        with open(filePath, encoding="utf-8") as info:
+            reader = csv.reader(info)
+            for row in reader:
+                self.add(row[0], row[2], override=override)
+        self.files.append(filePath)
+
+    def add(self, misspelled: str, correct: str, override: bool = True):
+        """
+        add the given misspelling
+
+        Args:
+            misspelled(str): the misspelled name - non ascii chars are removed
+            correct(str): the correct name
+            override(bool): if True replace an existing entry
+        """
+        key = remove_non_ascii(misspelled)
+        if override or key not in self.corrections:
+            self.corrections[key] = correct
+
+    def correct(self, name: str) -> str:
+        """
+        correct the given name if it is a known misspelling
+
+        Args:
+            name(str): the name of the country potentially misspelled
+
+        Returns:
+            str: the correct name or the unchanged name
+        """
+        return self.corrections.get(name, name)
+
+    def __len__(self):
+        return len(self.corrections)
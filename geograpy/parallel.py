@@ -0,0 +1,333 @@
+"""
+Created on 2026-10-17
+
+parallel geocoding with a pool of worker processes
+"""
+import os
+import queue
+from collections import deque
+from multiprocessing import Pool
+
+from geograpy.entitycache import EntityCache
+from geograpy.extraction import NLTKEngine
+from geograpy.labels import Labels
+from geograpy.locator import Locator
+
+# the Locator of the current worker process - see initWorker
+workerLocator = None
+# the entity caches of the current worker process by file - see placeContextRecordsChunk
+workerCaches = {}
+
+
+def initWorker(db_file: str, correctMisspelling: bool = False):
+    """
+    initialize a worker process by opening one read-only Locator for it
+
+    Args:
+        db_file(str): the path to the database file
+        correctMisspelling(bool): if True correct typical misspellings
+    """
+    global workerLocator
+    workerLocator = Locator(
+        db_file=db_file, correctMisspelling=correctMisspelling, readOnly=True
+    )
+
+
+def chunks(items, chunksize: int):
+    """
+    split the given items into chunks of indexed items
+
+    Args:
+        items(Iterable): the items to split
+        chunksize(int): the maximum number of items per chunk
+
+    Returns:
+        Generator: lists of (index, item) tuples
+    """
+    chunk = []
+    for index, item in enumerate(items):
+        chunk.append((index, item))
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def locateChunk(chunk: list, locator: Locator = None) -> list:
+    """
+    locate the cities for the given chunk in a worker process
+
+    Args:
+        chunk(list): a list of (index, location) tuples
+        locator(Locator): the Locator to use - if None the Locator of the worker process is used
+
+    Returns:
+        list: a list of (index, City) tuples
+    """
+    if locator is None:
+        locator = workerLocator
+    indices = [index for index, _location in chunk]
+    cities = locator.locateCityBatch([location for _index, location in chunk])
+    return list(zip(indices, cities))
+
+
+def placeContextChunk(chunk: list, labels=Labels.default) -> list:
+    """
+    get the place contexts for the given chunk of texts in a worker process
+
+    Args:
+        chunk(list): a list of (index, text) tuples
+        labels(list): the NLTK labels to extract places for
+
+    Returns:
+        list: a list of (index, PlaceContext) tuples
+    """
+    # imported here to avoid a circular import of the geograpy package
+    from geograpy import get_place_context
+
+    placeContexts = []
+    for index, text in chunk:
+        placeContext = get_place_context(
+            text=text, labels=labels, locator=workerLocator
+        )
+        placeContexts.append((index, placeContext))
+    return placeContexts
+
+
+def placeContextRecordsChunk(
+    chunk: list, labels=Labels.default, engine: str = None, cacheFile: str = None
+) -> list:
+    """
+    get the place context records for the given chunk of texts or urls in a worker process
+    see stream_place_contexts
+
+    Args:
+        chunk(list): a list of (index, text or url) tuples
+        labels(list): the NLTK labels to extract places for
+        engine(str): the extraction engine "nltk" or "gazetteer"
+        cacheFile(str): the path of the EntityCache to use - if None nothing is cached
+
+    Returns:
+        list: a list of (index, record) tuples
+    """
+    # imported here to avoid a circular import of the geograpy package
+    from geograpy import stream_place_contexts
+
+    cache = None
+    if cacheFile is not None:
+        cache = workerCaches.get(cacheFile)
+        if cache is None:
+            cache = workerCaches[cacheFile] = EntityCache(cacheFile)
+    indices = [index for index, _item in chunk]
+    records = stream_place_contexts(
+        [item for _index, item in chunk],
+        labels=labels,
+        batchSize=len(chunk),
+        locator=workerLocator,
+        engine=engine,
+        cache=cache,
+    )
+    results = []
+    for record in records:
+        record["index"] = indices[record["index"]]
+        results.append((record["index"], record))
+    return results
+
+
+def runChunks(
+    func,
+    items,
+    workers: int = None,
+    chunksize: int = 100,
+    ordered: bool = True,
+    correctMisspelling: bool = False,
+    maxPending: int = None,
+):
+    """
+    run the given chunk function on a pool of worker processes
+
+    the items are read lazily: at most maxPending chunks are submitted to the pool
+    and not yet yielded at any time so that the memory use does not grow with
+    the number of items. The next chunk is only read from the items when the
+    results of an earlier chunk have been yielded.
+
+    Args:
+        func(Callable): the function to apply to each chunk
+        items(Iterable): the items to process
+        workers(int): the number of worker processes - default: the number of CPUs
+        chunksize(int): the number of items to send to a worker at once
+        ordered(bool): if True yield the results in the order of the items otherwise chunk by chunk as they are available
+        correctMisspelling(bool): if True correct typical misspellings
+        maxPending(int): the maximum number of chunks in flight - default: twice the number of workers
+
+    Returns:
+        Generator: (index, result) tuples
+    """
+    if workers is None:
+        workers = os.cpu_count()
+    if maxPending is None:
+        maxPending = 2 * workers
+    # make sure the database is available before the workers open it read-only
+    # a Locator of its own keeps the settings of the shared Locator untouched
+    locator = Locator(correctMisspelling=correctMisspelling)
+    locator.populate_db()
+    with Pool(
+        processes=workers,
+        initializer=initWorker,
+        initargs=(locator.db_file, correctMisspelling),
+    ) as pool:
+        if ordered:
+            # the results of the oldest chunk are waited for first
+            pending = deque()
+            for chunk in chunks(items, chunksize):
+                pending.append(pool.apply_async(func, (chunk,)))
+                if len(pending) >= maxPending:
+                    yield from pending.popleft().get()
+            while pending:
+                yield from pending.popleft().get()
+        else:
+            # the workers put the results of each chunk or its exception into the queue
+            done = queue.Queue()
+            inFlight = 0
+            for chunk in chunks(items, chunksize):
+                pool.apply_async(
+                    func, (chunk,), callback=done.put, error_callback=done.put
+                )
+                inFlight += 1
+                if inFlight >= maxPending:
+                    yield from getChunkResults(done)
+                    inFlight -= 1
+            while inFlight > 0:
+                yield from getChunkResults(done)
+                inFlight -= 1
+
+
+def getChunkResults(done: queue.Queue) -> list:
+    """
+    wait for the results of the next chunk that is done - see runChunks
+
+    Args:
+        done(queue.Queue): the queue of the chunk results or exceptions
+
+    Returns:
+        list: the (index, result) tuples of the chunk
+    """
+    chunkResults = done.get()
+    if isinstance(chunkResults, BaseException):
+        raise chunkResults
+    return chunkResults
+
+
+def locate_many(
+    strings,
+    workers: int = None,
+    chunksize: int = 100,
+    correctMisspelling: bool = False,
+) -> list:
+    """
+    locate the cities for the given location strings using a pool of worker processes
+
+    Args:
+        strings(Iterable): the location strings e.g. "Paris, Texas"
+        workers(int): the number of worker processes - default: the number of CPUs
+        chunksize(int): the number of location strings to send to a worker at once
+        correctMisspelling(bool): if True correct typical misspellings
+
+    Returns:
+        list: the City (or None) for each string in the order of the strings
+    """
+    results = runChunks(
+        locateChunk,
+        strings,
+        workers=workers,
+        chunksize=chunksize,
+        correctMisspelling=correctMisspelling,
+    )
+    cities = [city for _index, city in results]
+    return cities
+
+
+def locate_many_unordered(
+    strings,
+    workers: int = None,
+    chunksize: int = 100,
+    correctMisspelling: bool = False,
+):
+    """
+    locate the cities for the given location strings using a pool of worker processes
+    and stream the results as they are available
+
+    Args:
+        strings(Iterable): the location strings e.g. "Paris, Texas"
+        workers(int): the number of worker processes - default: the number of CPUs
+        chunksize(int): the number of location strings to send to a worker at once
+        correctMisspelling(bool): if True correct typical misspellings
+
+    Returns:
+        Generator: (index, City) tuples with the index of the string
+    """
+    return runChunks(
+        locateChunk,
+        strings,
+        workers=workers,
+        chunksize=chunksize,
+        ordered=False,
+        correctMisspelling=correctMisspelling,
+    )
+
+
+def place_contexts_many(
+    texts,
+    workers: int = None,
+    chunksize: int = 10,
+) -> list:
+    """
+    get the place contexts for the given texts using a pool of worker processes
+
+    Args:
+        texts(Iterable): the texts to analyze
+        workers(int): the number of worker processes - default: the number of CPUs
+        chunksize(int): the number of texts to send to a worker at once
+
+    Returns:
+        list: the PlaceContext for each text in the order of the texts
+    """
+    # load the tagger and chunker before the workers are forked so that they inherit them
+    NLTKEngine.getInstance()
+    results = runChunks(
+        placeContextChunk,
+        texts,
+        workers=workers,
+        chunksize=chunksize,
+    )
+    placeContexts = [placeContext for _index, placeContext in results]
+    return placeContexts
+
+
+def place_contexts_many_unordered(
+    texts,
+    workers: int = None,
+    chunksize: int = 10,
+):
+    """
+    get the place contexts for the given texts using a pool of worker processes
+    and stream the results as they are available
+
+    Args:
+        texts(Iterable): the texts to analyze
+        workers(int): the number of worker processes - default: the number of CPUs
+        chunksize(int): the number of texts to send to a worker at once
+
+    Returns:
+        Generator: (index, PlaceContext) tuples with the index of the text
+    """
+    # load the tagger and chunker before the workers are forked so that they inherit them
+    NLTKEngine.getInstance()
+    return runChunks(
+        placeContextChunk,
+        texts,
+        workers=workers,
+        chunksize=chunksize,
+        ordered=False,
+    )
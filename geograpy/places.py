@@ -1,8 +1,10 @@
+import threading
 from collections import Counter
 
+from geograpy.labelindex import CountryRegions
 from geograpy.locator import City, Locator, Region
 
-from .utils import fuzzy_match, remove_non_ascii
+from .utils import FuzzyNameIndex, LRUCache, remove_non_ascii
 
 """
 Takes a list of place names and works place designation (country, region, etc) 
@@ -10,13 +12,32 @@ and relationships between places (city is inside region is inside country, etc)
 """
 
 
-class PlaceContext(Locator):
+class PlaceContext(object):
     """
     Adds context information to a place name
+
+    the lookups are delegated to a Locator which is shared by all PlaceContext
+    instances unless one is given so that creating a PlaceContext does not
+    open the database again. A PlaceContext is therefore no Locator instance
+    any more - the Locator functions are still available and the lookups that
+    depend on the misspelling correction use the setting of the PlaceContext
     """
 
+    # regions of the countries by database file
+    countryRegions = {}
+    # wikidataids of the countries by database file, country name and misspelling correction
+    # - bounded since any name of a long stream of documents may end up here
+    countryIdsByName = LRUCache(4096)
+    # fuzzy region name indexes by database file, country name and misspelling correction
+    regionIndexes = LRUCache(512)
+    regionLock = threading.Lock()
+
     def __init__(
-        self, place_names: list, setAll: bool = True, correctMisspelling: bool = False
+        self,
+        place_names: list,
+        setAll: bool = True,
+        correctMisspelling: bool = False,
+        locator: Locator = None,
     ):
         """
         Constructor
@@ -26,15 +47,123 @@ class PlaceContext(Locator):
                 list: The place names to check
             setAll:
                 boolean: True if all context information should immediately be set
-            db_file:
-                    string: Path to the database file to be used - if None the default "locs.db" will be used
+            correctMisspelling:
+                boolean: True if typical misspellings of country names should be corrected
+            locator:
+                Locator: the Locator to use for the lookups - if None the shared Locator.getInstance() is used
         """
-        super().__init__()
+        if locator is None:
+            locator = Locator.getInstance(threadSafe=True)
+        self.locator = locator
         self.correctMisspelling = correctMisspelling
         self.places = self.normalizePlaces(place_names)
         if setAll:
             self.setAll()
 
+    def __getattr__(self, name):
+        """
+        delegate the Locator functions and attributes e.g. sqlDB and db_file to my Locator
+        """
+        # avoid a recursion while unpickling when the locator is not set yet
+        if name == "locator":
+            raise AttributeError(name)
+        return getattr(self.locator, name)
+
+    def __getstate__(self):
+        """
+        get the state for pickling e.g. to send a PlaceContext from a worker process
+        the Locator is not pickled
+        """
+        state = self.__dict__.copy()
+        del state["locator"]
+        return state
+
+    def __setstate__(self, state):
+        """
+        restore the pickled state using the shared Locator
+        """
+        self.__dict__.update(state)
+        self.locator = Locator.getInstance(threadSafe=True)
+
+    def getCountry(self, name):
+        """
+        get the country for the given name with my misspelling correction setting
+
+        Args:
+            name(string): the name of the country to lookup
+        Returns:
+            country: the country if one was found or None if not
+        """
+        return self.locator.getCountry(name, correctMisspelling=self.correctMisspelling)
+
+    def is_a_country(self, name):
+        """
+        check with my misspelling correction setting if the given string name is a country
+
+        Args:
+            name(string): the string to check
+        Returns:
+            True: if the string is the name of a country
+        """
+        return self.locator.is_a_country(
+            name, correctMisspelling=self.correctMisspelling
+        )
+
+    def locateCity(self, places: list):
+        """
+        locate a city with my misspelling correction setting see Locator.locateCity
+
+        Args:
+            places(list): a list of places derived by splitting a locality
+
+        Returns:
+            City: a city with country and region details
+        """
+        return self.locator.locateCity(
+            places, correctMisspelling=self.correctMisspelling
+        )
+
+    def locateCityBatch(self, locations: list) -> list:
+        """
+        locate the cities with my misspelling correction setting see Locator.locateCityBatch
+
+        Args:
+            locations(list): a list of location strings e.g. "San Francisco, CA"
+
+        Returns:
+            list: the found City (or None) for each location in the order given
+        """
+        return self.locator.locateCityBatch(
+            locations, correctMisspelling=self.correctMisspelling
+        )
+
+    def countries_for_names(self, names: list) -> dict:
+        """
+        get the countries for the given names with my misspelling correction setting
+
+        Args:
+            names(list): the names (or ISO codes) of the countries to lookup
+
+        Returns:
+            dict: a map of name to Country for all names that identify exactly one country
+        """
+        return self.locator.countries_for_names(
+            names, correctMisspelling=self.correctMisspelling
+        )
+
+    def lookupCountry(self, name):
+        """
+        lookup the country for the given name with my misspelling correction setting without caching
+
+        Args:
+            name(string): the name of the country to lookup
+        Returns:
+            country: the country if one was found or None if not
+        """
+        return self.locator.lookupCountry(
+            name, correctMisspelling=self.correctMisspelling
+        )
+
     def __str__(self):
         """
         Return a string representation of me
@@ -47,6 +176,64 @@ class PlaceContext(Locator):
         )
         return text
 
+    def toRecord(self) -> dict:
+        """
+        get my context information as a JSON compatible record
+
+        Returns:
+            dict: the countries, regions, cities, other places and mention counts
+        """
+        record = {
+            "countries": self.countries,
+            "regions": self.regions,
+            "cities": self.cities,
+            "other": self.other,
+            "country_mentions": [list(mention) for mention in self.country_mentions],
+            "region_mentions": [list(mention) for mention in self.region_mentions],
+            "city_mentions": [list(mention) for mention in self.city_mentions],
+        }
+        return record
+
+    def getCountryRegions(self) -> CountryRegions:
+        """
+        get the regions of the countries of my database - they are loaded on first use
+        and shared by all PlaceContext instances until the database file changes
+
+        Returns:
+            CountryRegions: the regions by country
+        """
+        signature = self.db_fileSignature()
+        countryRegions = PlaceContext.countryRegions.get(self.db_file)
+        if countryRegions is None or countryRegions.signature != signature:
+            with PlaceContext.regionLock:
+                countryRegions = PlaceContext.countryRegions.get(self.db_file)
+                if countryRegions is None or countryRegions.signature != signature:
+                    if countryRegions is not None:
+                        PlaceContext.clearRegionIndexes(self.db_file)
+                    countryRegions = CountryRegions(self.sqlDB, signature).load()
+                    PlaceContext.countryRegions[self.db_file] = countryRegions
+        return countryRegions
+
+    def getCountryIds(self, countryName: str) -> list:
+        """
+        get the wikidataids of the countries with the given name or label
+
+        Args:
+            countryName(str): the name of the country
+
+        Returns:
+            list: the list of wikidataids or None if the name is a LIKE pattern
+        """
+        key = (self.db_file, countryName, self.correctMisspelling)
+
+        def lookup():
+            name = countryName
+            if self.correctMisspelling:
+                name = self.correct_country_misspelling(name)
+            return self.getCountryIndex().wikidataids_for_name(name)
+
+        return PlaceContext.countryIdsByName.lookup(key, lookup)
+
     def getRegions(self, countryName: str) -> list:
         """
         get a list of regions for the given countryName
@@ -54,24 +241,27 @@ class PlaceContext(Locator):
         countryName(str): the countryName to check
         """
         regions = []
-        queryString = """SELECT r.*  FROM 
-COUNTRIES c 
-JOIN regions r ON r.countryId=c.wikidataid
-WHERE c.name=(?)"""
-        params = (countryName,)
-        regionRecords = self.sqlDB.query(queryString, params)
+        regionRecords = self.getCountryRegions().regions_for_country_name(countryName)
         for regionRecord in regionRecords:
             region = Region.fromRecord(regionRecord)
             regions.append(region)
         return regions
 
-    def get_region_names(self, countryName: str) -> list:
+    def get_region_names(self, countryName: str, folded: bool = False) -> list:
         """
         get region names for the given country
 
         Args:
             countryName(str): the name of the country
+            folded(bool): if True get the names with the non ascii chars removed
+
+        Returns:
+            list: the list of region names
         """
+        countryRegions = self.getCountryRegions()
+        countryIds = self.getCountryIds(countryName)
+        if countryIds is not None:
+            return countryRegions.region_names(countryIds, folded=folded)
         if self.correctMisspelling:
             countryName = self.correct_country_misspelling(countryName)
         regionOfCountryQuery = """SELECT name 
@@ -86,14 +276,49 @@ WHERE c.name=(?)"""
                 WHERE label LIKE (?)
             )
         )"""
-        regionRecords = self.sqlDB.query(
-            regionOfCountryQuery,
-            params=(
-                countryName,
-                countryName,
-            ),
+        params = (countryName, countryName)
+        regionRecords = self.sqlDB.query(regionOfCountryQuery, params=params)
+        regionNames = [r.get("name") for r in regionRecords]
+        if folded:
+            regionNames = [
+                remove_non_ascii(name) if name is not None else None
+                for name in regionNames
+            ]
+        return regionNames
+
+    def getRegionIndex(self, countryName: str) -> FuzzyNameIndex:
+        """
+        get the fuzzy index of the region names of the given country - it is built on first use
+        and shared by all PlaceContext instances
+
+        Args:
+            countryName(str): the name of the country
+
+        Returns:
+            FuzzyNameIndex: the index of the region names
+        """
+        # drops the indexes of a changed database file
+        self.getCountryRegions()
+        key = (self.db_file, countryName, self.correctMisspelling)
+        regionIndex = PlaceContext.regionIndexes.lookup(
+            key,
+            lambda: FuzzyNameIndex(self.get_region_names(countryName, folded=True)),
         )
-        return [r.get("name") for r in regionRecords]
+        return regionIndex
+
+    @classmethod
+    def clearRegionIndexes(cls, db_file: str = None):
+        """
+        clear the shared regions, country ids and region indexes e.g. after the database has been recreated
+
+        Args:
+            db_file(str): the database file to clear the entries for - if None all entries are cleared
+        """
+        for key in list(cls.countryRegions.keys()):
+            if db_file is None or key == db_file:
+                cls.countryRegions.pop(key, None)
+        for cache in [cls.countryIdsByName, cls.regionIndexes]:
+            cache.discard(lambda key: db_file is None or key[0] == db_file)
 
     def setAll(self):
         """
@@ -124,42 +349,15 @@ WHERE c.name=(?)"""
         """
         regions = []
         self.country_regions = {}
-        region_names = {}
 
         if not self.countries:
             self.set_countries()
 
-        def region_match(place_name: str, region_name: str) -> bool:
-            """
-            Tests the similarity of the given strings after removing non ascii characters.
-            Args:
-                place_name(str): Place name
-                region_name(str): valid region name to test against
-
-            Returns:
-                True if the similarity of both values is greater equals 80%. Otherwise False
-            """
-            return fuzzy_match(
-                remove_non_ascii(place_name), remove_non_ascii(region_name)
-            )
-
-        def is_region(place_name: str, region_names: list):
-            """
-            Filters out the regions that are not similar to the given place_name
-            Args:
-                place_name(str): place name to check against the regions
-                region_names(list): List of valid region names
-
-            Returns:
-                List of regions that are similar to the given place_name
-            """
-            return any([region_match(place_name, rn) for rn in region_names])
-
         for country in self.countries:
-            region_names = self.get_region_names(country)
-            matched_regions = [
-                p for p in set(self.places) if is_region(p, region_names)
-            ]
+            # a place is a region if its similarity to one of the region names
+            # after removing non ascii characters is greater equals 80%
+            regionIndex = self.getRegionIndex(country)
+            matched_regions = [p for p in set(self.places) if regionIndex.matches(p)]
 
             regions += matched_regions
             self.country_regions[country] = list(set(matched_regions))
@@ -185,9 +383,12 @@ WHERE c.name=(?)"""
             self.populate_db()
         # ToDo: Duplicate with Locator.city_for_name e.g. extend method to support multiple names
         placesWithoutDuplicates = set(self.places)
-        params = ",".join("?" * len(placesWithoutDuplicates))
-        query = "SELECT * FROM CityLookup WHERE name IN (" + params + ")"
-        cityLookupRecords = self.sqlDB.query(query, list(placesWithoutDuplicates))
+        cityLookupRecords = []
+        # an empty IN () list is an SQL syntax error
+        if placesWithoutDuplicates:
+            params = ",".join("?" * len(placesWithoutDuplicates))
+            query = "SELECT * FROM CityLookup WHERE name IN (" + params + ")"
+            cityLookupRecords = self.sqlDB.query(query, list(placesWithoutDuplicates))
         cityLookupRecords.sort(
             key=lambda cityRecord: float(cityRecord.get("pop"))
             if cityRecord.get("pop") is not None
@@ -227,8 +428,7 @@ WHERE c.name=(?)"""
 
         def unused(place_name):
             places = [self.countries, self.cities, self.regions]
-            return all(
-                self.correct_country_misspelling(place_name) not in l for l in places
-            )
+            place_name = self.correct_country_misspelling(place_name)
+            return all(place_name not in l for l in places)
 
         self.other = [p for p in self.places if unused(p)]
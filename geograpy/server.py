@@ -0,0 +1,457 @@
+"""
+Created on 2026-10-17
+
+HTTP/JSON server for geocoding and place extraction with warmed up lookups
+"""
+import json
+import os
+import signal
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+import geograpy
+from geograpy.entitycache import EntityCache
+from geograpy.extraction import Extractor
+from geograpy.labels import Labels
+from geograpy.locator import LocationContext
+
+
+class GeograpyHTTPServer(ThreadingHTTPServer):
+    """
+    threading HTTP server that waits for the requests in progress when it is closed
+    """
+
+    daemon_threads = False
+    block_on_close = True
+
+
+class GeograpyRequestHandler(BaseHTTPRequestHandler):
+    """
+    handler for the JSON requests of a GeograpyServer
+
+    GET requests take the parameters from the query string, POST requests from
+    a JSON object or - as a batch - from a JSON array of objects or strings
+    """
+
+    protocol_version = "HTTP/1.1"
+    server_version = f"geograpy/{geograpy.__version__}"
+    # seconds to wait for a slow client or the next request of a keep-alive connection
+    timeout = 5
+    # the headers and the body are written separately - avoid the delayed ACK wait
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self.handle_json(url.path, dict(parse_qsl(url.query)))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as ex:
+            self.send_json(400, {"error": f"invalid JSON request: {ex}"})
+            return
+        self.handle_json(url.path, request)
+
+    def handle_json(self, path: str, request):
+        """
+        handle the given request with my GeograpyServer and send the result
+
+        Args:
+            path(str): the path of the endpoint
+            request(dict|list): the parameters or a list of parameters for a batch
+        """
+        geograpyServer = self.server.geograpyServer
+        try:
+            status, result = geograpyServer.handle(path, request)
+        except Exception as ex:
+            if geograpyServer.debug:
+                print(traceback.format_exc())
+            status, result = 500, {"error": str(ex)}
+        self.send_json(status, result)
+
+    def send_json(self, status: int, result):
+        """
+        send the given result as JSON
+
+        Args:
+            status(int): the HTTP status code
+            result(dict|list): the result to send
+        """
+        content = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        if self.server.geograpyServer.debug:
+            super().log_message(format, *args)
+
+
+class GeograpyServer:
+    """
+    long running HTTP/JSON server that keeps the Locator, LocationContext, misspellings
+    and the extraction engine in memory so that a request only pays for its lookups
+
+    endpoints:
+        /health: the status, process id and reload generation
+        /locate?location=Paris, Texas: the city see City.toRecord or null
+        /locations?name=Berlin: the cities, regions and countries see LocationContext.locateLocation
+        /place-context?text=...: the place context of a text or url see stream_place_contexts
+
+    A JSON array POSTed to an endpoint is handled as one batch and gets an array of results.
+
+    With more than one worker the listening socket is opened and the lookups are warmed up
+    before the workers are forked so that they share the loaded state. A SIGHUP reloads
+    gracefully: the state is warmed up again e.g. for a recreated database, new workers are
+    started and the old workers finish their requests in progress before they exit.
+    SIGTERM and SIGINT stop the server
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        workers: int = 1,
+        engine: str = "nltk",
+        cacheFile: str = None,
+        correctMisspelling: bool = False,
+        debug: bool = False,
+    ):
+        """
+        constructor
+
+        Args:
+            host(str): the host address to listen on
+            port(int): the port to listen on - 0 for a free port see self.port after open
+            workers(int): the number of worker processes - 1 to serve from this process
+            engine(str): the extraction engine "nltk" or "gazetteer" for /place-context
+            cacheFile(str): the path of the EntityCache for /place-context - if None nothing is cached
+            correctMisspelling(bool): if True correct typical misspellings
+            debug(bool): if True show debug information and log the requests
+        """
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.engine = engine
+        self.cacheFile = cacheFile
+        self.correctMisspelling = correctMisspelling
+        self.debug = debug
+        self.endpoints = {
+            "/health": (self.health, None),
+            "/locate": (self.locate, "location"),
+            "/locations": (self.locations, "name"),
+            "/place-context": (self.place_context, "text"),
+        }
+        self.httpd = None
+        self.locator = None
+        self.locationContext = None
+        self.cache = None
+        self.generation = 0
+        self.reloadRequested = False
+        self.stopRequested = False
+
+    def warmup(self):
+        """
+        load the Locator, LocationContext, misspellings and extraction engine of this process
+        """
+        locator = geograpy.warmup(
+            withNLTK=self.engine == "nltk",
+            correctMisspelling=self.correctMisspelling,
+            debug=self.debug,
+        )
+        self.locator = locator
+        Extractor.getEngine(self.engine)
+        oldLocationContext, oldCache = self.locationContext, self.cache
+        self.locationContext = LocationContext.fromCache(
+            self.locator.storageConfig, readOnly=True
+        )
+        if self.cacheFile is not None:
+            self.cache = EntityCache(self.cacheFile, debug=self.debug)
+        self.generation += 1
+        # the requests in progress look up with the connections of their threads
+        # and an EntityCache reopens its connection if it is used after closing.
+        # The reload of a SIGHUP runs on a thread of its own so the replaced
+        # connections are opened with check_same_thread=False
+        for old in oldLocationContext, oldCache:
+            if old is not None:
+                try:
+                    old.close()
+                except Exception as ex:
+                    # the new state is in use already - do not stop the reload
+                    print(f"could not close {type(old).__name__}: {ex}")
+
+    def open(self):
+        """
+        warm up and open the listening socket
+
+        Returns:
+            GeograpyServer: me
+        """
+        self.warmup()
+        self.httpd = GeograpyHTTPServer((self.host, self.port), GeograpyRequestHandler)
+        self.httpd.geograpyServer = self
+        self.port = self.httpd.server_address[1]
+        return self
+
+    def handle(self, path: str, request) -> tuple:
+        """
+        handle the given request
+
+        Args:
+            path(str): the path of the endpoint
+            request(dict|list): the parameters or a list of parameters for a batch
+
+        Returns:
+            tuple: the HTTP status code and the JSON compatible result
+        """
+        if path not in self.endpoints:
+            return 404, {"error": f"unknown endpoint {path}"}
+        func, field = self.endpoints[path]
+        isBatch = isinstance(request, list)
+        requests = request if isBatch else [request]
+        params = []
+        for item in requests:
+            if isinstance(item, dict):
+                params.append(item)
+            elif isinstance(item, str) and field is not None:
+                params.append({field: item})
+            else:
+                return 400, {"error": f"invalid request {item}"}
+        results = func(params)
+        return 200, results if isBatch else results[0]
+
+    def health(self, params: list) -> list:
+        """
+        get my status
+
+        Args:
+            params(list): the parameters of the requests
+
+        Returns:
+            list: the status of this process for each request
+        """
+        status = {
+            "status": "ok",
+            "version": geograpy.__version__,
+            "pid": os.getpid(),
+            "generation": self.generation,
+        }
+        return [status for _param in params]
+
+    def locate(self, params: list) -> list:
+        """
+        locate the cities for the location strings of the given requests in one batch
+
+        Args:
+            params(list): the parameters of the requests with a location string
+
+        Returns:
+            list: the record of the city found or None for each request
+        """
+        locations = [param.get("location") for param in params]
+        cities = self.locator.locateCityBatch(locations)
+        return [city.toRecord() if city is not None else None for city in cities]
+
+    def locations(self, params: list) -> list:
+        """
+        get the possible locations for the names of the given requests
+
+        Args:
+            params(list): the parameters of the requests with a name and optionally
+                verbose=true to also use combinations of the name parts
+
+        Returns:
+            list: the list of location records for each request
+        """
+        results = []
+        for param in params:
+            verbose = str(param.get("verbose", "")).lower() in ("1", "true")
+            locations = self.locationContext.locateLocation(
+                param.get("name"), verbose=verbose
+            )
+            results.append([self.toRecord(location) for location in locations or []])
+        return results
+
+    @staticmethod
+    def toRecord(location) -> dict:
+        """
+        get the given location as a JSON compatible record
+
+        Args:
+            location(Location): the city, region or country
+
+        Returns:
+            dict: the kind and the plain attributes of the location
+        """
+        record = {"locationKind": type(location).__name__}
+        for key, value in vars(location).items():
+            if not key.startswith("_") and (
+                value is None or isinstance(value, (str, int, float, bool))
+            ):
+                record[key] = value
+        return record
+
+    def place_context(self, params: list) -> list:
+        """
+        get the place contexts for the texts or urls of the given requests in one batch
+
+        Args:
+            params(list): the parameters of the requests with a text or url
+
+        Returns:
+            list: the place context record for each request see stream_place_contexts
+        """
+        items = [param.get("text") or param.get("url") or "" for param in params]
+        records = geograpy.stream_place_contexts(
+            items,
+            labels=Labels.geo,
+            batchSize=max(len(items), 1),
+            locator=self.locator,
+            engine=self.engine,
+            cache=self.cache,
+            debug=self.debug,
+        )
+        return list(records)
+
+    def serve(self):
+        """
+        serve the requests until the server is stopped
+        """
+        if self.httpd is None:
+            self.open()
+        url = f"http://{self.host}:{self.port}"
+        print(f"serving on {url} with {self.workers} worker process(es)", flush=True)
+        if self.workers > 1 and hasattr(os, "fork"):
+            self.serve_preforked()
+        else:
+            self.serve_threaded()
+
+    def serve_threaded(self):
+        """
+        serve the requests with a thread per connection in this process
+        """
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda _signum, _frame: self.shutdown())
+            if hasattr(signal, "SIGHUP"):
+                signal.signal(signal.SIGHUP, lambda _signum, _frame: self.reload())
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.httpd.server_close()
+
+    def reload(self):
+        """
+        warm up again in the background while the requests are served - may be called from any thread
+        """
+        threading.Thread(target=self.warmup).start()
+
+    def shutdown(self):
+        """
+        stop serving the requests of this process - may be called from any thread
+        """
+        threading.Thread(target=self.httpd.shutdown).start()
+
+    def onSignal(self, signum, _frame):
+        """
+        note a reload or stop request of a signal for the main loop
+        """
+        if signum == signal.SIGHUP:
+            self.reloadRequested = True
+        else:
+            self.stopRequested = True
+
+    def serve_preforked(self):
+        """
+        serve the requests with worker processes that share the listening socket
+        """
+        # a worker that lost the race for a connection goes back to waiting
+        # instead of blocking in accept so that it can be shut down any time
+        self.httpd.socket.setblocking(False)
+        for signum in signal.SIGHUP, signal.SIGTERM, signal.SIGINT:
+            signal.signal(signum, self.onSignal)
+        workerPids = set(self.startWorkers(self.workers))
+        try:
+            while not self.stopRequested:
+                if self.reloadRequested:
+                    self.reloadRequested = False
+                    self.warmup()
+                    oldPids = workerPids
+                    workerPids = set(self.startWorkers(self.workers))
+                    self.stopWorkers(oldPids)
+                    if self.debug:
+                        print(f"reloaded generation {self.generation}: {workerPids}")
+                # replace crashed workers
+                try:
+                    pid, _status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    pid = 0
+                if pid in workerPids:
+                    workerPids.remove(pid)
+                    workerPids.update(self.startWorkers(1))
+                time.sleep(0.1)
+        finally:
+            self.stopWorkers(workerPids)
+            self.httpd.server_close()
+
+    def startWorkers(self, count: int) -> list:
+        """
+        fork the given number of worker processes
+
+        Args:
+            count(int): the number of workers to start
+
+        Returns:
+            list: the process ids of the workers
+        """
+        pids = []
+        for _i in range(count):
+            pid = os.fork()
+            if pid == 0:
+                self.runWorker()
+            pids.append(pid)
+        return pids
+
+    def runWorker(self):
+        """
+        serve the requests in a forked worker process until SIGTERM - does not return
+        """
+        exitCode = 0
+        try:
+            signal.signal(signal.SIGHUP, signal.SIG_IGN)
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+            signal.signal(signal.SIGTERM, lambda _signum, _frame: self.shutdown())
+            # a SIGTERM right after the fork was noted by the handler of the main loop
+            if not self.stopRequested:
+                self.httpd.serve_forever()
+            # waits for the requests in progress
+            self.httpd.server_close()
+        except BaseException:
+            traceback.print_exc()
+            exitCode = 1
+        finally:
+            os._exit(exitCode)
+
+    def stopWorkers(self, pids):
+        """
+        stop the given worker processes and wait until they have finished their requests
+
+        Args:
+            pids(Iterable): the process ids of the workers
+        """
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
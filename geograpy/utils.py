@@ -1,10 +1,13 @@
 import gzip
 import os
 import shutil
+import threading
 import time
 import urllib.request
+from collections import OrderedDict, namedtuple
 
 import jellyfish
+import numpy as np
 
 
 class Download:
@@ -108,6 +111,109 @@ class Profiler:
         return elapsed
 
 
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """
+    size bounded least recently used cache with hit, miss and eviction statistics
+
+    the cache may be shared by multiple threads - values are computed outside of the lock
+    so that lookups of different threads do not block each other. A value whose
+    computation overlapped with cache_clear or discard is returned but not cached
+    since it might be computed from the data the entries were removed for
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        construct me with the given maximum number of entries
+
+        Args:
+            maxsize(int): the maximum number of entries to keep
+        """
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # incremented whenever entries are removed see cache_clear and discard
+        self.generation = 0
+
+    def lookup(self, key, compute):
+        """
+        get the value for the given key - computing and caching it if it is not available
+
+        Args:
+            key(object): the hashable key of the entry
+            compute(Callable): the function to compute the value on a cache miss
+
+        Returns:
+            the cached or computed value
+        """
+        with self.lock:
+            if key in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            self.misses += 1
+            generation = self.generation
+        value = compute()
+        with self.lock:
+            if generation != self.generation:
+                return value
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def discard(self, matches):
+        """
+        remove the entries whose key matches
+
+        Args:
+            matches(Callable): the function that checks whether a key is to be removed
+        """
+        with self.lock:
+            self.generation += 1
+            for key in [key for key in self.entries if matches(key)]:
+                del self.entries[key]
+
+    def cache_clear(self):
+        """
+        remove all entries and reset the statistics
+        """
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def cache_info(self) -> CacheInfo:
+        """
+        get the statistics of this cache
+
+        Returns:
+            CacheInfo: hits, misses, evictions, maxsize and currsize
+        """
+        with self.lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, self.maxsize, len(self.entries)
+            )
+
+    @property
+    def hitRate(self) -> float:
+        """
+        the ratio of hits to all lookups
+        """
+        lookups = self.hits + self.misses
+        hitRate = self.hits / lookups if lookups > 0 else 0.0
+        return hitRate
+
+
 def remove_non_ascii(s):
     """
     Remove non ascii chars from the given string
@@ -137,3 +243,252 @@ def fuzzy_match(s1, s2, max_dist=0.8):
         True if the match is greater equals max_dist. Otherwise false
     """
     return jellyfish.jaro_winkler_similarity(s1, s2) >= max_dist
+
+
+def encode_strings(strings: list) -> tuple:
+    """
+    encode the given strings as a zero padded matrix of unicode code points
+    for the batch similarity functions
+
+    Args:
+        strings(list): the strings to encode
+
+    Returns:
+        tuple: the code point matrix with one row per string and the array of string lengths
+    """
+    lengths = np.array([len(string) for string in strings], dtype=np.int64)
+    width = int(lengths.max()) if len(strings) > 0 else 0
+    codes = np.zeros((len(strings), max(width, 1)), dtype=np.uint32)
+    for row, string in enumerate(strings):
+        if string:
+            codes[row, : len(string)] = np.frombuffer(
+                string.encode("utf-32-le"), dtype=np.uint32
+            )
+    return codes, lengths
+
+
+def jaro_winkler_many(query: str, candidates) -> np.ndarray:
+    """
+    compute the jellyfish jaro_winkler_similarity of the given query to each of the candidates
+    with numpy operations over all candidates instead of one call per pair
+
+    strings are compared by unicode code points - jellyfish compares grapheme clusters
+    so the results only differ for strings with combining characters.
+    The jellyfish per pair call is implemented in Rust and is faster for a few candidates -
+    the batch version pays off for many candidates that are encoded once see encode_strings
+
+    Args:
+        query(str): the string to compare
+        candidates(list|tuple): the candidate strings or their encoding see encode_strings
+
+    Returns:
+        np.ndarray: the similarity for each candidate
+    """
+    if isinstance(candidates, tuple):
+        codes, lengths = candidates
+    else:
+        codes, lengths = encode_strings(candidates)
+    count = len(lengths)
+    queryLen = len(query)
+    similarities = np.zeros(count, dtype=float)
+    if queryLen == 0 or count == 0:
+        return similarities
+    queryCodes = np.frombuffer(query.encode("utf-32-le"), dtype=np.uint32)
+    width = codes.shape[1]
+    positions = np.arange(width)
+    rows = np.arange(count)
+    # the matching window depends on the longer string of each pair
+    searchRange = np.maximum(np.maximum(lengths, queryLen) // 2 - 1, 0)
+    # inWindow[i, n, j]: candidate n has the i-th query character at position j within the window
+    queryPositions = np.arange(queryLen)[:, None, None]
+    distance = np.abs(positions[None, None, :] - queryPositions)
+    inWindow = (
+        (codes[None, :, :] == queryCodes[:, None, None])
+        & (distance <= searchRange[None, :, None])
+        & (positions[None, None, :] < lengths[None, :, None])
+    )
+    available = np.ones((count, width), dtype=bool)
+    queryFlags = np.zeros((count, queryLen), dtype=bool)
+    for i in range(queryLen):
+        matching = inWindow[i] & available
+        first = matching.argmax(axis=1)
+        found = matching[rows, first]
+        available[rows[found], first[found]] = False
+        queryFlags[found, i] = True
+    candidateFlags = ~available & (positions < lengths[:, None])
+    common = queryFlags.sum(axis=1)
+    # compare the matched characters of both strings in order to count the transpositions
+    queryMatched = np.full((count, queryLen), -1, dtype=np.int64)
+    candidateMatched = np.full((count, queryLen), -2, dtype=np.int64)
+    flagRows, flagCols = np.nonzero(queryFlags)
+    ranks = np.cumsum(queryFlags, axis=1) - 1
+    queryMatched[flagRows, ranks[flagRows, flagCols]] = queryCodes[flagCols]
+    flagRows, flagCols = np.nonzero(candidateFlags)
+    ranks = np.cumsum(candidateFlags, axis=1) - 1
+    candidateMatched[flagRows, ranks[flagRows, flagCols]] = codes[flagRows, flagCols]
+    transpositions = (
+        (queryMatched != candidateMatched) & (np.arange(queryLen) < common[:, None])
+    ).sum(axis=1) // 2
+    hasCommon = common > 0
+    safeCommon = np.where(hasCommon, common, 1)
+    jaro = (
+        common / queryLen
+        + common / np.where(lengths > 0, lengths, 1)
+        + (common - transpositions) / safeCommon
+    ) / 3
+    jaro = np.where(hasCommon, jaro, 0.0)
+    # Winkler boost for a common prefix of up to 4 characters
+    prefixLen = min(4, queryLen, width)
+    prefixEqual = (codes[:, :prefixLen] == queryCodes[:prefixLen]) & (
+        np.arange(prefixLen) < lengths[:, None]
+    )
+    prefix = np.cumprod(prefixEqual, axis=1).sum(axis=1)
+    similarities = np.where(jaro > 0.7, jaro + prefix * 0.1 * (1.0 - jaro), jaro)
+    return similarities
+
+
+def fuzzy_match_many(query: str, candidates, max_dist: float = 0.8) -> np.ndarray:
+    """
+    fuzzy match the given query against each of the candidates see fuzzy_match
+
+    only the candidates that share enough characters with the query are scored
+    so matching a query against thousands of pre-encoded candidates is faster
+    than one fuzzy_match call per pair. For a handful of candidates
+    FuzzyNameIndex is the faster choice
+
+    Args:
+        query(str): the string to match
+        candidates(list|tuple): the candidate strings or their encoding see encode_strings
+        max_dist(float): the minimum similarity - default: 0.8
+
+    Returns:
+        np.ndarray: True for each candidate with a similarity greater equals max_dist
+    """
+    if not isinstance(candidates, tuple):
+        candidates = encode_strings(candidates)
+    codes, lengths = candidates
+    matches = np.zeros(len(lengths), dtype=bool)
+    queryLen = len(query)
+    if queryLen == 0:
+        return matches
+    # only the candidates whose character counts allow a similarity of max_dist
+    # are scored see FuzzyNameIndex.upperBounds - the zero padding never matches
+    # a query character other than NUL which only loosens the bound
+    queryCodes = np.frombuffer(query.encode("utf-32-le"), dtype=np.uint32)
+    common = np.zeros(len(lengths), dtype=np.int64)
+    for code, count in zip(*np.unique(queryCodes, return_counts=True)):
+        common += np.minimum((codes == code).sum(axis=1), count)
+    jaro = (common / queryLen + common / np.maximum(lengths, 1) + 1.0) / 3.0
+    jaro[common == 0] = 0.0
+    bounds = np.where(jaro > 0.7, jaro + 0.4 * (1.0 - jaro), jaro)
+    # allow for rounding differences of the bound
+    plausible = np.nonzero(bounds >= max_dist - 1e-9)[0]
+    if len(plausible) > 0:
+        width = max(int(lengths[plausible].max()), 1)
+        subset = (codes[plausible, :width], lengths[plausible])
+        matches[plausible] = jaro_winkler_many(query, subset) >= max_dist
+    return matches
+
+
+def fuzzy_match_matrix(queries: list, candidates, max_dist: float = 0.8) -> np.ndarray:
+    """
+    fuzzy match each of the given queries against each of the candidates see fuzzy_match
+
+    Args:
+        queries(list): the strings to match
+        candidates(list|tuple): the candidate strings or their encoding see encode_strings
+        max_dist(float): the minimum similarity - default: 0.8
+
+    Returns:
+        np.ndarray: a queries x candidates matrix with True for the matching pairs
+    """
+    if not isinstance(candidates, tuple):
+        candidates = encode_strings(candidates)
+    matrix = np.zeros((len(queries), len(candidates[1])), dtype=bool)
+    for row, query in enumerate(queries):
+        matrix[row] = fuzzy_match_many(query, candidates, max_dist)
+    return matrix
+
+
+class FuzzyNameIndex:
+    """
+    index of names for checking whether a name fuzzy matches any of them
+    with the same result as fuzzy_match(remove_non_ascii(name), remove_non_ascii(candidate))
+
+    the names are ASCII folded once when the index is built. A name is only scored
+    against the candidates whose character counts allow a Jaro-Winkler similarity
+    above the threshold: with c the number of characters both strings have in common
+    the Jaro similarity is at most (c/|a| + c/|b| + 1)/3 and the Winkler prefix boost
+    adds at most 0.4 of the remaining distance
+    """
+
+    def __init__(self, names: list, max_dist: float = 0.8):
+        """
+        constructor
+
+        Args:
+            names(list): the names to index
+            max_dist(float): the minimum similarity for a match see fuzzy_match
+        """
+        self.max_dist = max_dist
+        foldedNames = {remove_non_ascii(name) for name in names if name is not None}
+        self.names = set(foldedNames)
+        self.candidates = [name for name in foldedNames if name]
+        self.lengths = np.array([len(name) for name in self.candidates], dtype=float)
+        self.charCounts = np.zeros((len(self.candidates), 128), dtype=np.int16)
+        for row, name in enumerate(self.candidates):
+            self.charCounts[row] = FuzzyNameIndex.countChars(name)
+
+    @staticmethod
+    def countChars(name: str) -> np.ndarray:
+        """
+        count the characters of the given ASCII name
+
+        Args:
+            name(str): the name
+
+        Returns:
+            np.ndarray: the number of occurrences of each of the 128 ASCII characters
+        """
+        codes = np.frombuffer(name.encode("ascii"), dtype=np.uint8)
+        return np.bincount(codes, minlength=128).astype(np.int16)
+
+    def upperBounds(self, name: str) -> np.ndarray:
+        """
+        get the upper bounds of the Jaro-Winkler similarity of the given folded name
+        to each of my candidates
+
+        Args:
+            name(str): the ASCII folded name
+
+        Returns:
+            np.ndarray: the upper bound for each candidate
+        """
+        common = np.minimum(self.charCounts, FuzzyNameIndex.countChars(name)).sum(axis=1)
+        jaro = (common / len(name) + common / self.lengths + 1.0) / 3.0
+        jaro[common == 0] = 0.0
+        bounds = np.where(jaro > 0.7, jaro + 0.4 * (1.0 - jaro), jaro)
+        return bounds
+
+    def matches(self, name: str) -> bool:
+        """
+        check whether the given name fuzzy matches any of my names
+
+        Args:
+            name(str): the name to check
+
+        Returns:
+            bool: True if fuzzy_match is True for any of my names
+        """
+        name = remove_non_ascii(name)
+        if not name or not self.candidates:
+            return False
+        if name in self.names:
+            return True
+        bounds = self.upperBounds(name)
+        # allow for rounding differences of the bound
+        plausible = np.nonzero(bounds >= self.max_dist - 1e-9)[0]
+        for row in plausible[np.argsort(-bounds[plausible], kind="stable")]:
+            if fuzzy_match(name, self.candidates[row], self.max_dist):
+                return True
+        return False
@@ -0,0 +1,152 @@
+"""
+Created on 2026-10-17
+"""
+import asyncio
+import functools
+import http.server
+import tempfile
+import threading
+import unittest
+
+import geograpy
+from geograpy.asynclocator import AsyncLocator
+from tests.basetest import Geograpy3Test
+
+
+class TestAsyncLocator(Geograpy3Test):
+    """
+    test the asyncio front end
+    """
+
+    def setUp(self, debug=False):
+        Geograpy3Test.setUp(self, debug=debug)
+        self.locations = ["Vienna, Austria", "Paris, Texas", "Amsterdam, Netherlands"]
+
+    def testLocateCity(self):
+        """
+        test that the async city lookups give the same results as the sync ones
+        """
+
+        async def locateCities():
+            async with AsyncLocator(maxWorkers=4, maxConcurrency=2) as asyncLocator:
+                tasks = [
+                    asyncLocator.locate_city(location) for location in self.locations
+                ]
+                return await asyncio.gather(*tasks)
+
+        cities = asyncio.run(locateCities())
+        for location, city in zip(self.locations, cities):
+            self.assertEqual(str(geograpy.locateCity(location)), str(city))
+
+    def testLocateLocation(self):
+        """
+        test the async location lookup
+        """
+
+        async def locateLocation():
+            async with AsyncLocator() as asyncLocator:
+                return await asyncLocator.locate_location("Paris, Texas")
+
+        locations = asyncio.run(locateLocation())
+        self.assertTrue(len(locations) > 0)
+        self.assertEqual("Paris", locations[0].name)
+
+    def testCancellation(self):
+        """
+        test that cancelled calls do not block further calls
+        """
+
+        async def cancelAndLocate():
+            async with AsyncLocator(maxWorkers=1) as asyncLocator:
+                task = asyncio.create_task(asyncLocator.locate_city("Berlin"))
+                await asyncio.sleep(0)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                return await asyncLocator.locate_city("Berlin, Germany")
+
+        city = asyncio.run(cancelAndLocate())
+        self.assertEqual("DE", city.country.iso)
+
+    def testPlaceContext(self):
+        """
+        test the async place context for a text and an url served locally
+        """
+        text = """We travelled from Vienna to Berlin and then went on to Paris in France.
+It was a long journey through Germany and Austria with many stops along the way."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(f"{tmpdir}/article.html", "w") as htmlFile:
+                htmlFile.write(
+                    f"<html><head><title>Trip</title></head><body><article><p>{text}</p></article></body></html>"
+                )
+            handler = functools.partial(
+                http.server.SimpleHTTPRequestHandler, directory=tmpdir
+            )
+            server = http.server.ThreadingHTTPServer(("localhost", 0), handler)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                url = f"http://localhost:{server.server_address[1]}/article.html"
+
+                async def placeContexts():
+                    async with AsyncLocator() as asyncLocator:
+                        return await asyncio.gather(
+                            asyncLocator.place_context(text=text),
+                            asyncLocator.place_context(url=url),
+                        )
+
+                textContext, urlContext = asyncio.run(placeContexts())
+            finally:
+                server.shutdown()
+                server.server_close()
+        expected = geograpy.get_place_context(text=text)
+        for placeContext in textContext, urlContext:
+            self.assertEqual(expected.countries, placeContext.countries)
+            self.assertEqual(expected.cities, placeContext.cities)
+
+    def testFetchSession(self):
+        """
+        test that the urls are fetched with one http session that is closed on exit
+        """
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for i in range(3):
+                with open(f"{tmpdir}/article{i}.html", "w") as htmlFile:
+                    htmlFile.write(
+                        f"<html><body><article><p>Article {i} is about Vienna in Austria.</p></article></body></html>"
+                    )
+            handler = functools.partial(
+                http.server.SimpleHTTPRequestHandler, directory=tmpdir
+            )
+            server = http.server.ThreadingHTTPServer(("localhost", 0), handler)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                baseUrl = f"http://localhost:{server.server_address[1]}"
+
+                async def fetchTexts():
+                    async with AsyncLocator(maxConcurrency=1) as asyncLocator:
+                        texts = await asyncio.gather(
+                            *[
+                                asyncLocator.fetch_text(f"{baseUrl}/article{i}.html")
+                                for i in range(3)
+                            ]
+                        )
+                        session = asyncLocator.session
+                        self.assertIsNotNone(session)
+                        await asyncLocator.fetch_text(f"{baseUrl}/article0.html")
+                        self.assertIs(session, asyncLocator.session)
+                    self.assertIsNone(asyncLocator.session)
+                    self.assertTrue(session.closed)
+                    return texts
+
+                texts = asyncio.run(fetchTexts())
+            finally:
+                server.shutdown()
+                server.server_close()
+        for i, text in enumerate(texts):
+            self.assertTrue(f"Article {i}" in text, text)
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Created on 2026-10-17
+"""
+import json
+import tempfile
+import unittest
+
+from geograpy.benchmark import BenchmarkSuite
+from geograpy.locator import main
+from tests.basetest import Geograpy3Test
+
+
+class TestBenchmark(Geograpy3Test):
+    """
+    test the offline benchmark suite
+    """
+
+    def setUp(self, debug=False):
+        Geograpy3Test.setUp(self, debug=debug)
+
+    def testBenchmarkSuite(self):
+        """
+        test the report of the benchmarks that do not need NLTK
+        """
+        names = [
+            "locateCity",
+            "locateCityBatch",
+            "PlaceContext.setAll",
+            "Extractor.find_entities[gazetteer]",
+            "getNClosestLocations",
+            "lookups[read-write]",
+            "lookups[read-only]",
+            "fuzzy_match[per pair]",
+            "fuzzy_match_many[batched]",
+        ]
+        suite = BenchmarkSuite(rounds=2, debug=self.debug)
+        report = suite.run(names)
+        self.assertEqual(names, [record["name"] for record in report["benchmarks"]])
+        for record in report["benchmarks"]:
+            self.assertFalse("error" in record, record.get("error"))
+            self.assertTrue(record["operations"] >= 2 * 16)
+            self.assertTrue(record["throughput_ops"] > 0)
+            latencies = [record[key] for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")]
+            self.assertEqual(sorted(latencies), latencies)
+        # the workloads are fixed
+        self.assertEqual(suite.texts, BenchmarkSuite(rounds=1).texts)
+        with self.assertRaises(Exception):
+            suite.run(["unknown"])
+
+    def testBenchCommandLine(self):
+        """
+        test the JSON report of the command line
+        """
+        with tempfile.NamedTemporaryFile(suffix=".json") as reportFile:
+            argv = ["--bench", "locateLocation", "--rounds", "1", "-o", reportFile.name]
+            self.assertEqual(0, main(argv))
+            with open(reportFile.name, encoding="utf-8") as jsonFile:
+                report = json.load(jsonFile)
+        if self.debug:
+            print(json.dumps(report, indent=2))
+        self.assertEqual(1, report["rounds"])
+        self.assertEqual("locateLocation", report["benchmarks"][0]["name"])
+        self.assertTrue("p99_ms" in report["benchmarks"][0])
+
+    def testPercentile(self):
+        """
+        test the nearest rank percentiles
+        """
+        latencies = [float(i) for i in range(1, 101)]
+        self.assertEqual(50.0, BenchmarkSuite.percentile(latencies, 50))
+        self.assertEqual(99.0, BenchmarkSuite.percentile(latencies, 99))
+        self.assertEqual(1.0, BenchmarkSuite.percentile([1.0], 95))
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Created on 2026-10-17
+"""
+import tempfile
+import unittest
+
+import geograpy
+from geograpy.entitycache import CachingEngine, EntityCache
+from geograpy.extraction import Extractor
+from geograpy.labels import Labels
+from tests.basetest import Geograpy3Test
+
+
+class WordEngine:
+    """
+    engine that returns the capitalized words of a text and counts the texts analyzed
+    """
+
+    def __init__(self, signature: str = "words 1"):
+        self.signature = signature
+        self.analyzed = []
+        self.signatureCalls = 0
+
+    def getSignature(self) -> str:
+        self.signatureCalls += 1
+        return self.signature
+
+    def find_entities(self, text, labels, debug=False):
+        self.analyzed.append(text)
+        return [word for word in text.split() if word[0].isupper()]
+
+    def find_entities_many(self, texts, labels):
+        return [self.find_entities(text, labels) for text in texts]
+
+
+class TestEntityCache(Geograpy3Test):
+    """
+    test the persistent cache of the entities found in texts
+    """
+
+    def setUp(self, debug=False):
+        Geograpy3Test.setUp(self, debug=debug)
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.cacheFile = f"{self.tmpDir.name}/entities.db"
+
+    def tearDown(self):
+        self.tmpDir.cleanup()
+        Geograpy3Test.tearDown(self)
+
+    def testCachingEngine(self):
+        """
+        test that repeated texts are only analyzed once and the results are persistent
+        """
+        engine = WordEngine()
+        cache = EntityCache(self.cacheFile)
+        cachingEngine = CachingEngine(engine, cache)
+        texts = [
+            "Paris is the capital of France",
+            "Paris  is the capital\nof France",
+            "Berlin is the capital of Germany",
+            "Paris is the capital of France",
+        ]
+        entityLists = cachingEngine.find_entities_many(texts, Labels.geo)
+        self.assertEqual(["Paris", "France"], entityLists[0])
+        self.assertEqual(entityLists[0], entityLists[1])
+        self.assertEqual(2, len(engine.analyzed))
+        # other labels and engine versions get their own entries
+        cachingEngine.find_entities_many(texts[:1], Labels.default)
+        self.assertEqual(3, len(engine.analyzed))
+        cache.close()
+        reopened = CachingEngine(engine, EntityCache(self.cacheFile))
+        entities = reopened.find_entities(texts[2], Labels.geo)
+        self.assertEqual(["Berlin", "Germany"], entities)
+        self.assertEqual(3, len(engine.analyzed))
+        newVersion = CachingEngine(WordEngine("words 2"), reopened.cache)
+        newVersion.find_entities(texts[2], Labels.geo)
+        self.assertEqual(1, len(newVersion.engine.analyzed))
+        self.assertEqual(1, reopened.cache.hits)
+        self.assertEqual(1, reopened.cache.misses)
+
+    def testLRUEviction(self):
+        """
+        test that the least recently used entries are evicted
+        """
+        cache = EntityCache(self.cacheFile, maxEntries=3)
+        for i in range(3):
+            cache.put(f"key{i}", [f"place{i}"])
+        # key0 is used again so key1 is the least recently used entry
+        self.assertEqual(["place0"], cache.get("key0"))
+        cache.put("key3", ["place3"])
+        self.assertEqual(3, cache.size())
+        self.assertIsNone(cache.get("key1"))
+        for key in ["key0", "key2", "key3"]:
+            self.assertIsNotNone(cache.get(key), key)
+
+    def testExtractorCache(self):
+        """
+        test the cache parameter of the extraction functions
+        """
+        cache = EntityCache(self.cacheFile)
+        engine = WordEngine()
+        text = "Paris is the capital of France"
+        for _i in range(2):
+            e = Extractor(text=text)
+            entities = e.find_entities(Labels.geo, engine, cache)
+            self.assertEqual(["Paris", "France"], entities)
+            pc = geograpy.get_geoPlace_context(text=text, engine=engine, cache=cache)
+            self.assertTrue("France" in pc.countries)
+        self.assertEqual(1, len(engine.analyzed))
+        self.assertEqual(3, cache.hits)
+        # the signature is computed once per engine and cache - not per document
+        self.assertEqual(1, engine.signatureCalls)
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Created on 2026-10-17
+"""
+import os
+import tempfile
+import time
+import unittest
+
+import geograpy
+from geograpy.extraction import NLTKEngine
+from geograpy.gazetteer import GazetteerEngine
+from geograpy.labels import Labels
+from geograpy.locator import Locator
+from tests.basetest import Geograpy3Test
+
+
+class TestGazetteer(Geograpy3Test):
+    """
+    test the gazetteer based place extraction
+    """
+
+    def setUp(self, debug=False):
+        Geograpy3Test.setUp(self, debug=debug)
+        self.texts = [
+            "Paris is the capital of France",
+            "Las Vegas is a city in Nevada",
+            "I live in Kadawatha a suburb of Colombo  Sri Lanka",
+            "Berlin and Munich are the largest cities of Germany",
+            "The flight from New York City to San Francisco was delayed",
+        ]
+
+    def testLongestMatch(self):
+        """
+        test the leftmost longest matching of the automaton
+        """
+        with tempfile.TemporaryDirectory() as cacheDir:
+            engine = GazetteerEngine(
+                Locator.getInstance(), cacheFile=f"{cacheDir}/gazetteer.pickle"
+            )
+            engine.build(["York", "New York", "New York City", "City", "St. Louis"])
+            text = "From New York City via York and St. Louis to New York, new york"
+            self.assertEqual(
+                ["New York City", "York", "St. Louis", "New York"],
+                engine.find_entities(text),
+            )
+            self.assertEqual([], engine.find_entities(text, labels=["PERSON"]))
+
+    def testPickledAutomaton(self):
+        """
+        test that the automaton is pickled and loaded again
+        """
+        loc = Locator.getInstance()
+        with tempfile.TemporaryDirectory() as cacheDir:
+            cacheFile = f"{cacheDir}/gazetteer.pickle"
+            engine = GazetteerEngine(loc, cacheFile=cacheFile, debug=self.debug).load()
+            self.assertTrue(os.path.isfile(cacheFile))
+            loaded = GazetteerEngine(loc, cacheFile=cacheFile).load()
+            self.assertEqual(len(engine.terminal), len(loaded.terminal))
+            for text in self.texts:
+                self.assertEqual(engine.find_entities(text), loaded.find_entities(text))
+            # a truncated cache file e.g. of a killed process is rebuilt
+            with open(cacheFile, "rb") as cache:
+                content = cache.read()
+            with open(cacheFile, "wb") as cache:
+                cache.write(content[: len(content) // 2])
+            rebuilt = GazetteerEngine(loc, cacheFile=cacheFile).load()
+            self.assertEqual(len(engine.terminal), len(rebuilt.terminal))
+            self.assertEqual(len(content), os.path.getsize(cacheFile))
+        self.assertIs(GazetteerEngine.getInstance(), GazetteerEngine.getInstance())
+        pc = geograpy.get_place_context(text=self.texts[0], engine="gazetteer")
+        self.assertTrue("France" in pc.countries)
+        self.assertTrue("Paris" in pc.cities)
+
+    def testEngineBenchmark(self):
+        """
+        compare the throughput and the recall of the gazetteer with NLTK named entities
+        """
+        texts = self.texts * 20
+        engines = {
+            "nltk": NLTKEngine.getInstance(),
+            "gazetteer": GazetteerEngine.getInstance(),
+        }
+        results = {}
+        for name, engine in engines.items():
+            startTime = time.perf_counter()
+            results[name] = engine.find_entities_many(texts, labels=Labels.geo)
+            elapsed = time.perf_counter() - startTime
+            if self.debug:
+                print(f"{name}: {len(texts)/elapsed:.0f} texts/s")
+        # the recall of the gazetteer for the NLTK entities which are known places
+        loc = Locator.getInstance()
+        found = 0
+        known = 0
+        for nltkPlaces, gazetteerPlaces in zip(results["nltk"], results["gazetteer"]):
+            for place in nltkPlaces:
+                isKnown = (
+                    loc.getCountry(place) is not None
+                    or loc.regions_for_name(place)
+                    or loc.cities_for_name(place)
+                )
+                if isKnown:
+                    known += 1
+                    if place in gazetteerPlaces:
+                        found += 1
+        recall = found / known if known else 1.0
+        if self.debug:
+            print(f"gazetteer recall of known NLTK places: {recall:.2f}")
+        self.assertTrue(recall > 0.8)
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,107 @@
+"""
+Created on 2026-10-17
+"""
+import unittest
+
+from geograpy.labelindex import CountryIndex, foldCase
+from geograpy.locator import Country, Locator
+from geograpy.utils import Profiler
+from tests.basetest import Geograpy3Test
+
+
+class TestLabelIndex(Geograpy3Test):
+    """
+    test the memory resident label index
+    """
+
+    def setUp(self, debug=False):
+        Geograpy3Test.setUp(self, debug=debug)
+        self.names = [
+            "Paris",
+            "London",
+            "Berlin",
+            "Vienna",
+            "CA",
+            "US-CA",
+            "Texas",
+            "USA",
+            "germany",
+            "United Kingdom",
+            "Nowhere",
+        ]
+
+    def testFoldCase(self):
+        """
+        test the SQLite LIKE compatible case folding
+        """
+        self.assertEqual("united states", foldCase("United States"))
+        # only ASCII characters are folded just like SQLite LIKE does
+        self.assertEqual("Österreich", foldCase("ÖSTERREICH"))
+
+    def testLabelIndex(self):
+        """
+        test that the label index lookups are the same as the SQL lookups
+        and compare the lookup times
+        """
+        sqlLocator = Locator()
+        indexLocator = Locator(useLabelIndex=True)
+        profile = Profiler("loading label index", profile=self.debug)
+        labelIndex = indexLocator.getLabelIndex()
+        profile.time()
+        footprint = labelIndex.footprint()
+        if self.debug:
+            print(footprint)
+        self.assertTrue(footprint["cities"] > 0)
+        for name in self.names:
+            self.assertEqual(
+                sqlLocator.places_by_name(name, "name"),
+                indexLocator.places_by_name(name, "name"),
+            )
+            self.assertEqual(
+                [region.__dict__ for region in sqlLocator.regions_for_name(name)],
+                [region.__dict__ for region in indexLocator.regions_for_name(name)],
+            )
+            sqlCountry = sqlLocator.getCountry(name)
+            indexCountry = indexLocator.getCountry(name)
+            self.assertEqual(
+                sqlCountry.__dict__ if sqlCountry else None,
+                indexCountry.__dict__ if indexCountry else None,
+            )
+        rounds = 10
+        for locator, title in [(sqlLocator, "SQLite"), (indexLocator, "label index")]:
+            profile = Profiler(
+                f"{rounds}x{len(self.names)} lookups via {title}", profile=self.debug
+            )
+            for _i in range(rounds):
+                for name in self.names:
+                    locator.cities_for_name(name)
+                    locator.regions_for_name(name)
+                    locator.getCountry(name)
+            profile.time()
+
+    def testCountryIndex(self):
+        """
+        test that the country index gives the same results as the LIKE based queries
+        """
+        loc = Locator.getInstance()
+        countryIndex = CountryIndex(loc.sqlDB).load()
+        query = """SELECT * FROM countries
+WHERE name LIKE (?)
+OR wikidataid in (SELECT wikidataid FROM country_labels WHERE label LIKE (?))"""
+        for name in self.names + ["UNITED KINGDOM", "great britain", "Germ%"]:
+            countryRecords = countryIndex.countries_for_name(name, isIso=False)
+            expectedRecords = loc.sqlDB.query(query, (name, name))
+            if "%" in name:
+                # LIKE patterns are not handled by the index
+                self.assertIsNone(countryRecords)
+            else:
+                self.assertEqual(
+                    sorted(record["wikidataid"] for record in expectedRecords),
+                    sorted(record["wikidataid"] for record in countryRecords),
+                )
+        country = Country.fromRecord(countryIndex.countries_for_name("DE", isIso=True)[0])
+        self.assertEqual("Germany", country.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
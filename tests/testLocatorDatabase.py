@@ -4,12 +4,14 @@ Created on 16.08.2021
 @author: wf
 """
 import os
+import shutil
 import tempfile
 import unittest
 
 from lodstorage.storageconfig import StorageConfig
 
 from geograpy.locator import LocationContext, Locator
+from geograpy.utils import Profiler
 from tests.basetest import Geograpy3Test
 
 
@@ -55,6 +57,197 @@ class TestLocatorDatabase(Geograpy3Test):
                 loc.populate_db()
                 self.assertTrue(loc.db_has_data())
 
+    def testMaterializedCityLookup(self):
+        """
+        test materializing the CityLookup view as indexed table
+        """
+        loc = Locator.getInstance()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dbFile = f"{tmpdir}/{LocationContext.db_filename}"
+            shutil.copyfile(loc.db_file, dbFile)
+            materializedLoc = Locator(db_file=dbFile, debug=self.debug)
+            materializedLoc.materializeCityLookup()
+            self.assertTrue(materializedLoc.hasMaterializedCityLookup())
+            viewsMap = materializedLoc.sqlDB.getTableDict(tableType="view")
+            self.assertTrue("CityLookup" in viewsMap)
+            self.assertEqual("popNum", materializedLoc.getPopColumn())
+            query = "EXPLAIN QUERY PLAN " + materializedLoc.getCityLookupQuery("name=(?)")
+            planRecords = materializedLoc.sqlDB.query(query, ("Paris",))
+            self.assertTrue("cityLookupByName" in planRecords[0]["detail"])
+            self.assertFalse(
+                any("TEMP B-TREE" in record["detail"] for record in planRecords)
+            )
+            # the population keeps the type of the cities table
+            query = "SELECT DISTINCT typeof(pop) AS popType FROM {table}"
+            popTypes = [
+                {
+                    record["popType"]
+                    for record in materializedLoc.sqlDB.query(query.format(table=table))
+                }
+                for table in ["cities", "CityLookup"]
+            ]
+            self.assertEqual(popTypes[0], popTypes[1])
+            for name in ["Paris", "Berlin", "Athens", "Singapore"]:
+                expected = [str(city) for city in loc.cities_for_name(name)]
+                cities = materializedLoc.cities_for_name(name)
+                self.assertEqual(expected, [str(city) for city in cities])
+            # the records have the columns of the CityLookup view without popNum
+            viewColumns = [
+                record["name"]
+                for record in loc.sqlDB.query("PRAGMA table_info('CityLookup')")
+                if record["name"] != "popNum"
+            ]
+            records = materializedLoc.lookupPlaces("Paris", "name")
+            self.assertTrue(len(records) > 0)
+            self.assertEqual(viewColumns, list(records[0].keys()))
+            records = materializedLoc.queryChunks(
+                materializedLoc.getCityLookupQuery("name IN ({params})"), ["Paris"]
+            )
+            self.assertEqual(viewColumns, list(records[0].keys()))
+
+    def testHasDataIsCached(self):
+        """
+        test that the database check is only done once per connection
+        and repeated if the database file changes
+        """
+        loc = Locator.getInstance()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dbFile = f"{tmpdir}/{LocationContext.db_filename}"
+            shutil.copyfile(loc.db_file, dbFile)
+            checkedLoc = Locator(db_file=dbFile, debug=self.debug)
+            self.assertIsNone(checkedLoc.dbValidated)
+            self.assertTrue(checkedLoc.db_has_data())
+            self.assertTrue(checkedLoc.dbValidated)
+            self.assertEqual(checkedLoc.dbVersion, checkedLoc.dbFoundVersion)
+            profiler = Profiler("cached database checks", profile=self.debug)
+            for _i in range(1000):
+                self.assertTrue(checkedLoc.db_has_data())
+            elapsed = profiler.time()
+            self.assertTrue(elapsed < 1.0)
+            # modifying the file makes the check run again
+            checkedLoc.sqlDB.execute("UPDATE Version SET version='outdated'")
+            checkedLoc.sqlDB.c.commit()
+            os.utime(dbFile, ns=(0, 0))
+            self.assertFalse(checkedLoc.db_has_data())
+            self.assertEqual("outdated", checkedLoc.dbFoundVersion)
+            # replacing the file reconnects
+            shutil.copyfile(loc.db_file, f"{dbFile}.new")
+            os.replace(f"{dbFile}.new", dbFile)
+            self.assertTrue(checkedLoc.db_has_data())
+            self.assertEqual(checkedLoc.dbVersion, checkedLoc.dbFoundVersion)
+
+    def testReadOnlyMode(self):
+        """
+        test the read-only memory mapped serving mode and compare the lookup latency
+        """
+        names = ["Paris", "London", "Berlin", "Vienna", "CA", "USA", "Texas", "Germany"]
+
+        def lookup(loc: Locator, name: str) -> tuple:
+            cities = [str(city) for city in loc.cities_for_name(name)]
+            regions = [str(region) for region in loc.regions_for_name(name)]
+            return cities, regions, str(loc.getCountry(name))
+
+        loc = Locator()
+        readOnlyLoc = Locator(readOnly=True)
+        mmapSize = readOnlyLoc.sqlDB.query("PRAGMA mmap_size")[0]["mmap_size"]
+        self.assertTrue(mmapSize > 0)
+        with self.assertRaises(Exception):
+            readOnlyLoc.sqlDB.execute("CREATE TABLE readOnlyCheck (name TEXT)")
+        rounds = 20
+        latencies = {}
+        for title, locator in [("read-write", loc), ("read-only", readOnlyLoc)]:
+            profiler = Profiler(f"{rounds}x{len(names)} {title} lookups", self.debug)
+            results = [lookup(locator, name) for _i in range(rounds) for name in names]
+            latencies[title] = profiler.time() / (rounds * len(names))
+            if title == "read-write":
+                expected = results
+            else:
+                self.assertEqual(expected, results)
+        if self.debug:
+            for title, latency in latencies.items():
+                print(f"{title}: {latency*1000:.3f} ms per lookup")
+        locationContext = LocationContext.fromCache(readOnly=True)
+        locations = locationContext.locateLocation("Paris, Texas")
+        self.assertEqual("Paris", locations[0].name)
+
+    def testInMemory(self):
+        """
+        test serving the lookups from an in-memory copy of the database
+        """
+        names = ["Paris", "London", "Berlin", "Vienna", "CA", "USA", "Texas", "Germany"]
+
+        def lookup(loc: Locator, name: str) -> tuple:
+            cities = [str(city) for city in loc.cities_for_name(name)]
+            regions = [str(region) for region in loc.regions_for_name(name)]
+            return cities, regions, str(loc.getCountry(name))
+
+        loc = Locator()
+        expected = [lookup(loc, name) for name in names]
+        for threadSafe in [False, True]:
+            memoryLoc = Locator(inMemory=True, threadSafe=threadSafe, debug=self.debug)
+            self.assertTrue(memoryLoc.memorySize > 0)
+            self.assertTrue(memoryLoc.memoryLoadTime >= 0)
+            self.assertTrue(memoryLoc.db_has_data())
+            self.assertEqual(expected, [lookup(memoryLoc, name) for name in names])
+
+    def testInMemoryPopulate(self):
+        """
+        test that recreating the database of an in-memory Locator recreates the
+        database file and loads it into memory again
+        """
+
+        class CopyingLocator(Locator):
+            """
+            Locator that populates the database from a copy instead of Wikidata
+            """
+
+            sourceFile = None
+
+            def copyTable(self, sqlDB, tableName: str):
+                sqlDB.c.execute("ATTACH DATABASE ? AS source", (self.sourceFile,))
+                sqlDB.c.execute(f"DROP TABLE IF EXISTS {tableName}")
+                sqlDB.c.execute(
+                    f"CREATE TABLE {tableName} AS SELECT * FROM source.{tableName}"
+                )
+                sqlDB.c.commit()
+                sqlDB.c.execute("DETACH DATABASE source")
+
+            def populate_Countries(self, sqlDB):
+                self.copyTable(sqlDB, "countries")
+
+            def populate_Regions(self, sqlDB):
+                self.copyTable(sqlDB, "regions")
+
+            def populate_Cities(self, sqlDB):
+                self.copyTable(sqlDB, "cities")
+
+        loc = Locator.getInstance()
+        expected = [str(city) for city in loc.cities_for_name("Paris")]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dbFile = f"{tmpdir}/{LocationContext.db_filename}"
+            shutil.copyfile(loc.db_file, dbFile)
+            fileLoc = Locator(db_file=dbFile)
+            fileLoc.sqlDB.execute("DELETE FROM cities WHERE name='Paris'")
+            fileLoc.materializeCityLookup()
+            fileLoc.close()
+            CopyingLocator.sourceFile = loc.db_file
+            for threadSafe in [False, True]:
+                memoryLoc = CopyingLocator(
+                    db_file=dbFile, inMemory=True, threadSafe=threadSafe
+                )
+                memoryLoc.populate_db(force=True)
+                self.assertEqual(
+                    expected, [str(city) for city in memoryLoc.cities_for_name("Paris")]
+                )
+                fileLoc = Locator(db_file=dbFile)
+                self.assertEqual(
+                    expected, [str(city) for city in fileLoc.cities_for_name("Paris")]
+                )
+                fileLoc.sqlDB.execute("DELETE FROM cities WHERE name='Paris'")
+                fileLoc.materializeCityLookup()
+                fileLoc.close()
+                memoryLoc.close()
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
@@ -0,0 +1,111 @@
+"""
+Created on 2026-10-17
+"""
+import os
+import pickle
+import unittest
+
+from geograpy.locator import Locator
+from geograpy.parallel import (
+    locate_many,
+    locate_many_unordered,
+    locateChunk,
+    runChunks,
+)
+from geograpy.utils import Profiler
+from tests.basetest import Geograpy3Test
+
+
+class TestParallel(Geograpy3Test):
+    """
+    test parallel geocoding with a pool of worker processes
+    """
+
+    def setUp(self, debug=False):
+        Geograpy3Test.setUp(self, debug=debug)
+        self.locations = [
+            "Paris, Texas",
+            "Vienna, Austria",
+            "Vienna, IL",
+            "Amsterdam, Netherlands",
+            "London",
+            "Berlin, Germany",
+            "Nowhere",
+        ]
+
+    def testReadOnlyLocator(self):
+        """
+        test opening the database read-only and pickling a Locator
+        """
+        loc = Locator(readOnly=True)
+        self.assertEqual("Germany", loc.getCountry("DE").name)
+        with self.assertRaises(Exception):
+            loc.sqlDB.execute("CREATE TABLE readOnlyCheck (name TEXT)")
+        unpickled = pickle.loads(pickle.dumps(loc))
+        self.assertEqual("Germany", unpickled.getCountry("DE").name)
+
+    def testLocateMany(self):
+        """
+        test locating cities with a pool of workers and show the speedup curve
+        """
+        loc = Locator.getInstance()
+        locations = self.locations * 500
+        profiler = Profiler(f"locating {len(locations)} cities sequentially", self.debug)
+        expected = [str(city) for city in loc.locateCityBatch(locations)]
+        baseTime = profiler.time()
+        maxWorkers = min(4, os.cpu_count())
+        workers = 1
+        while workers <= maxWorkers:
+            profiler = Profiler(
+                f"locating {len(locations)} cities with {workers} workers", self.debug
+            )
+            cities = locate_many(locations, workers=workers, chunksize=250)
+            elapsed = profiler.time()
+            if self.debug:
+                print(f"speedup for {workers} workers: {baseTime/elapsed:5.2f}")
+            self.assertEqual(expected, [str(city) for city in cities])
+            workers *= 2
+        # unordered results are streamed as (index, city) tuples
+        indexedCities = list(
+            locate_many_unordered(locations, workers=maxWorkers, chunksize=250)
+        )
+        self.assertEqual(len(locations), len(indexedCities))
+        for index, city in indexedCities:
+            self.assertEqual(expected[index], str(city))
+
+    def testBoundedPending(self):
+        """
+        test that the items are read lazily with a bounded number of chunks in flight
+        """
+        workers = 2
+        chunksize = 10
+        total = 10000
+        for ordered in True, False:
+            read = [0]
+
+            def locations():
+                for i in range(total):
+                    read[0] += 1
+                    yield self.locations[i % len(self.locations)]
+
+            results = runChunks(
+                locateChunk,
+                locations(),
+                workers=workers,
+                chunksize=chunksize,
+                ordered=ordered,
+            )
+            index, _city = next(results)
+            if ordered:
+                self.assertEqual(0, index)
+            # at most 2*workers chunks are submitted before the first result
+            self.assertTrue(read[0] <= 2 * workers * chunksize, read[0])
+            indices = [index] + [index for index, _city in results]
+            self.assertEqual(list(range(total)), sorted(indices))
+            if ordered:
+                self.assertEqual(list(range(total)), indices)
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Created on 2026-10-17
+"""
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from geograpy.server import GeograpyServer
+from tests.basetest import Geograpy3Test
+
+
+class TestServer(Geograpy3Test):
+    """
+    test the HTTP/JSON server
+    """
+
+    def setUp(self, debug=False):
+        Geograpy3Test.setUp(self, debug=debug)
+
+    def request(self, baseUrl: str, path: str, params: dict = None, body=None):
+        """
+        send a GET request with the given params or a POST request with the given JSON body
+
+        Returns:
+            tuple: the HTTP status and the JSON result
+        """
+        url = f"{baseUrl}{path}"
+        if params:
+            url += "?" + urllib.parse.urlencode(params)
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        try:
+            with urllib.request.urlopen(url, data=data, timeout=30) as response:
+                status, content = response.status, response.read()
+        except urllib.error.HTTPError as error:
+            status, content = error.code, error.read()
+        result = json.loads(content)
+        if self.debug:
+            print(f"{path} {params or body}: {status} {result}")
+        return status, result
+
+    def testServer(self):
+        """
+        test the endpoints served from this process
+        """
+        server = GeograpyServer(port=0, engine="gazetteer", debug=self.debug).open()
+        serverThread = threading.Thread(target=server.serve)
+        serverThread.start()
+        try:
+            baseUrl = f"http://127.0.0.1:{server.port}"
+            status, health = self.request(baseUrl, "/health")
+            self.assertEqual(200, status)
+            self.assertEqual(os.getpid(), health["pid"])
+            params = {"location": "Paris, Texas"}
+            status, city = self.request(baseUrl, "/locate", params)
+            self.assertEqual("US-TX", city["regionIso"])
+            body = ["Paris, Texas", {"location": "Berlin, Germany"}]
+            status, cities = self.request(baseUrl, "/locate", body=body)
+            self.assertEqual(200, status)
+            self.assertEqual(["Paris", "Berlin"], [city["name"] for city in cities])
+            status, locations = self.request(baseUrl, "/locations", {"name": "Berlin"})
+            self.assertTrue(
+                any(location["locationKind"] == "City" for location in locations)
+            )
+            text = "Paris is the capital of France"
+            status, record = self.request(baseUrl, "/place-context", {"text": text})
+            self.assertTrue("France" in record["countries"])
+            status, result = self.request(baseUrl, "/unknown")
+            self.assertEqual(404, status)
+            status, result = self.request(baseUrl, "/locate", body=[42])
+            self.assertEqual(400, status)
+        finally:
+            server.shutdown()
+            serverThread.join()
+
+    def testReloadClosesOldState(self):
+        """
+        test that a reload closes the database connections of the replaced state
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            cacheFile = f"{tmpDir}/entities.db"
+            server = GeograpyServer(
+                port=0, engine="gazetteer", cacheFile=cacheFile, debug=self.debug
+            ).open()
+            serverThread = threading.Thread(target=server.serve)
+            serverThread.start()
+            try:
+                baseUrl = f"http://127.0.0.1:{server.port}"
+                text = "Paris is the capital of France"
+                status, record = self.request(baseUrl, "/place-context", {"text": text})
+                self.assertEqual(200, status)
+                oldCache, oldLocationContext = server.cache, server.locationContext
+                self.assertIsNotNone(oldCache.connection)
+                # the reload of a SIGHUP warms up on a thread of its own
+                server.reload()
+                for _i in range(600):
+                    status, health = self.request(baseUrl, "/health")
+                    if health["generation"] == 2:
+                        break
+                    time.sleep(0.1)
+                self.assertEqual(2, health["generation"])
+                self.assertIsNot(oldCache, server.cache)
+                self.assertIsNone(oldCache.connection)
+                self.assertIsNone(oldLocationContext.cityManager.sqldb)
+                self.assertIsNone(oldLocationContext.locator.sharedDB)
+                status, reloaded = self.request(
+                    baseUrl, "/place-context", {"text": text}
+                )
+                self.assertEqual(record, reloaded)
+                self.assertEqual(1, server.cache.hits)
+            finally:
+                server.shutdown()
+                serverThread.join()
+                server.cache.close()
+
+    @unittest.skipIf(not hasattr(os, "fork"), "worker processes need os.fork")
+    def testWorkersReload(self):
+        """
+        test the command line server with worker processes and a graceful reload
+        """
+        cmd = [sys.executable, "-m", "geograpy.locator", "--serve", "--port", "0"]
+        cmd += ["-j", "2", "-e", "gazetteer"]
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+        try:
+            # skip the messages of the warmup
+            line = process.stdout.readline()
+            while line and not line.startswith("serving on"):
+                line = process.stdout.readline()
+            self.assertTrue(line, "the server did not start")
+            baseUrl = line.split()[2]
+            status, health = self.request(baseUrl, "/health")
+            self.assertEqual(1, health["generation"])
+            self.assertNotEqual(process.pid, health["pid"])
+            oldPid = health["pid"]
+            process.send_signal(signal.SIGHUP)
+            for _i in range(600):
+                status, health = self.request(baseUrl, "/health")
+                if health["generation"] == 2:
+                    break
+                time.sleep(0.1)
+            self.assertEqual(2, health["generation"])
+            self.assertNotEqual(oldPid, health["pid"])
+            params = {"location": "Paris, Texas"}
+            status, city = self.request(baseUrl, "/locate", params)
+            self.assertEqual("US-TX", city["regionIso"])
+        finally:
+            process.terminate()
+            exitCode = process.wait(timeout=60)
+            process.stdout.close()
+        self.assertEqual(0, exitCode)
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -0,0 +1,184 @@
+"""
+Created on 2026-10-17
+"""
+import csv
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import geograpy
+from geograpy.locator import LocatorCmd, main
+from tests.basetest import Geograpy3Test
+
+
+class TestStreamPlaceContexts(Geograpy3Test):
+    """
+    test streaming place contexts for a corpus of documents
+    """
+
+    def setUp(self, debug=False):
+        Geograpy3Test.setUp(self, debug=debug)
+        self.texts = [
+            "Paris is the capital of France",
+            "",
+            "Las Vegas is a city in Nevada",
+            "I live in Kadawatha a suburb of Colombo  Sri Lanka",
+        ]
+
+    def testStreamPlaceContexts(self):
+        """
+        test that the streamed records match get_place_context
+        """
+        records = list(geograpy.stream_place_contexts(iter(self.texts), batchSize=2))
+        self.assertEqual(len(self.texts), len(records))
+        for index, (text, record) in enumerate(zip(self.texts, records)):
+            if self.debug:
+                print(record)
+            self.assertEqual(index, record["index"])
+            self.assertFalse("error" in record)
+            if text:
+                expected = geograpy.get_place_context(text=text).toRecord()
+                for key, value in expected.items():
+                    self.assertEqual(value, record[key], key)
+            else:
+                self.assertEqual([], record["countries"])
+
+    def testStreamCommandLine(self):
+        """
+        test the JSONL command line mode
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            jsonlFile = f"{tmpDir}/documents.jsonl"
+            with open(jsonlFile, "w", encoding="utf-8") as jsonl:
+                jsonl.write(json.dumps({"id": "doc1", "text": self.texts[0]}) + "\n")
+                jsonl.write('{"id": "doc2", "text": \n')
+                jsonl.write(json.dumps({"text": self.texts[2]}) + "\n")
+            stdout = io.StringIO()
+            with redirect_stdout(stdout):
+                exitCode = main(["--input", jsonlFile])
+        self.assertEqual(0, exitCode)
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        if self.debug:
+            print(records)
+        self.assertEqual(3, len(records))
+        self.assertEqual("doc1", records[0]["id"])
+        self.assertTrue("France" in records[0]["countries"])
+        # a malformed line gives an error record and does not stop the stream
+        self.assertEqual(1, records[1]["index"])
+        self.assertTrue(records[1]["error"].startswith("invalid JSON"))
+        self.assertTrue("United States of America" in records[2]["countries"])
+
+    def testInvalidJsonLocateCommandLine(self):
+        """
+        test that a malformed JSONL line gives an error record when locating cities
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            jsonlFile = f"{tmpDir}/locations.jsonl"
+            with open(jsonlFile, "w", encoding="utf-8") as jsonl:
+                jsonl.write(json.dumps({"location": "Paris, Texas"}) + "\n")
+                jsonl.write('{"location": "Berlin\n')
+                jsonl.write(json.dumps({"id": 3, "location": "Austin, Texas"}) + "\n")
+            outputFile = f"{tmpDir}/cities.jsonl"
+            self.assertEqual(0, main(["-i", jsonlFile, "--locate", "-o", outputFile]))
+            with open(outputFile, encoding="utf-8") as jsonl:
+                records = [json.loads(line) for line in jsonl]
+        if self.debug:
+            print(records)
+        self.assertEqual(3, len(records))
+        self.assertEqual("Paris", records[0]["city"]["name"])
+        self.assertEqual(["index", "error"], list(records[1].keys()))
+        self.assertEqual(1, records[1]["index"])
+        self.assertEqual(3, records[2]["id"])
+        self.assertEqual("Austin", records[2]["city"]["name"])
+
+    def testPlainTextLinesLocateCommandLine(self):
+        """
+        test that the lines of a .jsonl file may be plain texts unless the jsonl format is given
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            jsonlFile = f"{tmpDir}/locations.jsonl"
+            with open(jsonlFile, "w", encoding="utf-8") as jsonl:
+                jsonl.write(json.dumps({"location": "Paris, Texas"}) + "\n")
+                jsonl.write("Austin, Texas\n")
+            recordsByFormat = {}
+            for inputFormat in ["auto", "jsonl"]:
+                outputFile = f"{tmpDir}/cities-{inputFormat}.jsonl"
+                argv = ["-i", jsonlFile, "-f", inputFormat, "--locate", "-o", outputFile]
+                self.assertEqual(0, main(argv))
+                with open(outputFile, encoding="utf-8") as jsonl:
+                    recordsByFormat[inputFormat] = [json.loads(line) for line in jsonl]
+        if self.debug:
+            print(recordsByFormat)
+        records = recordsByFormat["auto"]
+        self.assertEqual("Paris", records[0]["city"]["name"])
+        self.assertEqual("Austin, Texas", records[1]["location"])
+        self.assertEqual("Austin", records[1]["city"]["name"])
+        records = recordsByFormat["jsonl"]
+        self.assertEqual("Paris", records[0]["city"]["name"])
+        self.assertTrue(records[1]["error"].startswith("invalid JSON"))
+
+    def testBatchLocateCommandLine(self):
+        """
+        test locating the cities of a CSV column with worker processes
+        """
+        locations = ["Paris, Texas", "Berlin, Germany", "", "Austin, Texas"]
+        with tempfile.TemporaryDirectory() as tmpDir:
+            csvFile = f"{tmpDir}/locations.csv"
+            with open(csvFile, "w", encoding="utf-8", newline="") as csvOut:
+                writer = csv.writer(csvOut)
+                writer.writerow(["id", "place"])
+                for i, location in enumerate(locations):
+                    writer.writerow([f"row{i}", location])
+            recordsByJobs = {}
+            for jobs in [1, 2]:
+                outputFile = f"{tmpDir}/cities{jobs}.jsonl"
+                argv = ["-i", csvFile, "--column", "place", "--locate"]
+                argv += ["-j", str(jobs), "-o", outputFile]
+                self.assertEqual(0, main(argv))
+                with open(outputFile, encoding="utf-8") as jsonl:
+                    records = [json.loads(line) for line in jsonl]
+                if self.debug:
+                    print(records)
+                recordsByJobs[jobs] = records
+            records = recordsByJobs[1]
+            self.assertEqual(records, recordsByJobs[2])
+            self.assertEqual(len(locations), len(records))
+            for i, record in enumerate(records):
+                self.assertEqual(i, record["index"])
+                self.assertEqual(f"row{i}", record["id"])
+                self.assertEqual(locations[i], record["location"])
+            self.assertEqual("Paris", records[0]["city"]["name"])
+            self.assertEqual("US-TX", records[0]["city"]["regionIso"])
+            self.assertIsNone(records[2]["city"])
+
+    def testLazyLocateRecords(self):
+        """
+        test that the locations are read lazily when locating with worker processes
+        """
+        jobs = 2
+        total = 20000
+        read = [0]
+
+        def locations():
+            for i in range(total):
+                read[0] += 1
+                yield f"Paris, Texas {i}" if i % 2 else "Berlin, Germany"
+
+        locatorCmd = LocatorCmd()
+        locatorCmd.cmd_parse(["--locate", "-j", str(jobs)])
+        records = locatorCmd.locateRecords(locations())
+        record = next(records)
+        self.assertEqual(0, record["index"])
+        self.assertEqual("Berlin", record["city"]["name"])
+        # at most 2*jobs chunks of 100 locations are read ahead of the first record
+        self.assertTrue(read[0] <= 2 * jobs * 100, read[0])
+        for i, record in enumerate(records, start=1):
+            self.assertEqual(i, record["index"])
+        self.assertEqual(total, read[0])
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
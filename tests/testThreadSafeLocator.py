@@ -0,0 +1,116 @@
+"""
+Created on 2026-10-17
+"""
+import copy
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from geograpy.locator import CityManager, LocationContext, Locator
+from tests.basetest import Geograpy3Test
+
+
+class TestThreadSafeLocator(Geograpy3Test):
+    """
+    test using the Locator from multiple threads
+    """
+
+    def setUp(self, debug=False):
+        Geograpy3Test.setUp(self, debug=debug)
+        self.names = ["Paris", "London", "Berlin", "Vienna", "CA", "USA", "Germany"]
+
+    def lookup(self, loc: Locator, name: str) -> tuple:
+        """
+        lookup cities, regions and the country for the given name
+        """
+        cities = [str(city) for city in loc.cities_for_name(name)]
+        regions = [str(region) for region in loc.regions_for_name(name)]
+        country = str(loc.getCountry(name))
+        return cities, regions, country
+
+    def testThreadSafeLookups(self):
+        """
+        test that concurrent lookups give the same results as sequential ones
+        """
+        names = self.names * 20
+        loc = Locator()
+        expected = [self.lookup(loc, name) for name in names]
+        for options in [
+            {},
+            {"cacheSize": 16},
+            {"cacheSize": 16, "useLabelIndex": True},
+        ]:
+            threadSafeLoc = Locator(threadSafe=True, **options)
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(
+                    executor.map(lambda name: self.lookup(threadSafeLoc, name), names)
+                )
+            self.assertEqual(expected, results, str(options))
+            # reloading the database reconnects all threads
+            threadSafeLoc.loadDB()
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(
+                    executor.map(lambda name: self.lookup(threadSafeLoc, name), names)
+                )
+            self.assertEqual(expected, results, str(options))
+
+    def testSingleton(self):
+        """
+        test that concurrent getInstance calls create only one Locator
+        """
+        Locator.resetInstance()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            locators = list(
+                executor.map(
+                    lambda _i: Locator.getInstance(threadSafe=True), range(32)
+                )
+            )
+        self.assertEqual(1, len({id(loc) for loc in locators}))
+        Locator.resetInstance()
+
+    def testLocationManagerThreadConnection(self):
+        """
+        test that the LocationManager lookups reuse one connection per thread
+        """
+        cityManager = CityManager("cities")
+        self.assertIs(cityManager.getThreadSQLDB(), cityManager.getThreadSQLDB())
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            cityCounts = list(
+                executor.map(
+                    lambda name: len(cityManager.getByName(name)), ["Paris"] * 16
+                )
+            )
+        self.assertEqual(1, len(set(cityCounts)))
+        self.assertTrue(cityCounts[0] > 0)
+
+    def testThreadConnectionReopened(self):
+        """
+        test that the read-only connection of a thread is reopened when the
+        database file is replaced
+        """
+        loc = Locator.getInstance()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            dbFile = f"{tmpdir}/{LocationContext.db_filename}"
+            shutil.copyfile(loc.db_file, dbFile)
+            config = copy.copy(LocationContext.getDefaultConfig())
+            config.cacheFile = dbFile
+            cityManager = CityManager("cities", config=config, readOnly=True)
+            sqlDB = cityManager.getThreadSQLDB()
+            self.assertIs(sqlDB, cityManager.getThreadSQLDB())
+            expected = len(cityManager.getByName("Paris"))
+            self.assertTrue(expected > 0)
+            # replace the file the way a database update does
+            shutil.copyfile(loc.db_file, f"{dbFile}.new")
+            os.replace(f"{dbFile}.new", dbFile)
+            reopened = cityManager.getThreadSQLDB()
+            self.assertIsNot(sqlDB, reopened)
+            self.assertIs(reopened, cityManager.getThreadSQLDB())
+            self.assertEqual(expected, len(cityManager.getByName("Paris")))
+            cityManager.close()
+
+
+if __name__ == "__main__":
+    # import sys;sys.argv = ['', 'Test.testName']
+    unittest.main()
@@ -1,10 +1,60 @@
+import subprocess
+import sys
+import threading
+import time
 import unittest
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 import geograpy
-from geograpy.extraction import Extractor
+from geograpy.extraction import Extractor, NLTKEngine
 from tests.basetest import Geograpy3Test
 
 
+class PageHandler(BaseHTTPRequestHandler):
+    """
+    serve slow article pages and count the concurrent requests per host
+    """
+
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    active = Counter()
+    maxActive = Counter()
+    connections = set()
+
+    def do_GET(self):
+        host = self.headers["Host"].split(":")[0]
+        with PageHandler.lock:
+            PageHandler.connections.add(self.client_address)
+            PageHandler.active[host] += 1
+            PageHandler.maxActive[host] = max(
+                PageHandler.maxActive[host], PageHandler.active[host]
+            )
+        try:
+            if self.path == "/slow":
+                time.sleep(3)
+            else:
+                time.sleep(0.2)
+            if self.path == "/missing":
+                self.send_response(404)
+                body = b"not found"
+            else:
+                self.send_response(200)
+                text = f"Page {self.path} tells that Paris is the capital of France."
+                body = f"<html><body><article><p>{text}</p></article></body></html>".encode()
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with PageHandler.lock:
+                PageHandler.active[host] -= 1
+
+    def log_message(self, *args):
+        pass
+
+
 class TestExtractor(Geograpy3Test):
     """
     test Extractor
@@ -245,5 +295,106 @@ class TestExtractor(Geograpy3Test):
                 placesInFeed.append(places)
 
 
+    def testSplitWithoutNLTK(self):
+        """
+        test that splitting a location string does not import NLTK
+        """
+        code = """
+import sys
+from geograpy.extraction import Extractor, NLTKEngine
+e = Extractor(text="Vienna, Austria")
+e.split()
+assert e.places == ["Vienna", " Austria"]
+print("nltk" in sys.modules)
+"""
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual("False", result.stdout.strip())
+
+    def testNLTKReadiness(self):
+        """
+        test that the NLTK packages are only checked once per process
+        """
+        Extractor.provide_nltk_packages(force=True)
+        self.assertTrue(Extractor.nltkReady)
+        Extractor(text="Paris is in France").find_entities()
+        self.assertTrue(Extractor.nltkReady)
+
+
+    def testNLTKEngine(self):
+        """
+        test that the preloaded tagger and chunker give the same entities as
+        nltk.pos_tag and nltk.ne_chunk for single texts and batches
+        """
+        import nltk
+
+        texts = [
+            "Paris is the capital of France",
+            "I live in Kadawatha a suburb of Colombo  Sri Lanka",
+            "Jersey City New Jersey 07306",
+            "Las Vegas is a city in Nevada",
+        ]
+        engine = NLTKEngine.getInstance()
+        self.assertIs(engine, NLTKEngine.getInstance())
+        expected = []
+        for text in texts:
+            nes = nltk.ne_chunk(nltk.pos_tag(nltk.word_tokenize(text)))
+            expected.append(NLTKEngine.entities(nes))
+            self.assertEqual(expected[-1], engine.find_entities(text))
+            self.assertEqual(expected[-1], Extractor(text=text).find_entities())
+        self.assertEqual(expected, engine.find_entities_many(texts))
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(engine.find_entities, texts * 4))
+        self.assertEqual(expected * 4, results)
+
+
+    def testFetchMany(self):
+        """
+        test fetching urls concurrently from a local server
+        """
+        server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+        serverThread = threading.Thread(target=server.serve_forever, daemon=True)
+        serverThread.start()
+        try:
+            port = server.server_address[1]
+            urls = []
+            for i in range(8):
+                for host in ["127.0.0.1", "localhost"]:
+                    urls.append(f"http://{host}:{port}/page{i}")
+            urls.append(f"http://127.0.0.1:{port}/missing")
+            urls.append(f"http://localhost:{port}/slow")
+            # import newspaper before timing - it takes seconds
+            from newspaper import Article  # noqa: F401
+
+            startTime = time.monotonic()
+            results = list(
+                Extractor.fetch_many(
+                    iter(urls), concurrency=8, per_host_limit=3, timeout=1.0
+                )
+            )
+            elapsed = time.monotonic() - startTime
+            if self.debug:
+                print(f"fetched {len(urls)} urls in {elapsed:.2f} s")
+                print(f"connections: {len(PageHandler.connections)}")
+            self.assertEqual(len(urls), len(results))
+            for index, url, text, error in results:
+                self.assertEqual(urls[index], url)
+                if url.endswith("/missing") or url.endswith("/slow"):
+                    self.assertIsNone(text)
+                    self.assertIsNotNone(error)
+                else:
+                    self.assertIsNone(error, url)
+                    self.assertTrue("Paris" in text)
+            # at most 3 requests per host at a time on reused keep-alive connections
+            self.assertTrue(max(PageHandler.maxActive.values()) <= 3)
+            self.assertTrue(len(PageHandler.connections) < len(urls))
+            # 18 requests of 0.2 s each would take more than 3.6 s one after the other
+            self.assertTrue(elapsed < 3.0)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -16,6 +16,8 @@ from lodstorage.uml import UML
 
 import geograpy
 from geograpy.locator import City, CountryManager, Location, LocationContext, Locator
+from geograpy.misspellings import MisspellingDictionary
+from geograpy.utils import LRUCache, Profiler
 from tests.basetest import Geograpy3Test
 
 
@@ -427,6 +429,103 @@ February 3-5, 2020"""
                 pop2 = cities[i + 1].pop if cities[i + 1].pop else 0
                 self.assertTrue(pop1 >= pop2)
 
+    def testLocateCityBatch(self):
+        """
+        test that the batch city location gives the same results as locateCity
+        """
+        examples = [
+            "Paris, US-TX",
+            "Amsterdam, Netherlands",
+            "Vienna, Austria",
+            "Vienna, Illinois, US",
+            "Paris, Texas",
+            "Austin, TX",
+            "San Francisco, CA",
+            "Berlin",
+            "Nowhere, Neverland",
+        ]
+        loc = Locator.getInstance()
+        profile = Profiler(f"locating {len(examples)} cities one by one", self.debug)
+        expected = [str(loc.locateCity(example.split(","))) for example in examples]
+        profile.time()
+        profile = Profiler(f"locating {len(examples)} cities in a batch", self.debug)
+        cities = loc.locateCityBatch(examples)
+        profile.time()
+        self.assertEqual(expected, [str(city) for city in cities])
+        cities = geograpy.locateCities_many(examples)
+        self.assertEqual(expected, [str(city) for city in cities])
+
+    def testLookupCache(self):
+        """
+        test the least recently used cache for the Locator lookups
+        """
+        loc = Locator()
+        cachingLoc = Locator(cacheSize=4)
+        names = ["London", "Berlin", "CA", "USA", "London", "Berlin", "CA", "USA"]
+        for name in names:
+            self.assertEqual(
+                [str(city) for city in loc.cities_for_name(name)],
+                [str(city) for city in cachingLoc.cities_for_name(name)],
+            )
+            self.assertEqual(str(loc.getCountry(name)), str(cachingLoc.getCountry(name)))
+        cacheInfo = cachingLoc.cache_info()
+        if self.debug:
+            print(cacheInfo)
+        self.assertEqual(4, cacheInfo.maxsize)
+        self.assertEqual(4, cacheInfo.currsize)
+        self.assertTrue(cacheInfo.evictions > 0)
+        self.assertTrue(cacheInfo.hits + cacheInfo.misses >= len(names) * 2)
+        # reloading the database invalidates the cache
+        cachingLoc.loadDB()
+        self.assertEqual(0, cachingLoc.cache_info().currsize)
+        self.assertIsNone(loc.cache_info())
+
+    def testLookupCacheClearedDuringCompute(self):
+        """
+        test that a value computed while the cache is cleared is not cached
+        """
+        cache = LRUCache(4)
+        for clear in cache.cache_clear, lambda: cache.discard(lambda key: True):
+
+            def compute():
+                # e.g. another thread reloads the database meanwhile
+                clear()
+                return "stale"
+
+            self.assertEqual("stale", cache.lookup("key", compute))
+            self.assertEqual(0, cache.cache_info().currsize)
+            self.assertEqual("fresh", cache.lookup("key", lambda: "fresh"))
+            self.assertEqual("fresh", cache.lookup("key", lambda: "other"))
+            cache.cache_clear()
+
+    def testMisspellingDictionary(self):
+        """
+        test the shared dictionary of country misspellings
+        """
+        misspellings = MisspellingDictionary.getInstance()
+        self.assertIs(misspellings, MisspellingDictionary.getInstance())
+        loc = Locator(correctMisspelling=True)
+        self.assertEqual("Bahamas", loc.correct_country_misspelling("Bahamas, The"))
+        self.assertEqual("Germany", loc.correct_country_misspelling("Germany"))
+        # user supplied extension files override the bundled entries
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", suffix=".csv", delete=False, encoding="utf-8"
+            ) as extensionFile:
+                extensionFile.write("misspelling,Issue,correct name\n")
+                extensionFile.write("Deutschland,translation,Germany\n")
+                extensionFile.write('"Bahamas, The",spelling,Commonwealth of The Bahamas\n')
+            misspellings.addFile(extensionFile.name)
+            self.assertEqual("Germany", loc.correct_country_misspelling("Deutschland"))
+            self.assertEqual(
+                "Commonwealth of The Bahamas",
+                loc.correct_country_misspelling("Bahamas, The"),
+            )
+        finally:
+            os.remove(extensionFile.name)
+            MisspellingDictionary.reset()
+        self.assertEqual("Deutschland", loc.correct_country_misspelling("Deutschland"))
+
 
 if __name__ == "__main__":
     # import sys;sys.argv = ['', 'Test.testName']
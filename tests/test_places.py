@@ -1,8 +1,19 @@
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 
 import geograpy
 from geograpy.locator import Locator
+from geograpy.misspellings import MisspellingDictionary
 from geograpy.places import PlaceContext
+from geograpy.utils import (
+    FuzzyNameIndex,
+    Profiler,
+    encode_strings,
+    fuzzy_match,
+    fuzzy_match_many,
+    fuzzy_match_matrix,
+    remove_non_ascii,
+)
 from tests.basetest import Geograpy3Test
 
 
@@ -42,6 +53,173 @@ class TestPlaces(Geograpy3Test):
         if self.debug:
             print(regionNames)
 
+    def testCountryRegionsAreShared(self):
+        """
+        test that the regions of the countries are loaded once and shared
+        by all PlaceContext instances
+        """
+        PlaceContext.clearRegionIndexes()
+        pc1 = PlaceContext(place_names=["Berlin"], setAll=False)
+        pc2 = PlaceContext(place_names=["Munich"], setAll=False)
+        self.assertIs(pc1.getCountryRegions(), pc2.getCountryRegions())
+        query = """SELECT r.name FROM countries c
+JOIN regions r ON r.countryId=c.wikidataid
+WHERE c.name=(?)"""
+        for countryName in ["Germany", "United States of America", "India"]:
+            regionRecords = pc1.sqlDB.query(query, (countryName,))
+            expected = [regionRecord["name"] for regionRecord in regionRecords]
+            regionNames = pc2.get_region_names(countryName)
+            self.assertEqual(sorted(expected), sorted(regionNames))
+            regionNames = [region.name for region in pc2.getRegions(countryName)]
+            self.assertEqual(sorted(expected), sorted(regionNames))
+        regionNames = pc1.get_region_names("Germany")
+        foldedNames = pc1.get_region_names("Germany", folded=True)
+        self.assertEqual([remove_non_ascii(name) for name in regionNames], foldedNames)
+
+    def testBoundedCountryIdCache(self):
+        """
+        test that the shared country ids of the names looked up stay bounded
+        """
+        PlaceContext.clearRegionIndexes()
+        pc = PlaceContext(place_names=[], setAll=False)
+        countryIdsByName = PlaceContext.countryIdsByName
+        for i in range(countryIdsByName.maxsize + 10):
+            self.assertEqual([], pc.get_region_names(f"Nowhere{i}"))
+        cacheInfo = countryIdsByName.cache_info()
+        self.assertEqual(countryIdsByName.maxsize, cacheInfo.currsize)
+        self.assertTrue(len(pc.get_region_names("Germany")) > 0)
+        PlaceContext.clearRegionIndexes(pc.db_file)
+        self.assertEqual(0, countryIdsByName.cache_info().currsize)
+
+    def testSharedLocator(self):
+        """
+        test that the PlaceContext instances reuse the shared or the given Locator
+        """
+        pc1 = PlaceContext(place_names=["Berlin"])
+        pc2 = PlaceContext(place_names=["Paris"])
+        self.assertIs(pc1.locator, pc2.locator)
+        self.assertIs(pc1.sqlDB, pc2.sqlDB)
+        loc = Locator()
+        pc3 = PlaceContext(place_names=["Berlin"], locator=loc)
+        self.assertIs(loc, pc3.locator)
+        self.assertEqual(pc1.cities, pc3.cities)
+        # the shared Locator is thread safe
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            placeContexts = list(
+                executor.map(lambda _i: PlaceContext(place_names=["Berlin"]), range(8))
+            )
+        for placeContext in placeContexts:
+            self.assertEqual(pc1.cities, placeContext.cities)
+
+    def testSharedLocatorCreatedByLocateCity(self):
+        """
+        test that the shared Locator is thread safe even if geograpy.locateCity created it
+        """
+        Locator.resetInstance()
+        city = geograpy.locateCity("Berlin, Germany")
+        self.assertIsNotNone(city)
+        self.assertTrue(Locator.getInstance().threadSafe)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            placeContexts = list(
+                executor.map(lambda _i: PlaceContext(place_names=["Berlin"]), range(8))
+            )
+        for placeContext in placeContexts:
+            self.assertTrue("Berlin" in placeContext.cities)
+
+    def testDelegatedMisspellingCorrection(self):
+        """
+        test that the delegated Locator functions use the misspelling correction
+        setting of the PlaceContext
+        """
+        try:
+            MisspellingDictionary.getInstance().add("Germanny", "Germany")
+            loc = Locator.getInstance()
+            self.assertFalse(loc.correctMisspelling)
+            pc = PlaceContext(place_names=[], setAll=False, correctMisspelling=True)
+            self.assertIs(loc, pc.locator)
+            self.assertFalse(loc.is_a_country("Germanny"))
+            self.assertTrue(pc.is_a_country("Germanny"))
+            self.assertEqual("Germany", pc.getCountry("Germanny").name)
+            self.assertEqual("Germany", pc.lookupCountry("Germanny").name)
+            self.assertEqual(
+                ["Germanny"], list(pc.countries_for_names(["Germanny"]).keys())
+            )
+            self.assertEqual({}, loc.countries_for_names(["Germanny"]))
+            city = pc.locateCity(["Berlin", "Germanny"])
+            self.assertEqual("Germany", city.country.name)
+            cities = pc.locateCityBatch(["Berlin, Germanny"])
+            self.assertEqual("Germany", cities[0].country.name)
+        finally:
+            MisspellingDictionary.reset()
+
+    def testFuzzyRegionIndex(self):
+        """
+        test that the fuzzy region index gives the same results as matching
+        each place against each region name
+        """
+        pc = PlaceContext(place_names=["Berlin"], setAll=False)
+        placeNames = [
+            "Bavaria",
+            "Bayern",
+            "Baveria",
+            "Nordrhein-Westfalen",
+            "North Rhine Westphalia",
+            "Texas",
+            "Texxas",
+            "Californa",
+            "New York",
+            "Uttar Pradesh",
+            "Paris",
+            "Thüringen",
+            "",
+        ]
+        for countryName in ["Germany", "United States of America", "India"]:
+            regionNames = pc.get_region_names(countryName)
+            regionIndex = FuzzyNameIndex(regionNames)
+            self.assertIs(pc.getRegionIndex(countryName), pc.getRegionIndex(countryName))
+            for placeName in placeNames:
+                expected = any(
+                    fuzzy_match(remove_non_ascii(placeName), remove_non_ascii(regionName))
+                    for regionName in regionNames
+                )
+                self.assertEqual(expected, regionIndex.matches(placeName), placeName)
+
+    def testFuzzyMatchMany(self):
+        """
+        test that the batch fuzzy matching gives the same results as fuzzy_match
+        and compare the throughput
+        """
+        queries = ["Bavaria", "Baveria", "Texxas", "Californa", "Wien", "Viena", "", "X"]
+        candidates = [
+            "Bavaria",
+            "Bayern",
+            "Texas",
+            "California",
+            "Vienna",
+            "Wien",
+            "Thuringen",
+            "Nordrhein-Westfalen",
+            "",
+        ]
+        expected = [[fuzzy_match(q, c) for c in candidates] for q in queries]
+        for query, row in zip(queries, expected):
+            self.assertEqual(row, list(fuzzy_match_many(query, candidates)), query)
+        matrix = fuzzy_match_matrix(queries, encode_strings(candidates))
+        self.assertEqual(expected, matrix.tolist())
+        manyCandidates = candidates * 200
+        encoded = encode_strings(manyCandidates)
+        profiler = Profiler(f"fuzzy matching {len(manyCandidates)} pairs", self.debug)
+        pairMatches = [fuzzy_match("Baveria", c) for c in manyCandidates]
+        pairTime = profiler.time(" per pair")
+        profiler = Profiler(f"fuzzy matching {len(manyCandidates)} pairs", self.debug)
+        batchMatches = fuzzy_match_many("Baveria", encoded)
+        batchTime = profiler.time(" batched")
+        if self.debug:
+            print(
+                f"{len(manyCandidates)/pairTime:.0f} pairs/s per pair {len(manyCandidates)/batchTime:.0f} pairs/s batched"
+            )
+        self.assertEqual(pairMatches, list(batchMatches))
+
     def testPlaces(self):
         """
         test places